@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+性能基准脚本
+对比解析方案的吞吐量，可传入保存下来的语料文件替代内置样本
+"""
+import argparse
+import json
+import random
+import re
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import pandas as pd
+from utils.bidding_info import parse_bidding_info
+from utils.lianjia_normalize import NORMALIZED_COLUMNS, normalize_lianjia_records
+
+# 竞价信息样本（详情页竞价信息区块的 .text）
+BIDDING_INFO_SAMPLES = [
+    "保证金：\n￥\n2,050,000\n起拍价：\n￥\n20,520,000\n加价幅度：\n￥\n100,000\n评估价：\n￥\n29,313,800\n"
+    "延时周期：\n5分钟/次\n?\n竞价周期：\n3天\n?\n售后说明：\n不支持七天无理由退货",
+    "变卖价：\n￥\n1,436,000\n保证金：\n￥\n140,000\n加价幅度：\n￥\n5,000\n评估价：\n￥\n2,564,300\n"
+    "延时周期：\n5分钟/次\n?\n变卖周期：\n60天\n?\n售后说明：\n不支持七天无理由退货",
+    "保证金：\n￥\n300,000\n起拍价：\n￥\n3,120,000\n加价幅度：\n￥\n20,000\n评估价：\n￥\n4,457,100\n"
+    "延时周期：\n5分钟/次\n?\n竞价周期：\n1天\n?\n优先购买权人：\n有\n售后说明：\n不支持七天无理由退货",
+]
+
+
+def legacy_parse_bidding_info(bidding_info: str) -> dict:
+    """
+    原有的逐字段正则解析方式（每个字段一次 re.search）
+    """
+    bidding_info = bidding_info.replace(',', '')
+    result = {}
+    for label, pattern in [
+        ('加价幅度', r'加价幅度：\n￥\n(\d+)\n'),
+        ('延时周期', r'延时周期：\n(\d+)分钟/次\n'),
+        ('变卖价', r'变卖价：\n￥\n(\d+)\n'),
+        ('变卖周期', r'变卖周期：\n(\d+)天\n'),
+        ('起拍价', r'起拍价：\n￥\n(\d+)\n'),
+        ('保证金', r'保证金：\n￥\n(\d+)\n'),
+        ('竞价周期', r'竞价周期：\n(\d+)天\n'),
+    ]:
+        match = re.search(pattern, bidding_info)
+        result[label] = match.group(1) if match else ''
+    return result
+
+
+def legacy_typed_parse_bidding_info(bidding_info: str) -> dict:
+    """
+    逐字段正则解析后再转换为整数，与新解析器输出同样类型的已知字段
+    """
+    return {label: int(value) for label, value in legacy_parse_bidding_info(bidding_info).items() if value}
+
+
+def build_bidding_corpus(size: int, corpus_file: str = None) -> List[str]:
+    """
+    构建竞价信息语料
+
+    Args:
+        size: 语料条数
+        corpus_file: 语料文件，每行一个JSON字符串；为None时由内置样本随机生成
+
+    Returns:
+        List[str]: 语料
+    """
+    if corpus_file:
+        with open(corpus_file, encoding='utf-8') as f:
+            saved = [json.loads(line) for line in f if line.strip()]
+        return [saved[i % len(saved)] for i in range(size)]
+
+    rng = random.Random(0)
+    corpus = []
+    for i in range(size):
+        sample = BIDDING_INFO_SAMPLES[i % len(BIDDING_INFO_SAMPLES)]
+        # 随机替换数值，避免正则引擎命中缓存的同一字符串
+        corpus.append(re.sub(r'\d[\d,]*', lambda m: f"{rng.randint(1, 9_999_999):,}" if ',' in m.group(0) else m.group(0), sample))
+    return corpus
+
+
+def time_parser(parser: Callable[[str], dict], corpus: List[str], repeat: int) -> float:
+    """
+    多次运行取最快一次的耗时（秒）
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in corpus:
+            parser(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_bidding_info(size: int, repeat: int, corpus_file: str = None) -> None:
+    """
+    竞价信息解析基准：逐字段正则 vs 逐行解析器
+    """
+    corpus = build_bidding_corpus(size, corpus_file)
+
+    # 先校验两种方式在旧方式能识别的字段上结果一致
+    for text in corpus[:len(BIDDING_INFO_SAMPLES) * 10]:
+        legacy = legacy_parse_bidding_info(text)
+        parsed = parse_bidding_info(text)
+        for label, value in legacy.items():
+            if value:
+                assert str(parsed.get(label)) == value, (label, value, parsed.get(label))
+
+    print(f"竞价信息解析基准（{len(corpus)} 条，取 {repeat} 次中最快）")
+    parser_seconds = time_parser(parse_bidding_info, corpus, repeat)
+    for title, parser in [
+        ("逐字段正则（字符串）", legacy_parse_bidding_info),
+        ("逐字段正则 + 整数转换", legacy_typed_parse_bidding_info),
+        ("逐行解析（全部标签，带类型）", parse_bidding_info),
+    ]:
+        seconds = parser_seconds if parser is parse_bidding_info else time_parser(parser, corpus, repeat)
+        print(f"  {title}: {seconds:.3f} 秒，{seconds / len(corpus) * 1e6:.2f} 微秒/条，"
+              f"相对逐行解析 {seconds / parser_seconds:.2f}x")
+
+
+# 链家成交记录样本的组成部分
+LIANJIA_ORIENTATIONS = ["南", "南 北", "东南", "西", "东 西", "北"]
+LIANJIA_DECORATIONS = ["精装", "简装", "毛坯", "其他"]
+LIANJIA_FLOOR_LEVELS = ["低楼层", "中楼层", "高楼层"]
+LIANJIA_BUILDING_TYPES = ["板楼", "塔楼", "板塔结合"]
+
+
+def build_lianjia_records(size: int) -> List[dict]:
+    """
+    生成链家成交记录（与爬虫输出的数据项结构相同，数值随机）
+
+    Args:
+        size: 记录条数
+
+    Returns:
+        List[dict]: 数据项
+    """
+    rng = random.Random(0)
+    records = []
+    for i in range(size):
+        rooms = rng.randint(1, 5)
+        if i % 5 == 0:
+            # 低层住宅没有楼层位置，只有总楼层
+            position = f"{rng.randint(2, 7)}层 {rng.randint(1985, 2022)}年建 {rng.choice(LIANJIA_BUILDING_TYPES)}"
+        else:
+            position = (f"{rng.choice(LIANJIA_FLOOR_LEVELS)}(共{rng.randint(6, 45)}层) "
+                        f"{rng.randint(1985, 2022)}年建 {rng.choice(LIANJIA_BUILDING_TYPES)}")
+        records.append({
+            '房源名称': f"小区{i % 5000} {rooms}室{rng.randint(0, 2)}厅 {rng.randint(25, 250)}.{rng.randint(0, 99)}平米",
+            '房源链接': f"https://sz.lianjia.com/chengjiao/{105000000000 + i}.html",
+            '区域': f"区域{i % 10}",
+            '所在区域': f"子区域{i % 80}",
+            '建筑特征': {
+                '装修及朝向': f"{rng.choice(LIANJIA_ORIENTATIONS)} | {rng.choice(LIANJIA_DECORATIONS)}",
+                '楼层及建筑类型': position
+            },
+            '成交时间': f"20{rng.randint(17, 24)}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}",
+            '价格信息': {
+                '单价': f"{rng.randint(20000, 150000)}元/平",
+                '总价': f"{rng.randint(80, 3000)}{'.' + str(rng.randint(1, 9)) if i % 3 == 0 else ''}万"
+            }
+        })
+    return records
+
+
+def legacy_normalize_lianjia_record(record: dict) -> Dict[str, Optional[object]]:
+    """
+    逐条正则解析一条链家成交记录（原有脚本的后处理方式）
+    """
+    title = record.get('房源名称') or ''
+    house_info = (record.get('建筑特征') or {}).get('装修及朝向') or ''
+    position_info = (record.get('建筑特征') or {}).get('楼层及建筑类型') or ''
+    prices = record.get('价格信息') or {}
+    result: Dict[str, Optional[object]] = {}
+
+    layout = re.search(r'(\d+)室(\d+)厅', title + ' | ' + house_info)
+    result['室'] = int(layout.group(1)) if layout else None
+    result['厅'] = int(layout.group(2)) if layout else None
+    area = re.search(r'(\d+(?:\.\d+)?)\s*(?:平米|㎡|平方米)', title + ' | ' + house_info)
+    result['面积'] = float(area.group(1)) if area else None
+    result['朝向'] = None
+    result['装修'] = None
+    for part in house_info.split('|'):
+        part = part.strip()
+        if part and re.fullmatch(r'[东南西北 ]+', part) and result['朝向'] is None:
+            result['朝向'] = ' '.join(part.split())
+        elif part in ('精装', '简装', '毛坯', '豪装', '其他'):
+            result['装修'] = part
+    level = re.search(r'([低中高顶底]楼层|地下室)', position_info)
+    result['楼层位置'] = level.group(1) if level else None
+    floors = re.search(r'共(\d+)层|(?:^|\s)(\d+)层', position_info)
+    result['总楼层'] = int(floors.group(1) or floors.group(2)) if floors else None
+    year = re.search(r'(\d{4})年', position_info)
+    result['建成年份'] = int(year.group(1)) if year else None
+    building = re.search(r'(板塔结合|板楼|塔楼|平房)', position_info)
+    result['建筑类型'] = building.group(1) if building else None
+    unit_price = re.search(r'(\d+(?:\.\d+)?)', prices.get('单价') or '')
+    result['单价'] = int(round(float(unit_price.group(1)))) if unit_price else None
+    total_price = re.search(r'(\d+(?:\.\d+)?)\s*(万|亿)?', prices.get('总价') or '')
+    if total_price:
+        multiplier = {'万': 10_000, '亿': 100_000_000}.get(total_price.group(2), 1)
+        result['总价'] = int(round(float(total_price.group(1)) * multiplier))
+    else:
+        result['总价'] = None
+    try:
+        result['成交时间'] = datetime.strptime((record.get('成交时间') or '')[:10].replace('.', '-'), '%Y-%m-%d')
+    except ValueError:
+        result['成交时间'] = None
+    return result
+
+
+def bench_lianjia_normalize(size: int, repeat: int) -> None:
+    """
+    链家成交记录规范化基准：逐条正则 vs pandas向量化字符串操作
+    """
+    records = build_lianjia_records(size)
+
+    # 先校验两种方式的结果一致
+    sample = records[:2000]
+    vectorized = normalize_lianjia_records(sample)
+    for index, record in enumerate(sample):
+        legacy = legacy_normalize_lianjia_record(record)
+        for column in NORMALIZED_COLUMNS:
+            value = vectorized[column].iloc[index]
+            value = None if pd.isna(value) else value
+            assert value == legacy[column], (index, column, value, legacy[column])
+
+    print(f"链家成交记录规范化基准（{len(records)} 条，取 {repeat} 次中最快）")
+    timings = {}
+    for title, run in [
+        ("逐条正则", lambda: [legacy_normalize_lianjia_record(record) for record in records]),
+        ("pandas向量化", lambda: normalize_lianjia_records(records)),
+    ]:
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - started)
+        timings[title] = best
+    for title, seconds in timings.items():
+        print(f"  {title}: {seconds:.3f} 秒，{len(records) / seconds:,.0f} 条/秒，"
+              f"相对向量化 {seconds / timings['pandas向量化']:.2f}x")
+
+
+def main():
+    """
+    主函数
+    """
+    parser = argparse.ArgumentParser(description="性能基准")
+    parser.add_argument("--bench", choices=["bidding-info", "lianjia-normalize"], default="bidding-info",
+                       help="要运行的基准")
+    parser.add_argument("--size", type=int, default=None,
+                       help="语料条数（默认竞价信息 100000 条，链家成交记录 1000000 条）")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数")
+    parser.add_argument("--corpus", type=str, default=None,
+                       help="竞价信息语料文件，每行一个JSON字符串")
+    args = parser.parse_args()
+
+    if args.bench == "bidding-info":
+        bench_bidding_info(args.size or 100_000, args.repeat, args.corpus)
+    elif args.bench == "lianjia-normalize":
+        bench_lianjia_normalize(args.size or 1_000_000, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -29,10 +29,89 @@ class Config:
         "headless": False,  # 是否无头模式
         "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         "window_size": (1920, 1080),
-        "implicit_wait": 10,
+        "implicit_wait": 0,  # 隐式等待会让每次查找缺失元素都阻塞到超时，保持为0
+        "required_wait": 10,  # 必需页面锚点的显式等待时间
         "page_load_timeout": 30,
         "script_timeout": 30
     }
+    # 精简浏览器模式: 按资源类型屏蔽的URL模式（CDP Network.setBlockedURLs 通配符）
+    # 屏蔽样式表会改变元素的可见文本（.text/innerText）和页面交互，按需在爬虫配置中启用
+    BLOCKED_RESOURCE_PATTERNS = {
+        "image": ["*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+                  "*.webp", "*.webp?*", "*.svg", "*.svg?*", "*.ico", "*.ico?*"],
+        "font": ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*", "*.eot", "*.eot?*"],
+        "media": ["*.mp4", "*.mp4?*", "*.webm", "*.webm?*", "*.mp3", "*.mp3?*", "*.m3u8", "*.m3u8?*"],
+        "stylesheet": ["*.css", "*.css?*"]
+    }
+    # 请求节奏配置: 按主机设置目标速率（两次请求开始时间的间隔，已花在抓取和提取上的时间不再额外等待）
+    RATE_CONTROL_CONFIG = {
+        "default": {
+            "requests_per_second": 0.5,
+            "jitter": 0.3,  # 间隔的随机浮动比例
+            "slow_seconds": 15,  # 单次请求及提取超过该耗时视为响应缓慢
+            "backoff_factor": 2.0,  # 响应缓慢或出错时间隔放大的倍数
+            "max_backoff": 8.0,  # 间隔最多放大到目标值的倍数
+            "recovery_factor": 0.8,  # 正常响应后退避倍数的衰减系数
+            "pause_every": 0,  # 每隔多少次请求额外休息一次，0表示不休息
+            "pause_range": (5, 10)
+        },
+        "hosts": {
+            "pmsearch.jd.com": {"requests_per_second": 0.2},  # 京东法拍列表翻页
+            "paimai.jd.com": {"requests_per_second": 0.5, "slow_seconds": 30, "pause_every": 6},  # 京东法拍详情页及出价记录翻页
+            "sz.lianjia.com": {"requests_per_second": 0.5}  # 链家成交列表
+        }
+    }
+    # 附件下载配置
+    DOWNLOAD_CONFIG = {
+        "max_workers": 4,  # 下载线程数
+        "per_host_limit": 2,  # 同一主机的最大并发下载数
+        "chunk_size": 64 * 1024,  # 流式写入的块大小（字节）
+        "timeout": 30,
+        "use_manifest": True,  # 使用下载清单跳过已下载文件并断点续传
+        "manifest_filename": ".manifest.json"
+    }
+    
+    # 附件去重存储配置（按内容哈希保存一份，资产文件夹中使用硬链接）
+    BLOB_STORE_CONFIG = {
+        "enabled": False,
+        "dirname": "_blobs"  # 位于 OUTPUT_DIR 下
+    }
+    # 分段存储: 每批记录写成一个不可变的JSONL分段文件，最终文件由导出步骤生成
+    SEGMENT_STORE_CONFIG = {
+        "root": os.path.join(DATA_DIR, "segments"),
+        "fsync": True  # 写入后落盘，断电或进程被杀时已追加的分段不会丢失
+    }
+    # Parquet落盘: 按 utils/record_schema.py 中声明的列类型写入（金额为整数元、时间戳、分类列、嵌套字段展开），每批数据一个行组
+    PARQUET_CONFIG = {
+        "root": os.path.join(DATA_DIR, "parquet"),
+        "row_groups_per_file": 20,  # 每个文件的行组数，写满后关闭文件（已关闭的文件完整可读）
+        "compression": "snappy"
+    }
+    # SQLite存储: 数据项和附表（出价记录、调查表等）写入同一个数据库，按拍卖ID/房源链接更新，跨运行保留
+    SQLITE_CONFIG = {
+        "path": os.path.join(DATA_DIR, "crawler.db")
+    }
+    # Excel导出: 运行结束时从落盘目标逐条读取数据流式写入xlsx（只写模式），按列分工作表（列定义名称 -> 列名）
+    EXCEL_EXPORT_CONFIG = {
+        "sheet_by": {"jd_auction": "省份", "lianjia": "区域"}
+    }
+    # 数据缓冲: 爬虫的数据项每满 flush_records 条或距上次写入超过 flush_seconds 秒即写入落盘目标，内存中只保留未写入的部分
+    RECORD_BUFFER_CONFIG = {
+        "sink": "segment",  # "segment" 写入分段存储（SEGMENT_STORE_CONFIG），"parquet" 按列类型写入Parquet（PARQUET_CONFIG，需要 pyarrow），"sqlite" 按稳定ID更新写入SQLite数据库（SQLITE_CONFIG），"memory" 保留在内存中
+        "flush_records": 100,
+        "flush_seconds": 60
+    }
+    # 后台写入: 爬虫的所有写盘操作（数据落盘、Excel表格）由后台线程执行，队列写满时爬取流程等待
+    WRITER_CONFIG = {
+        "workers": 2,  # 写入线程数，同一文件的写入始终由同一线程按顺序执行
+        "queue_size": 32  # 每个写入线程的队列长度
+    }
+    # 已爬取房源索引: 按稳定的房源ID（京东拍卖ID、链家成交链接）记录已保存的房源，再次运行时不再打开详情页或重复输出
+    SEEN_INDEX_CONFIG = {
+        "enabled": True,
+        "path": os.path.join(DATA_DIR, "seen_listings.db")
+    }
+    
     # 京东法拍房配置
     JD_AUCTION_CONFIG = {
         "base_url": "https://pmsearch.jd.com/?publishSource=7&childrenCateId=12728",
@@ -78,8 +157,30 @@ class Config:
         "province_xpath_hubei": "//*[@id='root']/div/div/div[2]/div[4]/div/div[2]/div/dl[1]/dd/a[18]",  # 湖北
         "city_xpath_wuhan": "//*[@id='root']/div/div/div[2]/div[4]/div/div[2]/div/dl[2]/dd/a[2]",  # 武汉
         "list_xpath": "//*[@id='root']/div/div/div[4]/ul/li",
+        # 直接跳页: 优先使用分页器的页码输入框，其次使用列表URL的页码参数，都失败时再逐页点击
+        "pager_input_xpath": "//div[contains(@class, 'ui-pager')]//input",
+        "pager_submit_xpath": "//div[contains(@class, 'ui-pager')]//*[contains(@class, 'ui-pager-skip') and (self::a or self::button or self::span)]",
+        "page_url_param": None,  # 列表URL的页码参数名（如 "page"），筛选条件不在URL中时跳转会丢失筛选，默认不使用
+        # 起始页定位: 列表按结束时间从新到旧排列，按页二分探测结束时间，定位存档恢复位置和截止时间所在页
+        # 探测会打开详情页并跳页，依赖分页器的跳页功能，默认关闭（关闭时从起始页逐页查找）
+        "locate_pages": False,
+        "locate_probe_items": 3,  # 每页最多探测的详情页数（从页尾向前，直到取得结束时间）
+        # 运行日志: 按发生顺序记录完成的拍卖项、页面和落盘进度，--resume 时重放以定位下一页、下一条
+        "journal_dir": os.path.join(DATA_DIR, "journals"),
+        "journal_fsync": False,  # 每条记录写入后是否落盘（进程被杀时最多丢失未落盘的数据项，续传时会重新爬取）
+        # 资产附表（调查表、竞买公告、出价记录、优先购买权人）: "folder" 每个资产文件夹写一组Excel，
+        # "run" 追加到本次运行的汇总表（output/京东法拍附表_省份_城市_运行时间/，每种附表一个文件，以拍卖ID关联）
+        "asset_table_mode": "folder",
+        "asset_table_format": "parquet",  # 汇总表格式: "parquet"（需要 pyarrow）或 "csv"
+        "asset_table_flush": 50,  # 每缓冲多少个附表写入一次
+        "asset_table_folders": False,  # 汇总模式下运行结束时是否同时导出每个资产一个文件夹的布局
         "max_pages": 9999,
         "sleep_time": 5,
+        "detail_tabs": 1,  # 同时加载的详情页标签数，大于1时启用流水线模式
+        # 浏览器模式: "normal" 加载全部资源, "lean" 屏蔽下列资源并在DOM就绪后返回(pageLoadStrategy=eager)
+        "browser_profile": "normal",
+        "blocked_resource_types": ["image", "font", "media"],
+        "blocked_url_patterns": ["*mercury.jd.com*", "*wl.jd.com*", "*hm.baidu.com*", "*google-analytics.com*"],
         "output_filename": "京东法拍房数据.xlsx"
     }
     
@@ -87,9 +188,22 @@ class Config:
     LIANJIA_CONFIG = {
         "base_url": "https://sz.lianjia.com/chengjiao",
         "max_pages": 100,
-        "sleep_range": (1, 3),
         "output_filename": "链家二手房数据.xlsx",
-        "min_date": "2017-01-01"  # 最早爬取日期
+        "min_date": "2017-01-01",  # 最早爬取日期
+        # 日期水位: 成交记录按日期从新到旧排列，整页（或连续 stale_run 条）早于最早日期或上次爬取到的最新日期时停止翻页
+        "use_watermark": True,
+        "watermark_file": os.path.join(DATA_DIR, "lianjia_watermarks.db"),  # SQLite
+        "stale_run": 0,  # 连续多少条旧数据即停止，0表示只按整页判断
+        # 列表页提取方式: "snapshot" 一次获取listContent的HTML后离线解析, "webdriver" 逐个元素查找
+        "extract_mode": "snapshot",
+        # 工作池模式: workers 大于1时启动多个浏览器会话并行爬取子区域/页码范围
+        "workers": 1,
+        "worker_profile_dir": os.path.join(DATA_DIR, "lianjia_profiles"),  # 每个会话使用其中的 worker_<编号> 子目录
+        "pages_per_unit": 10,  # 每个工作单元包含的页数
+        # 浏览器模式: "normal" 加载全部资源, "lean" 屏蔽下列资源并在DOM就绪后返回(pageLoadStrategy=eager)
+        "browser_profile": "normal",
+        "blocked_resource_types": ["image", "font", "media"],
+        "blocked_url_patterns": ["*dig.lianjia.com*", "*hm.baidu.com*", "*google-analytics.com*", "*cnzz.com*"]
     }
     
     # 深圳区域配置
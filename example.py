@@ -23,9 +23,10 @@ def example_jd_auction():
     # 运行爬虫
     spider.start()
     
-    # 获取爬取的数据
-    data = spider.get_data()
-    print(f"共爬取到 {len(data)} 条数据")
+    # 获取爬取的数据（逐条读取已保存的数据，不会一次性载入内存）
+    for item in spider.get_data():
+        print(item["资产名称"], item["结束时间"])
+    print(f"共爬取到 {spider.get_data_count()} 条数据")
 
 def example_lianjia():
     """
@@ -44,8 +45,7 @@ def example_lianjia():
     spider.start()
     
     # 获取爬取的数据
-    data = spider.get_data()
-    print(f"共爬取到 {len(data)} 条数据")
+    print(f"共爬取到 {spider.get_data_count()} 条数据")
 
 def example_custom_config():
     """
@@ -56,7 +56,7 @@ def example_custom_config():
     
     # 修改配置（在实际使用中，建议直接修改config.py文件）
     Config.LIANJIA_CONFIG["max_pages"] = 3
-    Config.LIANJIA_CONFIG["sleep_range"] = (2, 5)
+    Config.RATE_CONTROL_CONFIG["hosts"]["sz.lianjia.com"]["requests_per_second"] = 0.3
     
     # 创建爬虫实例
     spider = LianjiaSpider(
@@ -3,13 +3,19 @@
 主程序入口
 """
 import argparse
+import os
+import subprocess
 import sys
-from typing import List
+from typing import Dict, List
 from spiders.jd_auction_spider import JDAuctionSpider
 from spiders.lianjia_spider import LianjiaSpider
+from utils.sharding import (
+    build_jd_plan, build_lianjia_plan, group_lianjia_units, jd_unit_label,
+    merge_jd_units, merge_lianjia_shards, parse_shard, select_shard, shard_label
+)
 from config import Config
 
-def run_jd_auction_spider(start_page: int = 1, max_pages: int = None, province: str = None, city: str = None, cutoff_time: str = None, resume_from_archive: bool = False) -> None:
+def run_jd_auction_spider(start_page: int = 1, max_pages: int = None, province: str = None, city: str = None, cutoff_time: str = None, resume_from_archive: bool = False, detail_tabs: int = None, name_suffix: str = None, resume: bool = False) -> None:
     """
     运行京东法拍房爬虫
     
@@ -20,6 +26,9 @@ def run_jd_auction_spider(start_page: int = 1, max_pages: int = None, province:
         city: 要爬取的城市
         cutoff_time: 截止时间，格式为"YYYY年MM月DD日 HH:MM:SS"
         resume_from_archive: 是否从存档恢复爬取
+        detail_tabs: 同时加载的详情页标签数
+        name_suffix: 爬虫名称后缀（分片模式使用）
+        resume: 是否重放运行日志继续上次的运行
     """
     print("=" * 50)
     print("京东法拍房爬虫")
@@ -31,18 +40,24 @@ def run_jd_auction_spider(start_page: int = 1, max_pages: int = None, province:
     print("3. 然后运行此程序")
     if resume_from_archive:
         print("4. 存档恢复模式已启用，将从上次爬取停止的位置继续")
+    if resume:
+        print("4. 续传模式已启用，将重放运行日志，从上次运行停止的页和拍卖项继续")
     print("=" * 50)
     
-    spider = JDAuctionSpider(start_page=start_page, max_pages=max_pages, province=province, city=city, cutoff_time=cutoff_time, resume_from_archive=resume_from_archive)
+    spider = JDAuctionSpider(start_page=start_page, max_pages=max_pages, province=province, city=city, cutoff_time=cutoff_time, resume_from_archive=resume_from_archive, detail_tabs=detail_tabs, name_suffix=name_suffix, resume=resume)
     spider.start()
 
-def run_lianjia_spider(districts: List[str] = None, max_pages: int = None) -> None:
+def run_lianjia_spider(districts: List[str] = None, max_pages: int = None, workers: int = None,
+                       sub_districts: Dict[str, List[str]] = None, name_suffix: str = None) -> None:
     """
     运行链家二手房爬虫
     
     Args:
         districts: 要爬取的区域列表
         max_pages: 每个区域最大爬取页数
+        workers: 浏览器会话数
+        sub_districts: 只爬取指定的子区域（分片模式使用）
+        name_suffix: 爬虫名称后缀（分片模式使用）
     """
     print("=" * 50)
     print("链家二手房爬虫")
@@ -53,9 +68,111 @@ def run_lianjia_spider(districts: List[str] = None, max_pages: int = None) -> No
     print("3. 登录完成后按回车键继续")
     print("=" * 50)
     
-    spider = LianjiaSpider(districts=districts, max_pages=max_pages)
+    spider = LianjiaSpider(districts=districts, max_pages=max_pages, workers=workers,
+                           sub_districts=sub_districts, name_suffix=name_suffix)
     spider.start()
 
+def run_shard(args: argparse.Namespace, index: int, count: int) -> None:
+    """
+    运行一个分片负责的工作单元
+    
+    Args:
+        args: 命令行参数
+        index: 分片序号（从1开始）
+        count: 分片总数
+    """
+    print(f"运行分片 {index}/{count}")
+    
+    if args.spider in ["jd", "both"]:
+        units = select_shard(build_jd_plan(args.jd_province, args.jd_city), index, count)
+        print(f"京东法拍房分片工作单元: {', '.join(jd_unit_label(p, c) for p, c in units) or '无'}")
+        for province, city in units:
+            try:
+                run_jd_auction_spider(
+                    start_page=args.jd_start_page,
+                    max_pages=args.jd_max_pages,
+                    province=province,
+                    city=city,
+                    cutoff_time=args.jd_cutoff_time,
+                    resume_from_archive=args.jd_resume_from_archive,
+                    detail_tabs=args.jd_detail_tabs,
+                    name_suffix=jd_unit_label(province, city),
+                    resume=args.resume
+                )
+            except Exception as e:
+                print(f"爬取 {jd_unit_label(province, city)} 时出错: {e}")
+    
+    if args.spider in ["lianjia", "both"]:
+        units = select_shard(build_lianjia_plan(args.lianjia_districts), index, count)
+        print(f"链家二手房分片共 {len(units)} 个子区域")
+        if units:
+            run_lianjia_spider(
+                max_pages=args.lianjia_max_pages,
+                workers=args.lianjia_workers,
+                sub_districts=group_lianjia_units(units),
+                name_suffix=shard_label(index, count)
+            )
+
+def launch_shards(args: argparse.Namespace, count: int) -> int:
+    """
+    为每个分片启动一个子进程（各自使用独立的浏览器和日志文件），全部结束后合并输出
+    
+    Args:
+        args: 命令行参数
+        count: 分片总数
+        
+    Returns:
+        int: 失败的分片数
+    """
+    # 子进程沿用除 --workers 以外的所有参数
+    child_args = []
+    skip_next = False
+    for arg in sys.argv[1:]:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == "--workers":
+            skip_next = True
+            continue
+        if arg.startswith("--workers="):
+            continue
+        child_args.append(arg)
+    
+    processes = []
+    for index in range(1, count + 1):
+        command = [sys.executable, os.path.abspath(__file__)] + child_args + ["--shard", f"{index}/{count}"]
+        processes.append(subprocess.Popen(command))
+        print(f"分片 {index}/{count} 已启动，进程ID: {processes[-1].pid}")
+    
+    failed = 0
+    for index, process in enumerate(processes, start=1):
+        return_code = process.wait()
+        if return_code != 0:
+            failed += 1
+            print(f"分片 {index}/{count} 异常退出，返回码: {return_code}")
+    
+    merge_shard_outputs(args, count)
+    return failed
+
+def merge_shard_outputs(args: argparse.Namespace, count: int) -> None:
+    """
+    合并各分片的输出文件
+    
+    Args:
+        args: 命令行参数
+        count: 分片总数
+    """
+    written = []
+    if args.spider in ["jd", "both"]:
+        written.extend(merge_jd_units(build_jd_plan(args.jd_province, args.jd_city)))
+    if args.spider in ["lianjia", "both"]:
+        written.extend(merge_lianjia_shards(count, args.lianjia_districts))
+    
+    for filepath in written:
+        print(f"合并结果已保存到: {filepath}")
+    if not written:
+        print("没有找到需要合并的分片输出")
+
 def show_available_districts() -> None:
     """
     显示可用的区域
@@ -89,19 +206,33 @@ def main():
     parser.add_argument("--jd-max-pages", type=int, default=None,
                        help="京东法拍房最大爬取页数")
     parser.add_argument("--jd-province", type=str, default=None, # 调试
-                       required=True, help="京东法拍房要爬取的省份")
+                       help="京东法拍房要爬取的省份（分片模式下不指定时爬取所有省份）")
     parser.add_argument("--jd-city", type=str, default=None, # 调试 
                        help="京东法拍房要爬取的城市")
     parser.add_argument("--jd-cutoff-time", type=str, default=None,
                        help="京东法拍房截止时间，格式为'YYYY年MM月DD日 HH:MM:SS'，当拍卖结束时间早于此时间时停止爬取")
     parser.add_argument("--jd-resume-from-archive", action="store_true",
                        help="京东法拍房从存档恢复爬取，自动找到最后一条记录并从下一条开始")
+    parser.add_argument("--resume", action="store_true",
+                       help="京东法拍房重放运行日志，直接从上次运行停止的页和拍卖项继续（不读取Excel存档）")
+    parser.add_argument("--jd-detail-tabs", type=int, default=None,
+                       help="京东法拍房同时加载的详情页标签数，大于1时启用流水线模式 (默认: 1)")
     
     # 链家二手房参数
     parser.add_argument("--lianjia-districts", nargs="+", default=None,
                        help="链家二手房要爬取的区域列表")
     parser.add_argument("--lianjia-max-pages", type=int, default=None,
                        help="链家二手房每个区域最大爬取页数")
+    parser.add_argument("--lianjia-workers", type=int, default=None,
+                       help="链家二手房同时运行的浏览器会话数，大于1时启用工作池模式 (默认: 1)")
+    
+    # 分片参数
+    parser.add_argument("--workers", type=int, default=None,
+                       help="启动的分片进程数，大于1时把工作计划拆分到多个进程并在结束后合并输出")
+    parser.add_argument("--shard", type=str, default=None,
+                       help="只运行指定分片，格式为'i/N'（通常由 --workers 自动传入）")
+    parser.add_argument("--merge-only", action="store_true",
+                       help="不运行爬虫，只合并 --workers 个分片已有的输出文件")
     
     # 其他参数
     parser.add_argument("--show-districts", action="store_true",
@@ -121,7 +252,35 @@ def main():
         show_available_provinces_cities()
         return
     
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    sharded = shard is not None or (args.workers or 1) > 1
+    
+    if args.merge_only:
+        if not args.spider or not args.workers:
+            parser.error("--merge-only 需要同时指定 --spider 和 --workers")
+        merge_shard_outputs(args, args.workers)
+        return
+    
+    # 单进程模式必须指定省份，分片模式下可以按省份/城市拆分
+    if args.spider in ["jd", "both"] and not sharded and not args.jd_province:
+        parser.error("运行京东法拍房爬虫时必须指定 --jd-province（或使用 --workers 分片爬取所有省份）")
+    
     try:
+        if shard:
+            run_shard(args, *shard)
+            return
+        
+        if sharded:
+            failed = launch_shards(args, args.workers)
+            if failed:
+                sys.exit(1)
+            return
+        
         if args.spider in ["jd", "both"]:
             run_jd_auction_spider(
                 start_page=args.jd_start_page,
@@ -129,13 +288,16 @@ def main():
                 province=args.jd_province,
                 city=args.jd_city,
                 cutoff_time=args.jd_cutoff_time,
-                resume_from_archive=args.jd_resume_from_archive
+                resume_from_archive=args.jd_resume_from_archive,
+                detail_tabs=args.jd_detail_tabs,
+                resume=args.resume
             )
         
         if args.spider in ["lianjia", "both"]:
             run_lianjia_spider(
                 districts=args.lianjia_districts,
-                max_pages=args.lianjia_max_pages
+                max_pages=args.lianjia_max_pages,
+                workers=args.lianjia_workers
             )
             
     except KeyboardInterrupt:
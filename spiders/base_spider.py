@@ -4,15 +4,24 @@
 """
 from abc import ABC, abstractmethod
 from selenium import webdriver
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional
 import logging
+import time
 from utils.logger import setup_logger
 from utils.browser import BrowserManager
 from utils.data_storage import DataStorage
+from utils.element_lookup import ElementLookup
+from utils.rate_controller import RateController
+from utils.record_sink import RecordSink, create_sink
+from utils.seen_index import SeenIndex
+from utils.writer_service import WriterService
+from config import Config
 
 class BaseSpider(ABC):
     """爬虫基类"""
     
+    RECORD_SCHEMA: Optional[str] = None  # 数据项的列定义名称（见 utils/record_schema.py），由子类设置
+    
     def __init__(self, spider_name: str):
         """
         初始化爬虫
@@ -21,10 +30,21 @@ class BaseSpider(ABC):
             spider_name: 爬虫名称
         """
         self.spider_name = spider_name
+        self.config: Dict[str, Any] = {}  # 爬虫配置，由子类设置
         self.logger = setup_logger(spider_name)
         self.driver: Optional[webdriver.Chrome] = None
+        self.lookup: Optional[ElementLookup] = None
         self.data_storage = DataStorage()
-        self.data: List[Dict[str, Any]] = []
+        self.rate_controller = RateController(self.logger)
+        self.data: List[Dict[str, Any]] = []  # 尚未写入落盘目标的数据项
+        self.sink: RecordSink = create_sink(spider_name, self.RECORD_SCHEMA)
+        self.writer = WriterService(logger=self.logger)  # 所有写盘操作由后台线程执行
+        self.last_flush = time.monotonic()
+        self.seen_source = ""  # 已爬取房源索引中的数据来源，由子类设置
+        self.seen_index = SeenIndex.shared() if Config.SEEN_INDEX_CONFIG["enabled"] else None
+        self.pending_seen: List[str] = []  # 尚未写入落盘目标的数据项对应的房源ID
+        self.pending_callbacks: List[Callable[[], None]] = []  # 等待缓冲中的数据项落盘后执行的回调
+        self.write_failed = False  # 是否有批次写入落盘目标失败（此后不再执行落盘回调）
     
     def start(self) -> None:
         """
@@ -48,7 +68,8 @@ class BaseSpider(ABC):
         """
         设置浏览器驱动
         """
-        self.driver = BrowserManager.create_normal_driver()
+        self.driver = BrowserManager.create_normal_driver(self.config)
+        self.lookup = ElementLookup(self.driver)
         self.logger.info("浏览器驱动创建成功")
     
     @abstractmethod
@@ -60,28 +81,38 @@ class BaseSpider(ABC):
     
     def save_data(self) -> None:
         """
-        保存数据
+        保存数据：写入未落盘的数据项后，从落盘目标导出数据文件
         """
-        if self.data:
+        self.flush_data()
+        self.writer.drain()
+        if self.sink.count():
             filename = f"{self.spider_name}_数据.xlsx"
-            self.data_storage.save_to_excel(self.data, filename)
-            self.logger.info(f"数据已保存，共 {len(self.data)} 条记录")
+            self.writer.submit(filename, self.sink.export, filename)
+            self.writer.drain()
+            self.logger.info(f"数据已保存，共 {self.sink.count()} 条记录")
         else:
             self.logger.warning("没有数据需要保存")
     
     def save_data_on_error(self) -> None:
         """
-        出错时保存当前获取到的数据
+        出错时保存当前获取到的数据（此前已落盘的数据不受影响，这里只写入未落盘的部分再导出）
         """
-        if self.data:
+        try:
+            self.flush_data()
+            self.writer.drain()
+        except Exception as flush_error:
+            self.logger.error(f"写入未落盘数据时失败: {flush_error}")
+        
+        if self.sink.count():
             # 使用带时间戳的文件名，避免覆盖正常保存的数据
             import datetime
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{self.spider_name}_数据_错误保存_{timestamp}.xlsx"
             
             try:
-                self.data_storage.save_to_excel(self.data, filename)
-                self.logger.info(f"错误发生时已自动保存数据，共 {len(self.data)} 条记录")
+                # 出错时直接导出，不依赖写入线程的状态
+                self.sink.export(filename)
+                self.logger.info(f"错误发生时已自动保存数据，共 {self.sink.count()} 条记录")
                 self.logger.info(f"保存文件: {filename}")
             except Exception as save_error:
                 self.logger.error(f"保存错误数据时失败: {save_error}")
@@ -92,24 +123,140 @@ class BaseSpider(ABC):
         """
         清理资源
         """
+        if self.lookup:
+            stats = self.lookup.get_stats()
+            self.logger.info(
+                f"元素查找 {stats['lookup_count']} 次，缺失 {stats['missing_count']} 次，"
+                f"等待缺失元素耗时 {stats['missing_wait_seconds']} 秒"
+            )
+        stats = self.rate_controller.get_stats()
+        if stats["request_count"]:
+            self.logger.info(
+                f"请求 {stats['request_count']} 次，主动延时 {stats['delay_seconds']} 秒，"
+                f"抓取及提取 {stats['work_seconds']} 秒，退避 {stats['backoff_count']} 次"
+            )
+        pending = self.writer.pending_count()
+        if pending:
+            self.logger.info(f"等待 {pending} 个后台写入任务完成...")
+        self.writer.shutdown()
+        self.sink.close()
+        if self.writer.failed_count:
+            self.logger.warning(f"后台写入 {self.writer.written_count} 次，失败 {self.writer.failed_count} 次")
         if self.driver:
             BrowserManager.close_driver(self.driver)
             self.logger.info("浏览器驱动已关闭")
     
-    def add_data(self, item: Dict[str, Any]) -> None:
+    def is_seen(self, listing_id: Optional[str]) -> bool:
+        """
+        检查房源是否在之前的运行中已保存过
+        
+        Args:
+            listing_id: 房源ID
+            
+        Returns:
+            bool: 已保存过时返回True，未启用索引或没有ID时返回False
+        """
+        if not listing_id or not self.seen_index:
+            return False
+        # 落盘目标支持按ID查询时（如SQLite）直接查主键
+        if self.sink.contains(listing_id):
+            return True
+        return self.seen_index.contains(self.seen_source, listing_id)
+    
+    def add_data(self, item: Dict[str, Any], listing_id: Optional[str] = None) -> None:
         """
-        添加数据项
+        添加数据项，缓冲满 flush_records 条或距上次写入超过 flush_seconds 秒时写入落盘目标
         
         Args:
             item: 数据项
+            listing_id: 房源ID，数据项落盘后记入已爬取房源索引
         """
         self.data.append(item)
+        if self.seen_index and listing_id:
+            self.pending_seen.append(listing_id)
+        
+        config = Config.RECORD_BUFFER_CONFIG
+        if (len(self.data) >= config["flush_records"]
+                or time.monotonic() - self.last_flush >= config["flush_seconds"]):
+            self.flush_data()
+    
+    def flush_data(self) -> None:
+        """
+        把缓冲中的数据项交给后台线程写入落盘目标
+        """
+        self.last_flush = time.monotonic()
+        if not self.data and not self.pending_callbacks:
+            return
+        self.writer.submit("sink", self._write_batch, self.data, self.pending_seen, self.pending_callbacks)
+        self.data = []
+        self.pending_seen = []
+        self.pending_callbacks = []
+    
+    def after_persisted(self, callback: Callable[[], None]) -> None:
+        """
+        登记回调：此前添加的数据项全部写入落盘目标后，在写入线程中执行（如提交增量爬取水位）
+        
+        Args:
+            callback: 回调函数
+        """
+        self.pending_callbacks.append(callback)
+    
+    def _write_batch(self, records: List[Dict[str, Any]], listing_ids: List[str],
+                     callbacks: List[Callable[[], None]]) -> None:
+        """
+        在写入线程中写入一批数据项，写入成功后把对应的房源记入已爬取房源索引并执行落盘回调
+        
+        Args:
+            records: 数据项
+            listing_ids: 房源ID
+            callbacks: 本批数据项落盘后执行的回调
+        """
+        if records:
+            try:
+                self.sink.write(records)
+            except Exception:
+                self.write_failed = True
+                raise
+            self.logger.debug(f"已写入 {len(records)} 条数据，累计 {self.sink.count()} 条")
+            self.on_records_persisted(len(records))
+            if self.seen_index and listing_ids:
+                added = self.seen_index.add_many(self.seen_source, listing_ids)
+                self.logger.debug(f"已爬取房源索引新增 {added} 条，共 {self.seen_index.count(self.seen_source)} 条")
+        if not callbacks:
+            return
+        # 之前有批次写入失败时，这些回调对应的数据不完整，不再执行
+        if self.write_failed:
+            self.logger.warning(f"此前有数据写入失败，跳过 {len(callbacks)} 个落盘回调")
+            return
+        for callback in callbacks:
+            callback()
+    
+    def on_records_persisted(self, count: int) -> None:
+        """
+        数据项落盘后的回调（在写入线程中调用，子类可覆盖）
+        
+        Args:
+            count: 本批落盘的数据项数
+        """
+        pass
+    
+    def get_data(self) -> Iterator[Dict[str, Any]]:
+        """
+        按添加顺序逐条获取所有数据（已落盘的部分从落盘目标中读取）
+        
+        Returns:
+            Iterator[Dict[str, Any]]: 数据迭代器
+        """
+        self.writer.drain()
+        yield from self.sink.iter_records()
+        yield from list(self.data)
     
-    def get_data(self) -> List[Dict[str, Any]]:
+    def get_data_count(self) -> int:
         """
-        获取所有数据
+        获取数据项总数
         
         Returns:
-            List[Dict[str, Any]]: 数据列表
+            int: 数据项总数
         """
-        return self.data.copy() 
\ No newline at end of file
+        self.writer.drain()
+        return self.sink.count() + len(self.data)
\ No newline at end of file
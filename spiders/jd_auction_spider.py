@@ -2,6 +2,7 @@
 """
 京东法拍房爬虫
 """
+import glob
 import re
 import time
 import random
@@ -10,20 +11,45 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import undetected_chromedriver as uc
 from spiders.base_spider import BaseSpider
+from utils.browser import BrowserManager
 from utils.data_storage import DataStorage
+from utils.element_lookup import ElementLookup
+from utils.downloader import AttachmentDownloader
+from utils.html_parser import JD_FINAL_PRICE_XPATH, find_by_class, parse_fragment, parse_jd_detail
+from utils.asset_tables import AssetTableWriter, export_asset_folders
+from utils.run_journal import RunJournal
+from utils.sharding import jd_unit_label
+from utils.sqlite_store import SQLiteSink
 from config import Config
 import os
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+# 列表页拍卖项各字段的相对XPath及取值属性（None表示取文本）
+LIST_ITEM_FIELDS = {
+    "status": (".//a/div[3]/div[1]", None),
+    "link": (".//a", "href"),
+    "name": (".//a/div[2]/div[1]", None),
+    "image": (".//a/div[1]/div/img", "src"),
+    "current_value": (".//a/div[2]/div[2]/div[2]/em/b", None),
+    "esti_value": (".//a/div[2]/div[3]/div[1]/em", None),
+}
+# 详情页链接中的拍卖ID，如 https://paimai.jd.com/123456789
+AUCTION_ID_PATTERN = re.compile(r"/(\d+)(?:\.html)?/?$")
 
 class JDAuctionSpider(BaseSpider):
     """京东法拍房爬虫"""
     
-    def __init__(self, start_page: int = 1, max_pages: int = None, province: str = None, city: str = None, cutoff_time: str = None, resume_from_archive: bool = False):
+    RECORD_SCHEMA = "jd_auction"
+    
+    def __init__(self, start_page: int = 1, max_pages: int = None, province: str = None, city: str = None, cutoff_time: str = None, resume_from_archive: bool = False, detail_tabs: int = None, name_suffix: str = None, resume: bool = False):
         """
         初始化京东法拍房爬虫
         
@@ -34,8 +60,11 @@ class JDAuctionSpider(BaseSpider):
             city: 要爬取的城市
             cutoff_time: 截止时间，格式为"YYYY年MM月DD日 HH:MM:SS"，当拍卖结束时间早于此时间时停止爬取
             resume_from_archive: 是否从存档恢复爬取
+            detail_tabs: 同时加载的详情页标签数，1表示逐个打开
+            name_suffix: 爬虫名称后缀，用于区分分片的日志和输出文件
+            resume: 是否重放运行日志，从上次运行停止的页和拍卖项继续
         """
-        super().__init__("京东法拍房")
+        super().__init__(f"京东法拍房_{name_suffix}" if name_suffix else "京东法拍房")
         self.start_page = start_page
         self.max_pages = max_pages or Config.JD_AUCTION_CONFIG["max_pages"]
         self.config = Config.JD_AUCTION_CONFIG
@@ -43,7 +72,14 @@ class JDAuctionSpider(BaseSpider):
         self.should_stop = False  # 控制爬取停止的标志
         self.resume_from_archive = resume_from_archive
         self.last_crawled_asset_name = None  # 存档中最后一条记录的资产名称
+        self.last_crawled_end_time = None  # 存档中最后一条记录的结束时间
         self.should_start_crawling = True  # 是否开始正式爬取的标志
+        self.detail_tabs = max(1, detail_tabs or self.config["detail_tabs"])
+        self.list_host = self.rate_controller.host_of(self.config["base_url"])
+        self.seen_source = "jd_auction"
+        
+        # 附件和图片在后台线程中下载，不阻塞爬取流程
+        self.downloader = AttachmentDownloader(on_complete=self._on_download_complete)
         
         # 设置省份和城市
         self.province = province
@@ -52,6 +88,28 @@ class JDAuctionSpider(BaseSpider):
         # 验证省份和城市是否有效
         self._validate_location()
         
+        # 运行日志（每个省份/城市一个）
+        self.resume = resume
+        self.current_page = start_page
+        self.resume_done_ids = set()  # 续传页上已完成的拍卖项ID
+        self.current_auction_id: Optional[str] = None  # 正在处理的详情页的拍卖ID，附表按此ID写入落盘目标
+        self.journal = RunJournal(
+            os.path.join(self.config["journal_dir"], f"京东法拍房_{jd_unit_label(province, city)}.jsonl"),
+            fsync=self.config["journal_fsync"]
+        )
+        if self.resume:
+            self._resume_from_journal()
+        
+        # 资产附表汇总模式: 附表追加到本次运行的汇总表，不再为每个资产写Excel文件
+        self.asset_tables: Optional[AssetTableWriter] = None
+        if self.config["asset_table_mode"] == "run":
+            self.asset_tables = AssetTableWriter(
+                os.path.join(Config.OUTPUT_DIR,
+                             f"京东法拍附表_{jd_unit_label(province, city)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"),
+                file_format=self.config["asset_table_format"],
+                flush_assets=self.config["asset_table_flush"]
+            )
+        
         # 如果设置了截止时间，验证格式并记录
         if self.cutoff_time:
             self._validate_cutoff_time()
@@ -117,6 +175,52 @@ class JDAuctionSpider(BaseSpider):
             self.logger.warning(f"时间比较失败: {e}")
             return False
 
+    def _resume_from_journal(self) -> None:
+        """
+        重放运行日志，确定续传的起始页和该页已完成的拍卖项
+        """
+        state = self.journal.replay()
+        if not state:
+            self.logger.warning(f"未找到运行日志 {self.journal.path}，将从第 {self.start_page} 页开始爬取")
+            return
+        self.start_page = state["page"]
+        self.current_page = state["page"]
+        self.resume_done_ids = state["done_ids"]
+        status = "已正常结束" if state["finished"] else "未正常结束"
+        self.logger.info(
+            f"重放运行日志: 上次运行{status}，已保存 {state['item_count']} 条，"
+            f"从第 {self.start_page} 页继续（该页已完成 {len(self.resume_done_ids)} 条）"
+        )
+    
+    def on_records_persisted(self, count: int) -> None:
+        """
+        数据项落盘后记入运行日志
+        """
+        self.journal.persisted(count)
+    
+    def _get_last_asset_name_from_store(self) -> Optional[str]:
+        """
+        从SQLite数据库中获取之前的运行最后写入的本省份/城市记录的资产名称（按索引查询）
+        
+        Returns:
+            Optional[str]: 最后一条记录的资产名称，如果没有找到则返回None
+        """
+        try:
+            record = self.sink.store.latest_record(self.RECORD_SCHEMA, self.spider_name,
+                                                   省份=self.province, 城市=self.city)
+            if not record or not record["资产名称"]:
+                self.logger.info("数据库中没有之前运行的记录")
+                return None
+            last_asset_name = record["资产名称"]
+            self.logger.info(f"从数据库中读取到最后一条记录的资产名称: {last_asset_name}")
+            if record["结束时间"]:
+                self.last_crawled_end_time = record["结束时间"]
+            return str(last_asset_name.split("】")[1]).strip()
+            
+        except Exception as e:
+            self.logger.error(f"读取数据库记录失败: {e}")
+            return None
+    
     def _get_last_asset_name_from_archive(self) -> Optional[str]:
         """
         从存档文件中获取最后一条记录的资产名称
@@ -124,17 +228,23 @@ class JDAuctionSpider(BaseSpider):
         Returns:
             Optional[str]: 最后一条记录的资产名称，如果没有找到则返回None
         """
+        if isinstance(self.sink, SQLiteSink):
+            return self._get_last_asset_name_from_store()
+        
         try:
-            # 获取output目录下的所有xlsx文件
+            # 获取output目录下的存档文件（出错保存的文件名带时间戳），使用最新的一个
             output_dir = Config.OUTPUT_DIR
-            xlsx_files = os.path.join(output_dir, "京东法拍房_数据_错误保存.xlsx")
+            xlsx_files = glob.glob(os.path.join(output_dir, f"{glob.escape(self.spider_name)}_数据_错误保存*.xlsx"))
             
             if not xlsx_files:
                 self.logger.info("未找到任何xlsx存档文件")
                 return None
             
             # 读取Excel文件
-            df = pd.read_excel(xlsx_files)
+            archive_file = max(xlsx_files, key=os.path.getmtime)
+            self.logger.info(f"使用存档文件: {archive_file}")
+            # 导出文件按省份分工作表，合并全部工作表
+            df = pd.concat(pd.read_excel(archive_file, sheet_name=None).values(), ignore_index=True)
             
             if df.empty:
                 self.logger.info("存档文件为空")
@@ -153,6 +263,11 @@ class JDAuctionSpider(BaseSpider):
                 return None
             
             self.logger.info(f"从存档文件中读取到最后一条记录的资产名称: {last_asset_name}")
+            
+            # 记录最后一条记录的结束时间，用于二分定位恢复位置所在页
+            if "结束时间" in df.columns and not pd.isna(df["结束时间"].iloc[-1]):
+                self.last_crawled_end_time = str(df["结束时间"].iloc[-1]).strip()
+            
             return str(last_asset_name.split("】")[1]).strip()
             
         except Exception as e:
@@ -185,15 +300,48 @@ class JDAuctionSpider(BaseSpider):
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--disable-blink-features=AutomationControlled")
+            BrowserManager.apply_lean_options(options, self.config)
             
             # 创建 undetected-chromedriver 实例
             self.driver = uc.Chrome(options=options, version_main=None)
+            BrowserManager.apply_resource_blocking(self.driver, self.config)
+            self.lookup = ElementLookup(self.driver)
             self.logger.info("成功创建 undetected-chromedriver 浏览器实例")
             
         except Exception as e:
             self.logger.error(f"创建浏览器驱动失败: {e}")
             raise Exception(f"无法创建浏览器驱动: {e}")
     
+    def cleanup(self) -> None:
+        """
+        清理资源（先等待后台下载完成）
+        """
+        pending = self.downloader.pending_count()
+        if pending:
+            self.logger.info(f"等待 {pending} 个后台下载任务完成...")
+        self.downloader.shutdown()
+        self.logger.info(f"附件下载完成: 成功 {self.downloader.completed_count} 个，失败 {self.downloader.failed_count} 个")
+        if self.asset_tables:
+            # 在写入线程中合并汇总表，排在已提交的附表之后
+            self.writer.submit("asset_tables", self._close_asset_tables)
+        super().cleanup()
+        # 写入线程结束后再关闭运行日志，保证落盘进度都已记录
+        self.journal.close()
+    
+    def _on_download_complete(self, url: str, filepath: str, success: bool) -> None:
+        """
+        后台下载完成回调
+        
+        Args:
+            url: 文件URL
+            filepath: 保存路径
+            success: 是否下载成功
+        """
+        if success:
+            self.logger.debug(f"下载完成: {filepath}")
+        else:
+            self.logger.warning(f"下载失败: {url}")
+    
     def run(self) -> None:
         """
         运行爬虫逻辑
@@ -728,9 +876,11 @@ class JDAuctionSpider(BaseSpider):
         """
         page_no = int(self.driver.find_element(By.CLASS_NAME, "ui-pager-current").text)
         page_no = self.transfer_to_start_page(page_no, self.start_page)
+        self.journal.start(resume=self.resume, province=self.province, city=self.city, start_page=self.start_page)
         
-        consecutive_failures = 0  # 连续失败次数
-        max_consecutive_failures = 3  # 最大连续失败次数
+        # 二分定位截止时间所在页和存档恢复位置所在页
+        if self.config["locate_pages"]:
+            page_no = self.locate_pages(page_no)
         
         # 存档恢复模式的日志记录
         if self.resume_from_archive:
@@ -742,9 +892,13 @@ class JDAuctionSpider(BaseSpider):
         while page_no <= self.max_pages and not self.should_stop:
             try:
                 self.logger.info(f"正在爬取第 {page_no} 页")
+                self.current_page = page_no
                 
-                # 随机等待页面加载，模拟人类行为
-                sleep(random.uniform(3, 6))
+                # 等待列表加载（翻页节奏由节奏控制器在点击翻页时控制）
+                try:
+                    self.lookup.wait_required(By.XPATH, self.config["list_xpath"])
+                except TimeoutException:
+                    pass
                 
                 # 获取列表项
                 list_elements = self.driver.find_elements(By.XPATH, self.config["list_xpath"])
@@ -755,40 +909,19 @@ class JDAuctionSpider(BaseSpider):
                 self.logger.info(f"本页找到 {len(list_elements)} 个拍卖项")
                 
                 # 处理每个拍卖项
-                success_count = 0
-                for index, element in enumerate(list_elements):
-                    try:
-                        # 检查是否需要停止爬取
-                        if self.should_stop:
-                            self.logger.info("检测到停止信号，结束爬取")
-                            break
-                        
-                        # 添加随机延时，避免操作过快
-                        if index > 0:
-                            sleep(random.uniform(1, 3))
-                        
-                        self.logger.info(f"正在处理第 {index + 1} 个拍卖项")
-                        self.process_auction_item(element)
-                        success_count += 1
-                        
-                        # 每处理几个项目后稍作休息
-                        if (index + 1) % 5 == 0:
-                            self.logger.info(f"已处理 {index + 1} 个项目，休息片刻...")
-                            sleep(random.uniform(5, 10))
-                        
-                    except Exception as e:
-                        self.logger.error(f"处理拍卖项 {index + 1} 时出错: {e}")
-                        continue
+                if self.detail_tabs > 1:
+                    success_count = self.process_page_pipelined(list_elements)
+                else:
+                    success_count = self.process_page_serial(list_elements)
                 
                 self.logger.info(f"第 {page_no} 页处理完成，成功处理 {success_count}/{len(list_elements)} 个拍卖项")
+                self.journal.page_done(page_no)
                 
                 # 如果因为时间截止而停止，退出循环
                 if self.should_stop:
                     self.logger.info("达到时间截止条件，停止爬取")
                     break
                 
-                # 重置连续失败计数
-                
                 # 翻页
                 target_page = page_no + 1
                 new_page_no = self.transfer_to_start_page(page_no, target_page)
@@ -808,87 +941,349 @@ class JDAuctionSpider(BaseSpider):
         # 爬取结束，保存数据
         self.logger.info("数据爬取完成，正在保存数据...")
         self.save_data()
+        self.journal.finish()
     
-    def process_auction_item(self, element) -> None:
+    def process_page_serial(self, list_elements) -> int:
         """
-        处理单个拍卖项
+        逐个打开详情页处理本页拍卖项
         
         Args:
-            element: 拍卖项元素
+            list_elements: 本页的拍卖项元素
+            
+        Returns:
+            int: 成功处理的拍卖项数
+        """
+        success_count = 0
+        for index, element in enumerate(list_elements):
+            try:
+                # 检查是否需要停止爬取
+                if self.should_stop:
+                    self.logger.info("检测到停止信号，结束爬取")
+                    break
+                
+                # 详情页的打开节奏由节奏控制器控制
+                self.logger.info(f"正在处理第 {index + 1} 个拍卖项")
+                self.process_auction_item(element)
+                success_count += 1
+                
+            except Exception as e:
+                self.logger.error(f"处理拍卖项 {index + 1} 时出错: {e}")
+                continue
+        return success_count
+    
+    def process_page_pipelined(self, list_elements) -> int:
+        """
+        同时保持多个详情页标签加载，哪个先加载完成就先提取，结果按列表顺序写回
+        
+        Args:
+            list_elements: 本页的拍卖项元素
+            
+        Returns:
+            int: 成功处理的拍卖项数
+        """
+        # 先读取本页所有拍卖项的列表信息（存档恢复等过滤按列表顺序进行）
+        items = []
+        for index, element in enumerate(list_elements):
+            try:
+                item = self.read_auction_item(element)
+                if item:
+                    items.append(item)
+            except Exception as e:
+                self.logger.error(f"处理拍卖项 {index + 1} 时出错: {e}")
+        
+        if not items:
+            return 0
+        
+        self.logger.info(f"本页需要打开 {len(items)} 个详情页，同时加载 {self.detail_tabs} 个标签")
+        details = self.fetch_details_pipelined([item["link"] for item in items])
+        
+        # 按列表顺序写回，遇到截止时间后停止
+        success_count = 0
+        for item, detail_info in zip(items, details):
+            if self.should_stop:
+                self.logger.info("检测到停止信号，结束爬取")
+                break
+            if detail_info:
+                self.record_auction_item(item, detail_info)
+                success_count += 1
+        return success_count
+    
+    def fetch_details_pipelined(self, urls: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        流水线方式获取多个详情页
+        
+        Args:
+            urls: 详情页URL列表
+            
+        Returns:
+            List[Optional[Dict[str, Any]]]: 与URL顺序一致的详情信息，失败的为None
         """
+        main_window = self.driver.current_window_handle
+        results: List[Optional[Dict[str, Any]]] = [None] * len(urls)
+        in_flight: Dict[str, Tuple[int, float]] = {}  # 标签句柄 -> (序号, 打开时间)
+        next_index = 0
+        # 结束时间早于截止时间的第一个拍卖项：此后的详情页不再打开，已打开的不再提取
+        cutoff_index: Optional[int] = None
+        # 截止拍卖项的标签 (句柄, 序号)：前面的标签都处理完、确认它是第一个早于截止时间的拍卖项后再下载附件和保存附表
+        deferred: Optional[Tuple[str, int]] = None
+        
         try:
-            # 获取拍卖状态
-            status_element = element.find_element(By.XPATH, ".//a/div[3]/div[1]")
-            item_status = status_element.text
+            while (next_index < len(urls) and cutoff_index is None) or in_flight:
+                # 补足正在加载的标签，按节奏控制器的间隔打开
+                while (next_index < len(urls) and cutoff_index is None and len(in_flight) < self.detail_tabs
+                       and not self.should_stop):
+                    self.rate_controller.wait(self.rate_controller.host_of(urls[next_index]))
+                    handle = self._open_detail_tab(urls[next_index], main_window)
+                    in_flight[handle] = (next_index, time.time())
+                    next_index += 1
+                
+                if not in_flight:
+                    break
+                
+                # 提取最先加载完成的标签
+                handle = self._wait_for_ready_tab(in_flight)
+                index, _ = in_flight.pop(handle)
+                if cutoff_index is not None and index > cutoff_index:
+                    self.logger.info(f"第 {index + 1} 个详情页在截止时间之后，不再处理")
+                    self._close_tab(handle, main_window)
+                    continue
+                
+                self.logger.info(f"正在处理第 {index + 1} 个详情页")
+                keep_open = False
+                try:
+                    # 打开时已按节奏等待，这里只统计提取耗时
+                    with self.rate_controller.request(self.rate_controller.host_of(urls[index]), pace=False):
+                        self.driver.switch_to.window(handle)
+                        detail_info = self.read_detail_window(urls[index])
+                        if self._is_end_time_before_cutoff(detail_info.get('结束时间', '')):
+                            # 前面还有更早的截止拍卖项时，原来的截止拍卖项不再保存
+                            if deferred:
+                                results[deferred[1]] = None
+                                self._close_tab(deferred[0], main_window)
+                            cutoff_index = index
+                            deferred = (handle, index)
+                            keep_open = True
+                            results[index] = detail_info
+                        else:
+                            self.save_detail_assets(urls[index], detail_info)
+                            results[index] = detail_info
+                except Exception as e:
+                    self.logger.error(f"获取拍卖详情失败: {e}")
+                finally:
+                    if not keep_open:
+                        self._close_tab(handle, main_window)
+                
+                # 截止拍卖项之前的标签都已处理完时，保存它的附件和附表
+                if deferred and all(other_index > deferred[1] for other_index, _ in in_flight.values()):
+                    handle, index = deferred
+                    deferred = None
+                    try:
+                        with self.rate_controller.request(self.rate_controller.host_of(urls[index]), pace=False):
+                            self.driver.switch_to.window(handle)
+                            self.save_detail_assets(urls[index], results[index])
+                    except Exception as e:
+                        self.logger.error(f"保存拍卖详情附件失败: {e}")
+                    finally:
+                        self._close_tab(handle, main_window)
+        finally:
+            # 出错或停止时关闭仍在加载的标签
+            for handle in list(in_flight) + ([deferred[0]] if deferred else []):
+                self._close_tab(handle, main_window)
+            self.driver.switch_to.window(main_window)
+        
+        return results
+    
+    def _open_detail_tab(self, url: str, main_window: str) -> str:
+        """
+        在新标签中打开详情页，不等待加载
+        
+        Returns:
+            str: 新标签的句柄
+        """
+        self.driver.switch_to.window(main_window)
+        before = set(self.driver.window_handles)
+        self.driver.execute_script("window.open(arguments[0], '_blank');", url)
+        new_handles = [handle for handle in self.driver.window_handles if handle not in before]
+        if not new_handles:
+            raise Exception(f"打开详情页标签失败: {url}")
+        return new_handles[0]
+    
+    def _wait_for_ready_tab(self, in_flight: Dict[str, Tuple[int, float]]) -> str:
+        """
+        轮询正在加载的标签，返回第一个加载完成（或超时）的标签
+        
+        Args:
+            in_flight: 标签句柄 -> (序号, 打开时间)
             
-            # 只处理已结束的拍卖
-            if item_status not in ['已结束', '已暂缓', '已中止']:
-                return
+        Returns:
+            str: 标签句柄
+        """
+        timeout = Config.BROWSER_CONFIG["page_load_timeout"]
+        while True:
+            # 按打开顺序检查，先打开的优先
+            for handle, (_, opened_at) in sorted(in_flight.items(), key=lambda entry: entry[1][0]):
+                if time.time() - opened_at > timeout:
+                    self.logger.warning("详情页加载超时，直接尝试提取")
+                    return handle
+                try:
+                    self.driver.switch_to.window(handle)
+                    if self.driver.execute_script("return document.readyState") == "complete":
+                        return handle
+                except Exception as e:
+                    self.logger.debug(f"检查标签加载状态时出错: {e}")
+                    return handle
+            sleep(0.2)
+    
+    def _close_tab(self, handle: str, main_window: str) -> None:
+        """
+        关闭标签并回到主窗口
+        """
+        try:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        except Exception as e:
+            self.logger.debug(f"关闭标签时出错: {e}")
+        finally:
+            self.driver.switch_to.window(main_window)
+    
+    def read_auction_item(self, element) -> Optional[Dict[str, str]]:
+        """
+        读取列表页拍卖项的基本信息，并按状态、存档恢复和类型过滤
+        
+        Args:
+            element: 拍卖项元素
             
-            # 获取基本信息
-            link = element.find_element(By.XPATH, ".//a").get_property("href")
-            item_name = element.find_element(By.XPATH, ".//a/div[2]/div[1]").text
-            image = element.find_element(By.XPATH, ".//a/div[1]/div/img").get_attribute('src')
-            current_value = element.find_element(By.XPATH, ".//a/div[2]/div[2]/div[2]/em/b").text
-            esti_value = element.find_element(By.XPATH, ".//a/div[2]/div[3]/div[1]/em").text
+        Returns:
+            Optional[Dict[str, str]]: 需要打开详情页的拍卖项，不需要处理时返回None
+        """
+        # 一次探测拍卖项的所有字段
+        fields = self.lookup.probe(element, LIST_ITEM_FIELDS)
+        
+        # 获取拍卖状态
+        item_status = fields["status"]
+        if item_status is None:
+            self.logger.error("处理拍卖项时出错: 未找到拍卖状态")
+            return None
+        
+        # 只处理已结束的拍卖
+        if item_status not in ['已结束', '已暂缓', '已中止']:
+            return None
+        
+        # 获取基本信息
+        missing_fields = [key for key, value in fields.items() if value is None]
+        if missing_fields:
+            self.logger.error(f"处理拍卖项时出错: 缺少字段 {', '.join(missing_fields)}")
+            return None
+        item_name = fields["name"]
 
-            # 如果启用了存档恢复模式，检查是否应该开始爬取
-            if self.resume_from_archive and not self.should_start_crawling:
-                if item_name == self.last_crawled_asset_name:
-                    self.logger.info(f"找到存档中的最后一条记录: {item_name}，跳过该记录，从下一条开始爬取")
-                    self.should_start_crawling = True
-                    return  # 跳过这一条记录
-                else:
-                    self.logger.info(f"跳过记录: {item_name} (正在寻找: {self.last_crawled_asset_name})")
-                    return  # 继续跳过，直到找到目标记录
+        # 如果启用了存档恢复模式，检查是否应该开始爬取
+        if self.resume_from_archive and not self.should_start_crawling:
+            if item_name == self.last_crawled_asset_name:
+                self.logger.info(f"找到存档中的最后一条记录: {item_name}，跳过该记录，从下一条开始爬取")
+                self.should_start_crawling = True
+                return None  # 跳过这一条记录
+            else:
+                self.logger.info(f"跳过记录: {item_name} (正在寻找: {self.last_crawled_asset_name})")
+                return None  # 继续跳过，直到找到目标记录
+        
+        # 跳过车位、车库拍卖项
+        if '车位' in item_name or '车库' or '地下室' in item_name:
+            self.logger.info(f"跳过车位、车库、地下室拍卖项: {item_name}")
+            return None
+        
+        # 之前的运行中已保存过的拍卖项不再打开详情页
+        fields["auction_id"] = self.auction_id(fields["link"])
+        if self.is_seen(fields["auction_id"]):
+            self.logger.info(f"跳过已爬取的拍卖项: {item_name}")
+            return None
+        if fields["auction_id"] in self.resume_done_ids:
+            self.logger.info(f"跳过续传前已完成的拍卖项: {item_name}")
+            return None
+        
+        return fields
+    
+    @staticmethod
+    def auction_id(url: str) -> str:
+        """
+        从详情页链接中获取拍卖ID
+        
+        Args:
+            url: 详情页链接
             
-            # 跳过车位、车库拍卖项
-            if '车位' in item_name or '车库' or '地下室' in item_name:
-                self.logger.info(f"跳过车位、车库、地下室拍卖项: {item_name}")
+        Returns:
+            str: 拍卖ID，链接格式无法识别时返回去掉查询参数的链接
+        """
+        parsed = urlparse(url)
+        match = AUCTION_ID_PATTERN.search(parsed.path)
+        if match:
+            return match.group(1)
+        return f"{parsed.netloc}{parsed.path}"
+    
+    def record_auction_item(self, item: Dict[str, str], detail_info: Dict[str, Any]) -> None:
+        """
+        合并列表信息和详情信息，保存数据项并检查截止时间
+        
+        Args:
+            item: 列表页拍卖项信息
+            detail_info: 详情信息
+        """
+        current_asset_name = detail_info.get('资产名称', '')
+        
+        # 检查结束时间是否早于截止时间
+        end_time = detail_info.get('结束时间', '')
+        if self._is_end_time_before_cutoff(end_time):
+            self.logger.info(f"拍卖项 '{current_asset_name}' 的结束时间早于截止时间，设置停止标志")
+            self.should_stop = True
+            # 仍然保存当前这一条数据，然后停止
+        
+        # 构建数据项
+        data_item = {
+            "资产名称": current_asset_name,
+            "拍卖ID": item["auction_id"],
+            "省份": self.province,
+            "城市": self.city or '',
+            "竞价状态": item["status"],
+            "结束时间": detail_info.get('结束时间', ''),
+            "是否流拍": detail_info.get('是否流拍', ''),
+            "流拍原因": detail_info.get('流拍原因', ''),
+            "图片": item["image"],
+            "当前价": item["current_value"],
+            "评估价": item["esti_value"],
+            "围观人数": detail_info.get('围观人数', ''),
+            "报名人数": detail_info.get('报名人数', ''),
+            "关注提醒人数": detail_info.get('关注提醒人数', ''),
+            "成交价": detail_info.get('成交价格', ''),
+            "起拍价": detail_info.get('起拍价格', ''),
+            "变卖价格": detail_info.get('变卖价格', ''),
+            "加价幅度": detail_info.get('加价幅度', ''),
+            "保证金": detail_info.get('保证金', ''),
+            "竞价周期": detail_info.get('竞价周期', ''),
+            "变卖周期": detail_info.get('变卖周期', ''),
+            "延时周期": detail_info.get('延时周期', '')
+        }
+        
+        self.journal.item_done(self.current_page, item["auction_id"])
+        self.add_data(data_item, item["auction_id"])
+        self.logger.info(f"成功处理拍卖项: {current_asset_name}")
+    
+    def process_auction_item(self, element) -> None:
+        """
+        处理单个拍卖项
+        
+        Args:
+            element: 拍卖项元素
+        """
+        try:
+            item = self.read_auction_item(element)
+            if not item:
                 return
-
+            
             # 获取详细信息
-            detail_info = self.get_auction_detail(link)
+            detail_info = self.get_auction_detail(item["link"])
             if not detail_info:
                 return
-            current_asset_name = detail_info.get('资产名称', '')
-            
-            # 检查结束时间是否早于截止时间
-            end_time = detail_info.get('结束时间', '')
-            if self._is_end_time_before_cutoff(end_time):
-                self.logger.info(f"拍卖项 '{current_asset_name}' 的结束时间早于截止时间，设置停止标志")
-                self.should_stop = True
-                # 仍然保存当前这一条数据，然后停止
-            
-            # 构建数据项
-            data_item = {
-                "资产名称": current_asset_name,
-                "竞价状态": item_status,
-                "结束时间": detail_info.get('结束时间', ''),
-                "是否流拍": detail_info.get('是否流拍', ''),
-                "流拍原因": detail_info.get('流拍原因', ''),
-                "图片": image,
-                "当前价": current_value,
-                "评估价": esti_value,
-                "围观人数": detail_info.get('围观人数', ''),
-                "报名人数": detail_info.get('报名人数', ''),
-                "关注提醒人数": detail_info.get('关注提醒人数', ''),
-                "成交价": detail_info.get('成交价格', ''),
-                "起拍价": detail_info.get('起拍价格', ''),
-                "变卖价格": detail_info.get('变卖价格', ''),
-                "加价幅度": detail_info.get('加价幅度', ''),
-                "保证金": detail_info.get('保证金', ''),
-                "竞价周期": detail_info.get('竞价周期', ''),
-                "变卖周期": detail_info.get('变卖周期', ''),
-                "延时周期": detail_info.get('延时周期', '')
-            }
-            
-            self.add_data(data_item)
-            self.logger.info(f"成功处理拍卖项: {current_asset_name}")
-            
-            # 如果设置了停止标志，提前返回
-            if self.should_stop:
-                return
+            
+            self.record_auction_item(item, detail_info)
             
         except Exception as e:
             self.logger.error(f"处理拍卖项时出错: {e}")
@@ -907,41 +1302,22 @@ class JDAuctionSpider(BaseSpider):
         main_window = self.driver.current_window_handle
         
         try:
-            # 打开新窗口
-            self.driver.execute_script(f"window.open('{url}', '_blank');")
-            
-            # 切换到新窗口
-            all_windows = self.driver.window_handles
-            for window in all_windows:
-                if window != main_window:
-                    self.driver.switch_to.window(window)
-                    break
-            
-            # 等待页面加载
-            WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            
-            # 处理验证弹窗
-            self.handle_verification_popup()
-            
-            # 获取详细信息
-            detail_info = self.extract_detail_info()
-            
-            # 下载附件和图片
-            self.download_attachments(detail_info.get('资产名称', ''))
-
-            # 获取标的物调查表
-            self.extract_property_survey_table(detail_info.get('资产名称', ''))
-
-            # 获取竞买公告和竞买须知
-            self.extract_notice_info(detail_info.get('资产名称', ''))
-
-            # 获取竞价记录
-            self.extract_bidding_info(detail_info.get('资产名称', ''))
-
-            # 获取优先购买权人
-            self.extract_priority_purchaser(detail_info.get('资产名称', ''))
-
-            return detail_info
+            # 按节奏打开详情页，提取耗时计入请求间隔
+            with self.rate_controller.request(self.rate_controller.host_of(url)):
+                # 打开新窗口
+                self.driver.execute_script(f"window.open('{url}', '_blank');")
+                
+                # 切换到新窗口
+                all_windows = self.driver.window_handles
+                for window in all_windows:
+                    if window != main_window:
+                        self.driver.switch_to.window(window)
+                        break
+                
+                # 等待页面加载
+                WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                
+                return self.scrape_detail_window(url)
             
         except Exception as e:
             self.logger.error(f"获取拍卖详情失败: {e}")
@@ -951,6 +1327,62 @@ class JDAuctionSpider(BaseSpider):
             self.driver.close()
             self.driver.switch_to.window(main_window)
     
+    def scrape_detail_window(self, url: str) -> Dict[str, Any]:
+        """
+        在当前窗口（已打开的详情页）中提取详情、下载附件并保存附表
+        
+        Args:
+            url: 拍卖详情页URL
+            
+        Returns:
+            Dict[str, Any]: 详情信息
+        """
+        detail_info = self.read_detail_window(url)
+        self.save_detail_assets(url, detail_info)
+        return detail_info
+    
+    def read_detail_window(self, url: str) -> Dict[str, Any]:
+        """
+        在当前窗口（已打开的详情页）中提取详情信息
+        
+        Args:
+            url: 拍卖详情页URL
+            
+        Returns:
+            Dict[str, Any]: 详情信息
+        """
+        # 处理验证弹窗
+        self.handle_verification_popup()
+        self.current_auction_id = self.auction_id(url)
+        
+        # 获取详细信息
+        return self.extract_detail_info()
+    
+    def save_detail_assets(self, url: str, detail_info: Dict[str, Any]) -> None:
+        """
+        在当前窗口（已打开的详情页）中下载附件并保存附表
+        
+        Args:
+            url: 拍卖详情页URL
+            detail_info: 详情信息
+        """
+        self.current_auction_id = self.auction_id(url)
+        
+        # 下载附件和图片
+        self.download_attachments(detail_info.get('资产名称', ''))
+
+        # 获取标的物调查表
+        self.extract_property_survey_table(detail_info.get('资产名称', ''))
+
+        # 获取竞买公告和竞买须知
+        self.extract_notice_info(detail_info.get('资产名称', ''))
+
+        # 获取竞价记录
+        self.extract_bidding_info(detail_info.get('资产名称', ''))
+
+        # 获取优先购买权人
+        self.extract_priority_purchaser(detail_info.get('资产名称', ''))
+    
     def extract_detail_info(self) -> Dict[str, Any]:
         """
         提取详情信息
@@ -959,81 +1391,27 @@ class JDAuctionSpider(BaseSpider):
             Dict[str, Any]: 详情信息
         """
         try:
-            # 获取标题
-            name = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "pm-name"))
-            ).text
+            # 等待标题出现，确保详情页已渲染
+            name_element = self.lookup.wait_required(By.CLASS_NAME, "pm-name")
             
-            # 获取成交价格
+            # 成交价格在标题之后渲染，先等待它出现再取快照；未成交的拍卖没有该元素，超时后照常解析
             try:
-                final_price = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//*[@id='pageContainer']/div[2]/div[1]/div[2]/div[3]/div[3]/div[1]/div/div[2]"))
-                ).text
-            except:
-                final_price = ''
+                self.lookup.wait_required(By.XPATH, "//*[@id='pageContainer']" + JD_FINAL_PRICE_XPATH[1:])
+            except TimeoutException:
+                self.logger.debug("未找到成交价格")
             
-            # 获取流拍信息
-            bidding_result = self.driver.find_element(By.XPATH, "//*[@id='pageContainer']/div[2]/div[1]/div[2]/div[3]/div[1]/div[1]/div").text
-            if '流拍' in bidding_result:
-                if_unsold = '是'
-                unsold_reason = '本标的物已流拍'
-            else:
-                if_unsold = '否'
-                unsold_reason = ''
-            
-            # 获取其他信息
-            info_html = self.driver.find_element(By.XPATH, "//*[@id='pageContainer']/div[2]/div[1]/div[2]/div[3]/div[1]/div[2]/div").text
-            
-            # 使用正则表达式提取信息
-            end_time_match = re.search(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', info_html)
-            end_time = end_time_match.group(0) if end_time_match else ''
-            
-            watched_match = re.search(r'(\d+)人围观', info_html)
-            watched_times = watched_match.group(1) if watched_match else ''
-            
-            signin_match = re.search(r'(\d+)人报名', info_html)
-            signin_times = signin_match.group(1) if signin_match else ''
-            
-            attention_match = re.search(r'(\d+)人关注', info_html)
-            attention_times = attention_match.group(1) if attention_match else ''
-            
-            bidding_info = self.driver.find_element(By.XPATH, "//*[@id='pageContainer']/div[2]/div[1]/div[2]/div[4]/div[2]/div/div[1]/div/ul").text #竞价信息
-            bidding_info = bidding_info.replace(',', '')
-            make_up_match = re.search(r'加价幅度：\n￥\n(\d+)\n', bidding_info)
-            make_up = make_up_match.group(1) if make_up_match else ''
-            delay_cycle_match = re.search(r'延时周期：\n(\d+)分钟/次\n', bidding_info)
-            delay_cycle = delay_cycle_match.group(1) if delay_cycle_match else ''
-            # 判断是否为变卖
-            if '变卖' in name:
-                sell_off_price_match = re.search(r'变卖价：\n￥\n(\d+)\n', bidding_info)
-                sell_off_price = sell_off_price_match.group(1) if sell_off_price_match else ''
-                sell_off_cycle_match = re.search(r'变卖周期：\n(\d+)天\n', bidding_info)
-                sell_off_cycle = sell_off_cycle_match.group(1) if sell_off_cycle_match else ''
-                
-                return {
-                    '资产名称': name, '结束时间': end_time, '是否流拍': if_unsold, '流拍原因': unsold_reason,
-                    '围观人数': watched_times, '报名人数': signin_times, '关注提醒人数': attention_times,
-                    "成交价格": final_price, '起拍价格': '', '变卖价格': sell_off_price,
-                    '加价幅度': make_up, '保证金': '', '竞价周期': '', '变卖周期': sell_off_cycle, '延时周期': delay_cycle
-                }
-            else:
-                start_price_match = re.search(r'起拍价：\n￥\n(\d+)\n', bidding_info)
-                start_price = start_price_match.group(1) if start_price_match else ''
-                margin_match = re.search(r'保证金：\n￥\n(\d+)\n', bidding_info)
-                margin = margin_match.group(1) if margin_match else ''
-                bidding_cycle_match = re.search(r'竞价周期：\n(\d+)天\n', bidding_info)
-                bidding_cycle = bidding_cycle_match.group(1) if bidding_cycle_match else ''
-                
-                return {
-                    '资产名称': name, '结束时间': end_time, '是否流拍': if_unsold, '流拍原因': unsold_reason,
-                    '围观人数': watched_times, '报名人数': signin_times, '关注提醒人数': attention_times,
-                    "成交价格": final_price, '起拍价格': start_price, '变卖价格': '',
-                    '加价幅度': make_up, '保证金': margin, '竞价周期': bidding_cycle, '变卖周期': '', '延时周期': delay_cycle
-                }
+            # 一次性获取 pageContainer 的HTML，离线解析所有字段
+            container = self.lookup.require(None, By.ID, "pageContainer")
+            root = parse_fragment(container.get_attribute("outerHTML"))
+            
+            # 标题不在 pageContainer 内时使用已等待到的元素
+            name = None if find_by_class(root, "pm-name") is not None else name_element.text
+            return parse_jd_detail(root, name)
                 
         except Exception as e:
             self.logger.error(f"提取详情信息失败: {e}")
             return {}
+
     def extract_property_survey_table(self, asset_name: str) -> None:
         """
         提取标的物调查表
@@ -1045,9 +1423,6 @@ class JDAuctionSpider(BaseSpider):
             return
         
         try:
-            # 创建文件夹
-            folder_path = self.data_storage.create_folder(f"京东法拍/{asset_name}")
-            
             # 提取标的物调查表
             try:
                 table_content = WebDriverWait(self.driver, 10).until(
@@ -1059,9 +1434,7 @@ class JDAuctionSpider(BaseSpider):
                 if tables:
                     table = tables[0]
                     df = pd.read_html(str(table))[0]
-                    file_path = os.path.join(folder_path, "拍卖标的物调查情况表（房产）.xlsx")
-                    df.to_excel(file_path, index=False)
-                    self.logger.info(f"标的物调查表已保存到: {file_path}")
+                    self._save_asset_table(asset_name, "拍卖标的物调查情况表（房产）.xlsx", df, "标的物调查表")
                 else:
                     self.logger.info("未找到表格内容")
             except Exception as e:
@@ -1092,22 +1465,25 @@ class JDAuctionSpider(BaseSpider):
             
             # 下载PDF文件
             try:
-                file_list = self.driver.find_elements(By.XPATH, f"//*[@id='pmMainFloor']/ul/li[1]/div[1]/div/div/div[1]/ul/li")
+                file_list = self.lookup.find_all(None, By.XPATH, f"//*[@id='pmMainFloor']/ul/li[1]/div[1]/div/div/div[1]/ul/li")
                 for file in file_list:
-                    file_url = file.find_element(By.XPATH, ".//*[@id='openAttachmentTag']").get_property("href")
-                    file_name = file.find_element(By.XPATH, ".//*[@id='openAttachmentTag']").text
+                    attachment = self.lookup.find_optional(file, By.XPATH, ".//*[@id='openAttachmentTag']")
+                    if attachment is None:
+                        continue
+                    file_url = attachment.get_property("href")
+                    file_name = attachment.text
                     file_path = os.path.join(folder_path, file_name)
-                    self.data_storage.download_file(file_url, file_path)
+                    self.downloader.submit(file_url, file_path)
             except:
                 pass
             
             # 下载图片
             try:
-                img_list = self.driver.find_elements(By.XPATH, f"//*[@id='pmMainFloor']/ul/li[1]/div[2]/a")
+                img_list = self.lookup.find_all(None, By.XPATH, f"//*[@id='pmMainFloor']/ul/li[1]/div[2]/a")
                 for i, img in enumerate(img_list):
                     img_url = img.get_attribute('href')
                     img_path = os.path.join(folder_path, f"{i}.jpg")
-                    self.data_storage.download_file(img_url, img_path)
+                    self.downloader.submit(img_url, img_path)
             except:
                 pass
                 
@@ -1147,10 +1523,7 @@ class JDAuctionSpider(BaseSpider):
             
             # 如果有资产名称，保存到Excel文件
             if asset_name:
-                folder_path = self.data_storage.create_folder(f"京东法拍/{asset_name}")
-                file_path = os.path.join(folder_path, "竞买公告和竞买须知.xlsx")
-                pd.DataFrame(result).to_excel(file_path, index=False)
-                self.logger.info(f"竞买公告和竞买须知已保存到: {file_path}")                
+                self._save_asset_table(asset_name, "竞买公告和竞买须知.xlsx", pd.DataFrame(result), "竞买公告和竞买须知")
         except Exception as e:
             self.logger.error(f"提取竞买公告和竞买须知失败: {e}")
 
@@ -1209,11 +1582,15 @@ class JDAuctionSpider(BaseSpider):
                         self.logger.info("无下一页信息或已到达最后一页")
                         break
 
-                    # 点击下一页
+                    # 点击下一页（按节奏控制器的间隔），并等待表格内容更新
                     try:
-                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
-                        WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(next_button)).click()
-                        sleep(random.uniform(2, 4))  # 随机等待时间
+                        with self.rate_controller.request(self.rate_controller.host_of(self.driver.current_url)):
+                            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
+                            previous_rows = bidding_record.find_element(By.TAG_NAME, "tbody").get_attribute("innerHTML")
+                            WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable(next_button)).click()
+                            WebDriverWait(self.driver, 10).until(
+                                lambda driver: bidding_record.find_element(By.TAG_NAME, "tbody").get_attribute("innerHTML") != previous_rows
+                            )
                         self.logger.info("正在查找下一页出价信息...")
                     except Exception as e:
                         self.logger.warning(f"翻页失败: {e}")
@@ -1225,11 +1602,8 @@ class JDAuctionSpider(BaseSpider):
 
             # 保存竞价记录到Excel文件
             if bidding_records:
-                folder_path = self.data_storage.create_folder(f"京东法拍/{asset_name}")
-                file_path = os.path.join(folder_path, "出价记录.xlsx")
-                bidding_df = pd.DataFrame(bidding_records)
-                bidding_df.to_excel(file_path, index=False)
-                self.logger.info(f"竞价记录已保存到: {file_path}，共 {len(bidding_records)} 条记录")
+                self._save_asset_table(asset_name, "出价记录.xlsx", pd.DataFrame(bidding_records),
+                                       f"竞价记录（共 {len(bidding_records)} 条记录）")
             else:
                 self.logger.info("未找到竞价记录")
                 
@@ -1265,12 +1639,8 @@ class JDAuctionSpider(BaseSpider):
                 df = pd.read_html(str(purchaser))[0]
                 
                 # 保存到Excel文件
-                folder_path = self.data_storage.create_folder(f"京东法拍/{asset_name}")
-                file_path = os.path.join(folder_path, "优先购买权人.xlsx")
-                df.to_excel(file_path, index=False)
-                
-                self.logger.info(f"优先购买权人信息已保存到: {file_path}")
-                self.logger.info(f"共找到 {len(df)} 条优先购买权人记录")
+                self._save_asset_table(asset_name, "优先购买权人.xlsx", df,
+                                       f"优先购买权人信息（共 {len(df)} 条记录）")
             else:
                 self.logger.info("未找到优先购买权人表格")
 
@@ -1278,6 +1648,41 @@ class JDAuctionSpider(BaseSpider):
             self.logger.info("未找到优先购买权人信息")
             self.logger.debug(f"提取优先购买权人失败: {e}")
 
+    def _save_asset_table(self, asset_name: str, filename: str, df: pd.DataFrame, description: str) -> None:
+        """
+        把资产的表格交给后台线程写入资产文件夹（汇总模式下追加到本次运行的汇总表）
+        
+        Args:
+            asset_name: 资产名称
+            filename: 文件名
+            df: 表格数据
+            description: 日志中的表格说明
+        """
+        table_name = os.path.splitext(filename)[0]
+        # 落盘目标支持附表时（如SQLite）按拍卖ID写入，与数据项在同一个写入线程中执行
+        if self.current_auction_id:
+            self.writer.submit("sink", self.sink.write_asset_table, self.current_auction_id, table_name, df)
+        if self.asset_tables:
+            self.writer.submit("asset_tables", self.asset_tables.add, self.current_auction_id, asset_name, table_name, df)
+            self.logger.info(f"{description}已提交追加到汇总表: {table_name}")
+            return
+        folder_path = self.data_storage.create_folder(f"京东法拍/{asset_name}")
+        file_path = os.path.join(folder_path, filename)
+        self.writer.write_excel(df, file_path)
+        self.logger.info(f"{description}已提交保存到: {file_path}")
+    
+    def _close_asset_tables(self) -> None:
+        """
+        合并汇总表，按配置导出每个资产一个文件夹的布局（在写入线程中调用）
+        """
+        paths = self.asset_tables.close()
+        if not paths:
+            return
+        self.logger.info(f"资产附表汇总已保存到: {self.asset_tables.directory}")
+        if self.config["asset_table_folders"]:
+            written = export_asset_folders(self.asset_tables.directory, self.data_storage)
+            self.logger.info(f"已按资产文件夹导出 {written} 个附表文件")
+
     def transfer_to_start_page(self, current_page: int, target_page: int) -> int:
         """
         跳转到指定页面
@@ -1289,6 +1694,10 @@ class JDAuctionSpider(BaseSpider):
         Returns:
             int: 实际到达的页码
         """
+        # 相隔多页时先尝试直接跳页，失败时再逐页点击
+        if target_page - current_page > 1 and self.jump_to_page(target_page):
+            return target_page
+        
         consecutive_failures = 0
         while consecutive_failures < 3 and current_page < target_page:
             try:
@@ -1301,29 +1710,25 @@ class JDAuctionSpider(BaseSpider):
                 # 查找下一页按钮
                 next_button = self.driver.find_element(By.CLASS_NAME, "ui-pager-next")
                 
-                # 翻页执行
+                # 翻页执行（按节奏控制器的间隔点击，并等待列表内容更新）
                 argument = 0
-                if current_page < target_page - 3:
-                    # 模拟人类行为：先滚动到按钮位置
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", fast_button)
-                    sleep(random.uniform(1, 2))
+                signature = self.get_page_content_signature()
+                with self.rate_controller.request(self.list_host):
+                    if current_page < target_page - 3:
+                        # 模拟人类行为：先滚动到按钮位置，再鼠标悬停
+                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", fast_button)
+                        ActionChains(self.driver).move_to_element(next_button).perform()
+                        fast_button.click()
+                        argument = 6 if current_page == 1 else 3
                     
-                    # 模拟鼠标悬停
-                    ActionChains(self.driver).move_to_element(next_button).perform()
-                    sleep(random.uniform(0.5, 1))
-                    fast_button.click()
-                    argument = 6 if current_page == 1 else 3
-                
-                else:
-                    # 模拟人类行为：先滚动到按钮位置
-                    self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
-                    sleep(random.uniform(1, 2))
+                    else:
+                        # 模拟人类行为：先滚动到按钮位置，再鼠标悬停
+                        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
+                        ActionChains(self.driver).move_to_element(next_button).perform()
+                        next_button.click()
+                        argument = 1
                     
-                    # 模拟鼠标悬停
-                    ActionChains(self.driver).move_to_element(next_button).perform()
-                    sleep(random.uniform(0.5, 1))
-                    next_button.click()
-                    argument = 1
+                    self.wait_for_page_change(signature)
 
                 transferred_page = int(self.driver.find_element(By.CLASS_NAME, "ui-pager-current").text)
 
@@ -1341,6 +1746,237 @@ class JDAuctionSpider(BaseSpider):
         
         return current_page
     
+    def jump_to_page(self, target_page: int) -> bool:
+        """
+        直接跳转到指定页：优先使用分页器的页码输入框，其次使用列表URL的页码参数
+        
+        Args:
+            target_page: 目标页码
+            
+        Returns:
+            bool: 是否已到达目标页（页面内容已变化且当前页码为目标页码）
+        """
+        self.logger.info(f"尝试直接跳转到第 {target_page} 页")
+        try:
+            if self._jump_by_pager_input(target_page):
+                self.logger.info(f"通过页码输入框跳转到第 {target_page} 页")
+                return True
+        except Exception as e:
+            self.logger.debug(f"通过页码输入框跳页失败: {e}")
+        
+        if self.config["page_url_param"]:
+            try:
+                if self._jump_by_url(target_page):
+                    self.logger.info(f"通过URL页码参数跳转到第 {target_page} 页")
+                    return True
+            except Exception as e:
+                self.logger.debug(f"通过URL页码参数跳页失败: {e}")
+        
+        self.logger.warning(f"直接跳页失败，改为逐页点击到第 {target_page} 页")
+        return False
+    
+    def _read_current_page(self) -> Optional[int]:
+        """
+        读取分页器的当前页码
+        """
+        element = self.lookup.find_optional(None, By.CLASS_NAME, "ui-pager-current")
+        if element is None:
+            return None
+        try:
+            return int(element.text)
+        except ValueError:
+            return None
+    
+    def _jump_by_pager_input(self, target_page: int) -> bool:
+        """
+        在分页器的页码输入框中输入目标页码并提交
+        """
+        page_input = self.lookup.find_optional(None, By.XPATH, self.config["pager_input_xpath"])
+        if page_input is None:
+            return False
+        
+        signature = self.get_page_content_signature()
+        with self.rate_controller.request(self.list_host):
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", page_input)
+            page_input.clear()
+            page_input.send_keys(str(target_page))
+            submit_button = self.lookup.find_optional(None, By.XPATH, self.config["pager_submit_xpath"])
+            if submit_button is not None:
+                submit_button.click()
+            else:
+                page_input.send_keys(Keys.ENTER)
+            changed = self.wait_for_page_change(signature)
+        return changed and self._read_current_page() == target_page
+    
+    def _jump_by_url(self, target_page: int) -> bool:
+        """
+        修改当前列表URL的页码参数后重新打开
+        """
+        parts = urlparse(self.driver.current_url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query[self.config["page_url_param"]] = str(target_page)
+        url = urlunparse(parts._replace(query=urlencode(query)))
+        
+        signature = self.get_page_content_signature()
+        with self.rate_controller.request(self.list_host):
+            self.driver.get(url)
+            self.lookup.wait_required(By.XPATH, self.config["list_xpath"])
+        current_signature = self.get_page_content_signature()
+        return bool(current_signature) and current_signature != signature and self._read_current_page() == target_page
+    
+    def locate_pages(self, page_no: int) -> int:
+        """
+        按页二分探测结束时间：定位截止时间所在页作为最后一页，定位存档最后一条记录所在页作为起始页
+        
+        Args:
+            page_no: 当前页码
+            
+        Returns:
+            int: 开始正式爬取的页码
+        """
+        high = min(self.max_pages, self._read_total_pages() or self.max_pages)
+        if high <= page_no:
+            return page_no
+        start_page = page_no
+        
+        # 截止时间所在页：第一页页尾结束时间早于截止时间的页
+        if self.cutoff_time:
+            cutoff = self._parse_time_string(self.cutoff_time)
+            cutoff_page = self._search_pages(page_no, high, lambda end_time: end_time < cutoff)
+            if cutoff_page:
+                high = cutoff_page
+                self.max_pages = min(self.max_pages, cutoff_page)
+                self.logger.info(f"截止时间位于第 {cutoff_page} 页，最多爬取到该页")
+        
+        # 存档恢复位置所在页：第一页页尾结束时间不晚于存档最后一条记录的页
+        if self.resume_from_archive and not self.should_start_crawling and self.last_crawled_end_time:
+            try:
+                last_end = self._parse_time_string(self.last_crawled_end_time)
+            except ValueError as e:
+                self.logger.warning(f"存档结束时间无法解析，逐条查找恢复位置: {e}")
+            else:
+                resume_page = self._search_pages(page_no, high, lambda end_time: end_time <= last_end)
+                if resume_page:
+                    self.logger.info(f"存档最后一条记录位于第 {resume_page} 页附近，从该页开始查找")
+                    start_page = resume_page
+        
+        # 回到起始页
+        current_page = self._read_current_page()
+        if current_page == start_page or self.jump_to_page(start_page):
+            return start_page
+        if current_page is not None and current_page < start_page:
+            return self.transfer_to_start_page(current_page, start_page)
+        # 探测时已翻到后面的页，无法逐页点击回退：重新打开列表，从原起始页逐页翻到恢复位置
+        self.logger.warning(f"二分定位后无法回到第 {start_page} 页，重新打开列表并从第 {page_no} 页开始逐页查找")
+        self.reload_list()
+        return self.transfer_to_start_page(self._read_current_page() or 1, page_no)
+    
+    def reload_list(self) -> None:
+        """
+        重新打开拍卖列表并选择地区，手动设置的其他筛选条件会丢失，需要用户重新设置后才继续爬取
+        """
+        with self.rate_controller.request(self.list_host):
+            self.driver.get(self.config['base_url'])
+        self.select_location()
+        self.logger.warning("已重新打开列表，此前手动设置的其他筛选条件已丢失")
+        input("请重新进行此前的筛选（停留在第一页），按回车键继续...")
+        try:
+            self.lookup.wait_required(By.XPATH, self.config["list_xpath"])
+        except TimeoutException:
+            self.logger.warning("重新打开列表后等待列表加载超时")
+    
+    def _search_pages(self, low: int, high: int, reached) -> Optional[int]:
+        """
+        在 [low, high] 中二分查找页尾结束时间满足条件的最小页码
+        
+        Args:
+            low: 起始页码
+            high: 结束页码
+            reached: 条件函数 reached(页尾结束时间)，随页码增大从False变为True
+            
+        Returns:
+            Optional[int]: 满足条件的最小页码，探测失败或都不满足时返回None
+        """
+        result = None
+        while low <= high:
+            middle = (low + high) // 2
+            end_time = self.probe_page_end_time(middle)
+            if end_time is None:
+                self.logger.warning(f"无法探测第 {middle} 页的结束时间，停止二分定位")
+                return None
+            self.logger.info(f"第 {middle} 页页尾结束时间: {end_time}")
+            if reached(end_time):
+                result = middle
+                high = middle - 1
+            else:
+                low = middle + 1
+        return result
+    
+    def probe_page_end_time(self, page: int) -> Optional[datetime]:
+        """
+        探测指定页页尾拍卖项的结束时间
+        
+        Args:
+            page: 页码
+            
+        Returns:
+            Optional[datetime]: 页尾已结束拍卖项的结束时间，无法获取时返回None
+        """
+        if self._read_current_page() != page and not self.jump_to_page(page):
+            return None
+        
+        list_elements = self.driver.find_elements(By.XPATH, self.config["list_xpath"])
+        probed = 0
+        for element in reversed(list_elements):
+            if probed >= self.config["locate_probe_items"]:
+                break
+            fields = self.lookup.probe(element, {key: LIST_ITEM_FIELDS[key] for key in ("status", "link")})
+            if fields["status"] not in ['已结束', '已暂缓', '已中止'] or not fields["link"]:
+                continue
+            probed += 1
+            end_time = self.probe_item_end_time(fields["link"])
+            if end_time:
+                try:
+                    return self._parse_time_string(end_time)
+                except ValueError:
+                    continue
+        return None
+    
+    def probe_item_end_time(self, url: str) -> Optional[str]:
+        """
+        在新标签中打开详情页，只提取结束时间
+        
+        Args:
+            url: 拍卖详情页URL
+            
+        Returns:
+            Optional[str]: 结束时间
+        """
+        main_window = self.driver.current_window_handle
+        handle = None
+        try:
+            with self.rate_controller.request(self.rate_controller.host_of(url)):
+                handle = self._open_detail_tab(url, main_window)
+                self.driver.switch_to.window(handle)
+                return self.extract_detail_info().get('结束时间') or None
+        except Exception as e:
+            self.logger.debug(f"探测结束时间失败: {e}")
+            return None
+        finally:
+            if handle:
+                self._close_tab(handle, main_window)
+    
+    def _read_total_pages(self) -> Optional[int]:
+        """
+        读取分页器中显示的最大页码
+        """
+        numbers = [
+            int(text) for text in (
+                element.text.strip() for element in self.lookup.find_all(None, By.XPATH, '//div[contains(@class, "ui-pager")]/a')
+            ) if text.isdigit()
+        ]
+        return max(numbers) if numbers else None
+    
     def get_page_content_signature(self) -> str:
         """
         获取页面内容签名，用于检测页面是否发生变化
@@ -1384,8 +2020,8 @@ class JDAuctionSpider(BaseSpider):
         
         while time.time() - start_time < max_wait:
             try:
-                # 等待一段时间再检查
-                sleep(random.uniform(1, 2))
+                # 短暂轮询间隔
+                sleep(0.3)
                 
                 # 获取当前页面签名
                 current_signature = self.get_page_content_signature()
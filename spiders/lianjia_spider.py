@@ -3,38 +3,111 @@
 链家二手房爬虫
 """
 import pandas as pd
-import time
-import random
+import logging
+import threading
+from functools import partial
+from urllib.parse import urljoin
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from tqdm import tqdm
 from spiders.base_spider import BaseSpider
+from utils.browser import BrowserManager
+from utils.element_lookup import ElementLookup
+from utils.html_parser import class_xpath, parse_lianjia_list
+from utils.record_sink import export_excel
+from utils.watermark_store import WatermarkStore
+from utils.worker_pool import BrowserWorker, BrowserWorkerPool
 from config import Config
 
+# 房源信息容器及其中各字段的相对XPath，与离线解析使用相同的查找规则
+ESTATE_INFO_XPATH = "(.//*[contains(@class, 'info')])[1]"
+ESTATE_ADDRESS_XPATH = f"({ESTATE_INFO_XPATH}//*[{class_xpath('address')}])[1]"
+ESTATE_FLOOD_XPATH = f"({ESTATE_INFO_XPATH}//*[{class_xpath('flood')}])[1]"
+ESTATE_FIELDS = {
+    "info": (ESTATE_INFO_XPATH, "nodeName"),
+    "address": (ESTATE_ADDRESS_XPATH, "nodeName"),
+    "flood": (ESTATE_FLOOD_XPATH, "nodeName"),
+    "title": (f"{ESTATE_INFO_XPATH}//*[{class_xpath('title')}]", None),
+    "link": (f"{ESTATE_INFO_XPATH}//*[{class_xpath('title')}]/descendant-or-self::a", "href"),
+    "houseInfo": (f"{ESTATE_ADDRESS_XPATH}//*[{class_xpath('houseInfo')}]", None),
+    "positionInfo": (f"{ESTATE_FLOOD_XPATH}//*[{class_xpath('positionInfo')}]", None),
+    "dealDate": (f"{ESTATE_ADDRESS_XPATH}//*[{class_xpath('dealDate')}]", None),
+    "unitPrice": (f"{ESTATE_FLOOD_XPATH}//*[{class_xpath('unitPrice')}]", None),
+    "totalPrice": (f"{ESTATE_ADDRESS_XPATH}//*[{class_xpath('totalPrice')}]", None),
+}
+
 class LianjiaSpider(BaseSpider):
     """链家二手房爬虫"""
     
-    def __init__(self, districts: List[str] = None, max_pages: int = None):
+    RECORD_SCHEMA = "lianjia"
+    
+    def __init__(self, districts: List[str] = None, max_pages: int = None, workers: int = None,
+                 sub_districts: Dict[str, List[str]] = None, name_suffix: str = None):
         """
         初始化链家二手房爬虫
         
         Args:
             districts: 要爬取的区域列表，如果为None则爬取所有区域
             max_pages: 每个区域最大爬取页数
+            workers: 浏览器会话数，大于1时启用工作池模式
+            sub_districts: 只爬取指定的子区域 {区域: [子区域]}（分片模式使用），指定时忽略districts
+            name_suffix: 爬虫名称后缀，用于区分分片的日志和输出文件
         """
-        super().__init__("链家二手房")
-        self.districts = districts or list(Config.SHENZHEN_DISTRICTS.keys())
+        super().__init__(f"链家二手房_{name_suffix}" if name_suffix else "链家二手房")
+        if sub_districts is not None:
+            self.districts = list(sub_districts.keys())
+        else:
+            self.districts = districts or list(Config.SHENZHEN_DISTRICTS.keys())
+            sub_districts = {district: Config.SHENZHEN_DISTRICTS.get(district, []) for district in self.districts}
+        self.sub_districts = sub_districts
         self.max_pages = max_pages or Config.LIANJIA_CONFIG["max_pages"]
         self.config = Config.LIANJIA_CONFIG
         self.district_mapping = Config.DISTRICT_EN_MAPPING
+        self.host = self.rate_controller.host_of(self.config["base_url"])
+        self.seen_source = "lianjia"
+        self.workers = max(1, workers or self.config["workers"])
+        self.watermarks = WatermarkStore(self.config["watermark_file"]) if self.config["use_watermark"] else None
+        self.pool: Optional[BrowserWorkerPool] = None
+        self.pool_states: Dict[Tuple[str, int], Dict[str, Any]] = {}  # 工作池模式下各子区域的翻页状态
+        self.pending_units: Dict[Tuple[str, int], int] = {}  # 工作池模式下各子区域尚未处理完的工作单元数
+        self.pool_lock = threading.Lock()
+        # 已爬完、但数据尚未保存的子区域水位 [(区域, 子区域, 最新成交日期)]，数据落盘后才提交
+        self.unsaved_watermarks: List[Tuple[str, str, Optional[pd.Timestamp]]] = []
+    
+    def setup_driver(self) -> None:
+        """
+        设置浏览器驱动，工作池模式下启动多个浏览器会话
+        """
+        if self.workers <= 1:
+            super().setup_driver()
+            return
+        self.pool = BrowserWorkerPool(
+            worker_count=self.workers,
+            profile_root=self.config["worker_profile_dir"],
+            logger=self.logger,
+            spider_config=self.config
+        )
+        self.pool.start()
+        self.logger.info(f"浏览器工作池创建成功，共 {self.workers} 个会话")
+    
+    def cleanup(self) -> None:
+        """
+        清理资源
+        """
+        if self.pool:
+            self.pool.close()
+            self.logger.info("浏览器工作池已关闭")
+        super().cleanup()
     
     def run(self) -> None:
         """
         运行爬虫逻辑
         """
+        if self.pool:
+            self.run_worker_pool()
+            return
+        
         try:
             # 访问链家首页
             self.driver.get(self.config["base_url"])
@@ -61,32 +134,202 @@ class LianjiaSpider(BaseSpider):
         self.logger.info(f"开始爬取 {district} 的数据")
         
         district_data = []
-        sub_districts = Config.SHENZHEN_DISTRICTS.get(district, [])
+        sub_districts = self.sub_districts.get(district, [])
         
         for sub_district in sub_districts:
             try:
-                sub_data = self.crawl_sub_district(sub_district)
+                sub_data = self.crawl_sub_district(sub_district, district)
                 if sub_data:
                     district_data.extend(sub_data)
             except Exception as e:
                 self.logger.error(f"爬取 {sub_district} 时出错: {e}")
                 continue
         
-        # 保存区域数据
+        self.save_district_data(district, district_data)
+    
+    def save_district_data(self, district: str, district_data: List[Dict[str, Any]]) -> None:
+        """
+        保存区域数据并添加到总数据
+        
+        Args:
+            district: 区域名称
+            district_data: 区域数据
+        """
+        # 子区域可能属于多个区域（如黄木岗、银湖），记录数据所属的区域，输出按区域分工作表
+        for item in district_data:
+            item["区域"] = district
+        
+        # 保存区域数据（与总数据文件格式相同）
         if district_data:
-            filename = f"链家二手房_{district}.xlsx"
-            self.data_storage.save_to_excel(district_data, filename)
-            self.logger.info(f"{district} 数据保存完成，共 {len(district_data)} 条记录")
+            filename = f"{self.spider_name}_{district}.xlsx"
+            self.writer.submit(filename, export_excel, lambda: district_data, filename, self.RECORD_SCHEMA)
+            self.logger.info(f"{district} 数据已提交保存，共 {len(district_data)} 条记录")
         
         # 添加到总数据
-        self.data.extend(district_data)
+        for item in district_data:
+            self.add_data(item, item["房源链接"])
+        
+        # 水位在本区域数据全部落盘后由写入线程提交，中途中断时下次仍会重新爬取这些子区域
+        for district_name, sub_district, newest in self.unsaved_watermarks:
+            self.after_persisted(partial(self.save_watermark, district_name, sub_district, newest))
+        self.unsaved_watermarks = []
     
-    def crawl_sub_district(self, sub_district: str) -> List[Dict[str, Any]]:
+    def run_worker_pool(self) -> None:
+        """
+        工作池模式：多个浏览器会话从共享队列领取 子区域/页码范围 工作单元，
+        一个区域的所有子区域处理完后，按子区域、页码顺序合并并立即保存（区域之间保持原有顺序），
+        内存中只保留尚未保存的区域，中途出错时已保存的区域不受影响
         """
-        爬取子区域数据
+        # 所有会话先打开首页，统一等待登录
+        for worker in self.pool.workers:
+            with self.rate_controller.request(self.host):
+                worker.driver.get(self.config["base_url"])
+        self.logger.info("所有工作浏览器已访问链家首页")
+        input(f"请在 {len(self.pool.workers)} 个浏览器窗口中分别完成登录，然后按回车键继续...")
+        
+        # {(区域, 子区域序号): {页码: 页面数据}}，区域保存后移除
+        results: Dict[Tuple[str, int], Dict[int, List[Dict[str, Any]]]] = {}
+        saved_count = 0  # 已按顺序保存的区域数
+        
+        def save_finished_districts() -> None:
+            # 按区域顺序保存所有子区域都已处理完的区域（调用时持有 pool_lock）
+            nonlocal saved_count
+            while saved_count < len(self.districts):
+                district = self.districts[saved_count]
+                sub_districts = self.sub_districts.get(district, [])
+                if any(self.pending_units.get((district, sub_index)) for sub_index in range(len(sub_districts))):
+                    return
+                district_data = []
+                for sub_index, sub_district in enumerate(sub_districts):
+                    self.pending_units.pop((district, sub_index), None)
+                    pages = results.pop((district, sub_index), {})
+                    for page in sorted(pages):
+                        district_data.extend(pages[page])
+                    # 各子区域的水位随区域数据一起提交
+                    state = self.pool_states.pop((district, sub_index), None)
+                    if state:
+                        self.unsaved_watermarks.append((district, sub_district, state["newest"]))
+                self.save_district_data(district, district_data)
+                saved_count += 1
+        
+        def handle_unit(worker: BrowserWorker, unit: Tuple[str, int, str, Optional[int], Optional[int]]) -> None:
+            district, sub_index, sub_district, first_page, last_page = unit
+            pages = {}
+            try:
+                pages = self.crawl_page_range(worker, district, sub_index, sub_district, first_page, last_page)
+            finally:
+                # 后续页码范围在本单元处理过程中已提交，计数为0即表示该子区域已处理完
+                with self.pool_lock:
+                    results.setdefault((district, sub_index), {}).update(pages)
+                    self.pending_units[(district, sub_index)] -= 1
+                    save_finished_districts()
+        
+        # 每个子区域先提交一个首页单元，首页单元确定最大页数后依次提交后续页码范围
+        for district in self.districts:
+            for sub_index, sub_district in enumerate(self.sub_districts.get(district, [])):
+                self.submit_unit((district, sub_index, sub_district, None, None))
+        
+        self.pool.run(handle_unit)
+        with self.pool_lock:
+            save_finished_districts()
+    
+    def submit_unit(self, unit: Tuple[str, int, str, Optional[int], Optional[int]]) -> None:
+        """
+        工作池模式下提交工作单元，并记录所属子区域尚未处理完的工作单元数
         
         Args:
+            unit: (区域, 子区域序号, 子区域, 起始页码, 结束页码)
+        """
+        key = (unit[0], unit[1])
+        with self.pool_lock:
+            self.pending_units[key] = self.pending_units.get(key, 0) + 1
+        self.pool.submit(unit)
+    
+    def crawl_page_range(self, worker: BrowserWorker, district: str, sub_index: int, sub_district: str,
+                         first_page: Optional[int], last_page: Optional[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        工作池模式下爬取子区域的一段页码
+        
+        Args:
+            worker: 工作浏览器
+            district: 所属区域名称
+            sub_index: 子区域在所属区域中的序号
             sub_district: 子区域名称
+            first_page: 起始页码，为None时表示首页单元（负责获取最大页数）
+            last_page: 结束页码（包含）
+            
+        同一子区域的页码范围依次执行，前一段未翻到旧数据时才提交下一段，翻页状态保存在 pool_states 中
+            
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: {页码: 页面数据}
+        """
+        district_en = self.district_mapping.get(sub_district)
+        if not district_en:
+            self.logger.warning(f"未找到 {sub_district} 的英文映射")
+            return {}
+        
+        url = f"{self.config['base_url']}/{district_en}"
+        key = (district, sub_index)
+        pages = {}
+        
+        if first_page is None:
+            with self.rate_controller.request(self.host):
+                worker.driver.get(url)
+                self.logger.info(f"工作浏览器 {worker.worker_id} 访问 {sub_district} 页面: {url}")
+                
+                max_page = self.get_max_pages(worker.lookup)
+                if not max_page:
+                    return {}
+                state = self.new_crawl_state(district, sub_district, min(max_page, self.max_pages))
+                self.pool_states[key] = state
+                
+                rows = self.get_page_rows(worker.lookup)
+            pages[1] = self.build_page_records(rows, sub_district)
+            if not self.track_page_dates(state, rows, sub_district, 1):
+                self.submit_page_range(district, sub_index, sub_district, 2, state["max_page"])
+            return pages
+        
+        state = self.pool_states[key]
+        for page in range(first_page, last_page + 1):
+            try:
+                # 按主机节奏访问，所有工作浏览器合计不超过目标速率
+                with self.rate_controller.request(self.host):
+                    worker.driver.get(f"{url}/pg{page}/")
+                    rows = self.get_page_rows(worker.lookup)
+                pages[page] = self.build_page_records(rows, sub_district)
+                if self.track_page_dates(state, rows, sub_district, page):
+                    return pages
+                
+            except Exception as e:
+                self.logger.error(f"爬取 {sub_district} 第 {page} 页时出错: {e}")
+                continue
+        
+        self.logger.info(f"工作浏览器 {worker.worker_id} 完成 {sub_district} 第 {first_page}-{last_page} 页")
+        self.submit_page_range(district, sub_index, sub_district, last_page + 1, state["max_page"])
+        return pages
+    
+    def submit_page_range(self, district: str, sub_index: int, sub_district: str, start: int, max_page: int) -> None:
+        """
+        工作池模式下提交子区域的下一段页码
+        
+        Args:
+            district: 所属区域名称
+            sub_index: 子区域在所属区域中的序号
+            sub_district: 子区域名称
+            start: 起始页码
+            max_page: 最大页码
+        """
+        if start <= max_page:
+            end = min(start + self.config["pages_per_unit"] - 1, max_page)
+            self.submit_unit((district, sub_index, sub_district, start, end))
+    
+    def crawl_sub_district(self, sub_district: str, district: str = None) -> List[Dict[str, Any]]:
+        """
+        爬取子区域数据，翻到早于最早日期或水位日期的旧数据时停止
+        
+        Args:
+            sub_district: 子区域名称
+            district: 所属区域名称，用于区分同名子区域的水位
             
         Returns:
             List[Dict[str, Any]]: 子区域数据
@@ -101,7 +344,8 @@ class LianjiaSpider(BaseSpider):
         url = f"{self.config['base_url']}/{district_en}"
         
         try:
-            self.driver.get(url)
+            with self.rate_controller.request(self.host):
+                self.driver.get(url)
             self.logger.info(f"访问 {sub_district} 页面: {url}")
             
             # 获取最大页数
@@ -113,42 +357,52 @@ class LianjiaSpider(BaseSpider):
             max_page = min(max_page, self.max_pages)
             
             sub_district_data = []
+            state = self.new_crawl_state(district, sub_district, max_page)
             
             # 爬取每一页
             for page in tqdm(range(1, max_page + 1), desc=f"爬取{sub_district}"):
                 try:
-                    if page > 1:
-                        page_url = f"{url}/pg{page}/"
-                        self.driver.get(page_url)
-                    
-                    # 获取页面数据
-                    page_data = self.get_page_data(sub_district)
+                    # 按主机节奏访问（第1页已在获取最大页数前打开），提取耗时计入请求间隔
+                    with self.rate_controller.request(self.host, pace=page > 1):
+                        if page > 1:
+                            page_url = f"{url}/pg{page}/"
+                            self.driver.get(page_url)
+                        
+                        # 获取页面数据
+                        rows = self.get_page_rows()
+                    page_data = self.build_page_records(rows, sub_district)
                     if page_data:
                         sub_district_data.extend(page_data)
                     
-                    # 随机延时
-                    time.sleep(random.uniform(*self.config["sleep_range"]))
+                    # 检查是否已翻到旧数据
+                    if self.track_page_dates(state, rows, sub_district, page):
+                        break
                     
                 except Exception as e:
                     self.logger.error(f"爬取 {sub_district} 第 {page} 页时出错: {e}")
                     continue
             
+            self.unsaved_watermarks.append((district, sub_district, state["newest"]))
             return sub_district_data
             
         except Exception as e:
             self.logger.error(f"爬取 {sub_district} 时出错: {e}")
             return []
     
-    def get_max_pages(self) -> Optional[int]:
+    def get_max_pages(self, lookup: ElementLookup = None) -> Optional[int]:
         """
         获取最大页数
         
+        Args:
+            lookup: 元素查找器，默认使用主浏览器的查找器
+            
         Returns:
             Optional[int]: 最大页数
         """
+        lookup = lookup or self.lookup
         try:
-            page_box = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, ".//*[contains(@class, 'page-box') and contains(@class, 'house-lst-page-box')]"))
+            page_box = lookup.wait_required(
+                By.XPATH, ".//*[contains(@class, 'page-box') and contains(@class, 'house-lst-page-box')]"
             )
             max_page = int(page_box.find_element(By.XPATH, './/a[4]').text)
             self.logger.info(f"最大页数为: {max_page}")
@@ -165,116 +419,312 @@ class LianjiaSpider(BaseSpider):
             self.logger.error(f"获取最大页数失败: {e}")
             return None
     
-    def get_page_data(self, district: str) -> List[Dict[str, Any]]:
+    def get_page_data(self, district: str, lookup: ElementLookup = None) -> List[Dict[str, Any]]:
         """
         获取页面数据
         
         Args:
             district: 区域名称
+            lookup: 元素查找器，默认使用主浏览器的查找器
             
         Returns:
             List[Dict[str, Any]]: 页面数据
         """
-        page_data = []
+        return self.build_page_records(self.get_page_rows(lookup), district)
+    
+    def get_page_rows(self, lookup: ElementLookup = None) -> List[Dict[str, Optional[str]]]:
+        """
+        获取页面所有房源的原始字段（未按日期过滤）
+        
+        Args:
+            lookup: 元素查找器，默认使用主浏览器的查找器
+            
+        Returns:
+            List[Dict[str, Optional[str]]]: 原始字段列表，缺失的字段为None
+        """
+        lookup = lookup or self.lookup
+        rows = []
         
         try:
             # 等待列表加载
-            sell_list = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "listContent"))
-            )
+            sell_list = lookup.wait_required(By.CLASS_NAME, "listContent")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                stats = BrowserManager.get_page_load_stats(lookup.driver)
+                self.logger.debug(
+                    f"页面加载耗时 {stats.get('load_ms')} 毫秒，传输 {stats.get('transfer_bytes')} 字节，"
+                    f"资源 {stats.get('resource_count')} 个"
+                )
+            
+            if self.config["extract_mode"] == "snapshot":
+                # 一次性获取列表HTML，离线解析所有房源
+                list_html = sell_list.get_attribute("outerHTML")
+                return [fields for fields in parse_lianjia_list(list_html) if fields is not None]
             
             # 获取所有房源项
-            li_elements = sell_list.find_elements(By.TAG_NAME, "li")
+            li_elements = lookup.find_all(sell_list, By.TAG_NAME, "li")
             
             for estate in li_elements:
                 try:
-                    estate_data = self.extract_estate_data(estate, district)
-                    if estate_data:
-                        page_data.append(estate_data)
+                    fields = self.probe_estate_fields(estate, lookup)
+                    if fields:
+                        rows.append(fields)
                 except Exception as e:
                     self.logger.error(f"提取房源数据时出错: {e}")
                     continue
             
         except NoSuchElementException:
-            self.logger.warning(f"当前页面 {self.driver.current_url} 下找不到房源列表")
+            self.logger.warning(f"当前页面 {lookup.driver.current_url} 下找不到房源列表")
+            self.rate_controller.record_error(self.host)
         except Exception as e:
             self.logger.error(f"获取页面数据时出错: {e}")
+            self.rate_controller.record_error(self.host)
         
+        return rows
+    
+    def build_page_records(self, rows: List[Dict[str, Optional[str]]], district: str) -> List[Dict[str, Any]]:
+        """
+        根据原始字段构建页面数据（按最早日期过滤，跳过已爬取的房源）
+        
+        Args:
+            rows: 原始字段列表
+            district: 区域名称
+            
+        Returns:
+            List[Dict[str, Any]]: 页面数据
+        """
+        page_data = []
+        for fields in rows:
+            # 之前的运行中已保存过的成交记录不再输出
+            if self.is_seen(self.listing_url(fields)):
+                continue
+            try:
+                estate_data = self.build_estate_record(fields, district)
+                if estate_data:
+                    page_data.append(estate_data)
+            except Exception as e:
+                self.logger.error(f"提取房源数据时出错: {e}")
+                continue
         return page_data
     
-    def extract_estate_data(self, estate_element, district: str) -> Optional[Dict[str, Any]]:
+    def parse_page_html(self, list_html: str, district: str) -> List[Dict[str, Any]]:
+        """
+        离线解析列表页HTML
+        
+        Args:
+            list_html: listContent 的 outerHTML 或页面源码
+            district: 区域名称
+            
+        Returns:
+            List[Dict[str, Any]]: 页面数据
+        """
+        rows = [fields for fields in parse_lianjia_list(list_html) if fields is not None]
+        return self.build_page_records(rows, district)
+    
+    def probe_estate_fields(self, estate_element, lookup: ElementLookup = None) -> Optional[Dict[str, Optional[str]]]:
+        """
+        一次脚本调用探测房源的所有原始字段，缺失的字段不会触发等待
+        
+        Args:
+            estate_element: 房源元素
+            lookup: 元素查找器，默认使用主浏览器的查找器
+            
+        Returns:
+            Optional[Dict[str, Optional[str]]]: 原始字段，缺少房源信息容器时返回None
+        """
+        fields = (lookup or self.lookup).probe(estate_element, ESTATE_FIELDS)
+        if fields["info"] is None or fields["address"] is None or fields["flood"] is None:
+            self.logger.error("提取房源数据时出错: 缺少房源信息容器")
+            return None
+        return fields
+    
+    def extract_estate_data(self, estate_element, district: str, lookup: ElementLookup = None) -> Optional[Dict[str, Any]]:
         """
         提取房源数据
         
         Args:
             estate_element: 房源元素
             district: 区域名称
+            lookup: 元素查找器，默认使用主浏览器的查找器
             
         Returns:
             Optional[Dict[str, Any]]: 房源数据
         """
         try:
-            # 获取房源信息容器
-            estate_info = estate_element.find_element(By.XPATH, ".//*[contains(@class, 'info')]")
-            
-            # 获取房源名称
-            try:
-                name = estate_info.find_element(By.CLASS_NAME, "title").text
-            except NoSuchElementException:
-                self.logger.warning("获取房源名称失败")
-                name = ''
-            
-            # 获取建筑特征
-            try:
-                estate_attribute = estate_info.find_element(By.CLASS_NAME, "address")
-                estate_towards = estate_attribute.find_element(By.CLASS_NAME, "houseInfo").text
-                estate_attribute_floor = estate_info.find_element(By.CLASS_NAME, "flood")
-                estate_floor = estate_attribute_floor.find_element(By.CLASS_NAME, "positionInfo").text
-            except NoSuchElementException:
-                self.logger.warning("获取建筑特征失败")
-                estate_towards = ''
-                estate_floor = ''
-            
-            # 获取成交时间
-            try:
-                deal_date = estate_attribute.find_element(By.CLASS_NAME, "dealDate").text
-                deal_date = pd.to_datetime(deal_date, format='%Y.%m.%d')
-                
-                # 检查日期是否在范围内
-                min_date = pd.to_datetime(self.config["min_date"])
-                if deal_date <= min_date:
-                    return None
-                    
-            except NoSuchElementException:
-                self.logger.warning("获取成交时间失败")
+            fields = self.probe_estate_fields(estate_element, lookup)
+            if fields is None:
                 return None
+            return self.build_estate_record(fields, district)
             
-            # 获取价格信息
-            try:
-                unit_price = estate_attribute_floor.find_element(By.CLASS_NAME, "unitPrice").text
-                total_price = estate_attribute.find_element(By.CLASS_NAME, "totalPrice").text
-            except NoSuchElementException:
-                self.logger.warning("获取价格信息失败")
-                unit_price = ''
-                total_price = ''
+        except Exception as e:
+            self.logger.error(f"提取房源数据时出错: {e}")
+            return None
+    
+    def listing_url(self, fields: Dict[str, Optional[str]]) -> Optional[str]:
+        """
+        获取房源的成交链接（已爬取房源索引的键）
+        
+        Returns:
+            Optional[str]: 成交链接，缺失时返回None
+        """
+        if not fields.get("link"):
+            return None
+        return urljoin(self.config["base_url"], fields["link"])
+    
+    def parse_deal_date(self, fields: Dict[str, Optional[str]]) -> Optional[pd.Timestamp]:
+        """
+        解析房源的成交日期
+        
+        Returns:
+            Optional[pd.Timestamp]: 成交日期，缺失或格式错误时返回None
+        """
+        if not fields.get("dealDate"):
+            return None
+        deal_date = pd.to_datetime(fields["dealDate"], format='%Y.%m.%d', errors='coerce')
+        return None if pd.isna(deal_date) else deal_date
+    
+    def get_watermark(self, district: Optional[str], sub_district: str) -> Optional[pd.Timestamp]:
+        """
+        获取子区域上次爬取到的最新成交日期
+        
+        Args:
+            district: 所属区域名称
+            sub_district: 子区域名称
             
-            # 构建数据项
-            data_item = {
-                '房源名称': name,
-                '所在区域': district,
-                '建筑特征': {
-                    '装修及朝向': estate_towards,
-                    '楼层及建筑类型': estate_floor
-                },
-                '成交时间': deal_date,
-                '价格信息': {
-                    '单价': unit_price,
-                    '总价': total_price
-                }
-            }
+        Returns:
+            Optional[pd.Timestamp]: 水位日期，未启用或没有记录时返回None
+        """
+        if not self.watermarks:
+            return None
+        mark = self.watermarks.get(f"{district}/{sub_district}")
+        return pd.to_datetime(mark) if mark else None
+    
+    def save_watermark(self, district: Optional[str], sub_district: str, newest: Optional[pd.Timestamp]) -> None:
+        """
+        记录子区域本次爬取到的最新成交日期（在写入线程中、该子区域的数据落盘后调用）
+        """
+        if self.watermarks and newest is not None:
+            self.watermarks.update(f"{district}/{sub_district}", newest.strftime("%Y-%m-%d"))
+    
+    def new_crawl_state(self, district: Optional[str], sub_district: str, max_page: int) -> Dict[str, Any]:
+        """
+        创建子区域的翻页状态
+        
+        Returns:
+            Dict[str, Any]: {"max_page": 最大页数, "watermark": 水位日期, "newest": 最新成交日期, "stale_run": 连续旧数据条数}
+        """
+        return {
+            "max_page": max_page,
+            "watermark": self.get_watermark(district, sub_district),
+            "newest": None,
+            "stale_run": 0,
+        }
+    
+    def track_page_dates(self, state: Dict[str, Any], rows: List[Dict[str, Optional[str]]], sub_district: str, page: int) -> bool:
+        """
+        用本页的成交日期更新翻页状态
+        
+        Returns:
+            bool: 是否应停止翻页
+        """
+        newest, state["stale_run"], should_stop = self.scan_page_dates(rows, state["watermark"], state["stale_run"])
+        if newest is not None and (state["newest"] is None or newest > state["newest"]):
+            state["newest"] = newest
+        if should_stop:
+            self.logger.info(f"{sub_district} 第 {page} 页已是旧数据，停止翻页")
+        return should_stop
+    
+    def scan_page_dates(self, rows: List[Dict[str, Optional[str]]], watermark: Optional[pd.Timestamp],
+                        stale_run: int) -> Tuple[Optional[pd.Timestamp], int, bool]:
+        """
+        按成交日期检查页面是否已翻到旧数据：早于（等于）最早日期或早于水位日期的房源视为旧数据
+        
+        Args:
+            rows: 页面原始字段列表（按成交日期从新到旧）
+            watermark: 水位日期
+            stale_run: 此前连续旧数据的条数
             
-            return data_item
+        Returns:
+            Tuple[Optional[pd.Timestamp], int, bool]: (本页最新成交日期, 连续旧数据条数, 是否应停止翻页)
+        """
+        min_date = pd.to_datetime(self.config["min_date"])
+        newest = None
+        dated = 0
+        stale = 0
+        for fields in rows:
+            deal_date = self.parse_deal_date(fields)
+            if deal_date is None:
+                continue
+            dated += 1
+            if newest is None or deal_date > newest:
+                newest = deal_date
+            if deal_date <= min_date or (watermark is not None and deal_date < watermark):
+                stale += 1
+                stale_run += 1
+            else:
+                stale_run = 0
+        
+        run_limit = self.config["stale_run"]
+        should_stop = (dated > 0 and stale == dated) or bool(run_limit and stale_run >= run_limit)
+        return newest, stale_run, should_stop
+    
+    def build_estate_record(self, fields: Dict[str, Optional[str]], district: str) -> Optional[Dict[str, Any]]:
+        """
+        根据房源原始字段构建数据项，在线提取与离线解析共用
+        
+        Args:
+            fields: 原始字段，缺失的字段为None
+            district: 区域名称
             
-        except Exception as e:
-            self.logger.error(f"提取房源数据时出错: {e}")
-            return None 
\ No newline at end of file
+        Returns:
+            Optional[Dict[str, Any]]: 房源数据
+        """
+        # 获取房源名称
+        name = fields["title"]
+        if name is None:
+            self.logger.warning("获取房源名称失败")
+            name = ''
+        
+        # 获取建筑特征
+        estate_towards = fields["houseInfo"]
+        estate_floor = fields["positionInfo"]
+        if estate_towards is None or estate_floor is None:
+            self.logger.warning("获取建筑特征失败")
+            estate_towards = ''
+            estate_floor = ''
+        
+        # 获取成交时间
+        if fields["dealDate"] is None:
+            self.logger.warning("获取成交时间失败")
+            return None
+        deal_date = pd.to_datetime(fields["dealDate"], format='%Y.%m.%d')
+        
+        # 检查日期是否在范围内
+        min_date = pd.to_datetime(self.config["min_date"])
+        if deal_date <= min_date:
+            return None
+        
+        # 获取价格信息
+        unit_price = fields["unitPrice"]
+        total_price = fields["totalPrice"]
+        if unit_price is None or total_price is None:
+            self.logger.warning("获取价格信息失败")
+            unit_price = ''
+            total_price = ''
+        
+        # 构建数据项
+        data_item = {
+            '房源名称': name,
+            '房源链接': self.listing_url(fields),
+            '所在区域': district,
+            '建筑特征': {
+                '装修及朝向': estate_towards,
+                '楼层及建筑类型': estate_floor
+            },
+            '成交时间': deal_date,
+            '价格信息': {
+                '单价': unit_price,
+                '总价': total_price
+            }
+        }
+        
+        return data_item
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+资产附表汇总模块
+把每个拍卖项的附表（调查表、竞买公告、出价记录、优先购买权人）追加到本次运行的汇总表中，
+每种附表一个文件，以拍卖ID和资产名称关联，不再为每个资产写一批小的Excel文件；
+需要时可再导出为原来的每个资产一个文件夹的布局
+"""
+import os
+from typing import Any, Dict, List, Optional
+import pandas as pd
+from utils.data_storage import DataStorage
+from utils.segment_store import SegmentStore
+
+KEY_COLUMNS = ["拍卖ID", "资产名称"]  # 汇总表中用于关联数据项的列
+
+
+def read_asset_table(directory: str, table_name: str) -> pd.DataFrame:
+    """
+    读取汇总表（按扩展名选择 .parquet 或 .csv）
+
+    Args:
+        directory: 汇总表目录
+        table_name: 附表名称，如 "出价记录"
+
+    Returns:
+        pd.DataFrame: 汇总表，文件不存在时返回空表
+    """
+    for extension in (".parquet", ".csv"):
+        path = os.path.join(directory, table_name + extension)
+        if os.path.exists(path):
+            if extension == ".parquet":
+                return pd.read_parquet(path)
+            return pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    return pd.DataFrame()
+
+
+def export_asset_folders(directory: str, data_storage: Optional[DataStorage] = None) -> int:
+    """
+    把汇总表导出为每个资产一个文件夹的布局（京东法拍/资产名称/附表名称.xlsx）
+
+    Args:
+        directory: 汇总表目录
+        data_storage: 数据存储工具，用于创建资产文件夹
+
+    Returns:
+        int: 写入的文件数
+    """
+    data_storage = data_storage or DataStorage()
+    written = 0
+    for filename in sorted(os.listdir(directory)):
+        table_name, extension = os.path.splitext(filename)
+        if extension not in (".parquet", ".csv"):
+            continue
+        df = read_asset_table(directory, table_name)
+        if df.empty:
+            continue
+        for asset_name, rows in df.groupby("资产名称", sort=False):
+            folder_path = data_storage.create_folder(f"京东法拍/{asset_name}")
+            rows.drop(columns=KEY_COLUMNS).dropna(axis=1, how="all").to_excel(
+                os.path.join(folder_path, f"{table_name}.xlsx"), index=False
+            )
+            written += 1
+    return written
+
+
+class AssetTableWriter:
+    """资产附表汇总写入（由后台写入线程调用，不需要加锁）"""
+
+    FORMATS = (".parquet", ".csv")
+
+    def __init__(self, directory: str, file_format: str = "parquet", flush_assets: int = 50,
+                 segment_store: Optional[SegmentStore] = None):
+        """
+        初始化汇总写入
+
+        Args:
+            directory: 汇总表目录（每种附表一个文件）
+            file_format: 汇总表格式，"parquet" 或 "csv"
+            flush_assets: 每缓冲多少个附表写入一次暂存分段
+            segment_store: 暂存分段的存储，默认使用配置的存储目录
+
+        Raises:
+            ValueError: 不支持的格式
+            ImportError: 使用parquet格式但未安装 pyarrow
+        """
+        self.extension = f".{file_format}"
+        if self.extension not in self.FORMATS:
+            raise ValueError(f"不支持的汇总表格式: {file_format}")
+        if file_format == "parquet":
+            try:
+                import pyarrow
+            except ImportError:
+                raise ImportError("parquet格式的汇总表需要安装 pyarrow: pip install pyarrow")
+        self.directory = directory
+        self.flush_assets = max(1, flush_assets)
+        self.store = segment_store or SegmentStore()
+        self.buffers: Dict[str, List[Dict[str, Any]]] = {}
+        self.buffered_assets = 0
+        self.table_names: List[str] = []
+        self.row_count = 0
+
+    def staging_dataset(self, table_name: str) -> str:
+        """
+        获取附表的暂存数据集名称
+        """
+        return f"{os.path.basename(self.directory)}_{table_name}"
+
+    def add(self, auction_id: str, asset_name: str, table_name: str, df: pd.DataFrame) -> None:
+        """
+        追加一个资产的附表
+
+        Args:
+            auction_id: 拍卖ID
+            asset_name: 资产名称
+            table_name: 附表名称，如 "出价记录"
+            df: 附表数据
+        """
+        if table_name not in self.table_names:
+            self.table_names.append(table_name)
+        # 不同资产的附表列类型可能不一致，统一存为文本
+        rows = df.astype(object).where(df.notna(), None).to_dict(orient="records")
+        self.buffers.setdefault(table_name, []).extend(
+            {"拍卖ID": auction_id, "资产名称": asset_name,
+             **{str(column): None if value is None else str(value) for column, value in row.items()}}
+            for row in rows
+        )
+        self.row_count += len(rows)
+        self.buffered_assets += 1
+        if self.buffered_assets >= self.flush_assets:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        把缓冲的附表写入暂存分段（每种附表一个分段）
+        """
+        for table_name, rows in self.buffers.items():
+            if rows:
+                self.store.append(self.staging_dataset(table_name), rows)
+        self.buffers = {}
+        self.buffered_assets = 0
+
+    def close(self) -> List[str]:
+        """
+        写入剩余的缓冲并把暂存分段合并为汇总表文件，之后删除暂存分段
+
+        Returns:
+            List[str]: 汇总表文件路径
+        """
+        self.flush()
+        paths = []
+        if self.table_names:
+            os.makedirs(self.directory, exist_ok=True)
+        for table_name in self.table_names:
+            dataset = self.staging_dataset(table_name)
+            path = os.path.join(self.directory, table_name + self.extension)
+            paths.append(self.store.export(dataset, path))
+            self.store.clear(dataset)
+            try:
+                os.rmdir(self.store.dataset_dir(dataset))
+            except OSError:
+                pass
+        self.table_names = []
+        return paths
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+京东法拍竞价信息解析模块
+逐行解析 "标签：值" 形式的竞价信息文本为带类型的字典，值可以和标签在同一行，也可以在下一行；
+货币符号可以单独一行，也可以和数值在同一行
+"""
+from typing import Any, Dict, Optional
+
+LABEL_SEPARATOR = "："
+CURRENCY_SIGN = "￥"
+
+# 金额字段，即使缺少货币符号也按金额解析
+MONEY_LABELS = {"保证金", "起拍价", "加价幅度", "评估价", "变卖价", "当前价", "成交价"}
+
+# 可识别的周期单位，数值换算为整数（延时周期为分钟，竞价/变卖周期为天）
+PERIOD_UNITS = ("分钟/次", "分钟", "天")
+
+
+def _to_int(number: str) -> Optional[int]:
+    """
+    数值文本（可带千分位逗号和小数）四舍五入为整数，无法识别时返回None
+    """
+    number = number.replace(",", "")
+    try:
+        return int(number)
+    except ValueError:
+        pass
+    try:
+        return int(round(float(number)))
+    except (ValueError, OverflowError):
+        return None
+
+
+def _convert_value(value: str, is_money: bool) -> Any:
+    """
+    转换单个字段的值
+
+    Args:
+        value: 原始值（已去除货币符号）
+        is_money: 是否为金额字段
+
+    Returns:
+        Any: 金额返回整数（元），可识别单位的周期返回整数，其余保持原始字符串
+    """
+    if is_money:
+        number = _to_int(value)
+        return value if number is None else number
+
+    for unit in PERIOD_UNITS:
+        if value.endswith(unit):
+            number = _to_int(value[:-len(unit)].rstrip())
+            return value if number is None else number
+
+    return value
+
+
+def parse_bidding_info(text: str) -> Dict[str, Any]:
+    """
+    解析竞价信息文本
+
+    Args:
+        text: 竞价信息区块的文本，例如 "保证金：\\n￥\\n2,050,000\\n延时周期：\\n5分钟/次"
+
+    Returns:
+        Dict[str, Any]: {标签: 值}，金额为整数（元），延时周期为整数（分钟），
+            竞价周期和变卖周期为整数（天），无法识别的标签和值按原样保留，没有值的标签为空字符串
+    """
+    result: Dict[str, Any] = {}
+    label = None  # 还在等待值的标签
+    is_money = False
+
+    for line in text.split("\n"):
+        line = line.strip()
+
+        # 新标签，冒号之后的部分（可能为空）是同一行的值
+        head, separator, rest = line.partition(LABEL_SEPARATOR)
+        if separator and head.strip():
+            label = head.strip()
+            result[label] = ""
+            is_money = label in MONEY_LABELS
+            line = rest.strip()
+
+        # 值之后的帮助图标等行不属于任何字段
+        if label is None or not line:
+            continue
+
+        # 货币符号（可能单独一行）
+        if line.startswith(CURRENCY_SIGN):
+            is_money = True
+            line = line[len(CURRENCY_SIGN):].lstrip()
+            if not line:
+                continue
+
+        result[label] = _convert_value(line, is_money)
+        label = None
+
+    return result
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+内容寻址存储工具模块
+附件按sha256保存一份，资产文件夹中的文件通过硬链接指向它，路径保持不变；
+URL和内容索引保存在SQLite中，每个文件只写入一行，多个分片进程可同时写入
+"""
+import os
+import shutil
+import sqlite3
+import threading
+from typing import Optional
+from config import Config
+
+
+class BlobStore:
+    """内容寻址的附件存储（线程安全，多个分片进程可共用同一个存储目录）"""
+
+    _instance: Optional["BlobStore"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, root: str = None):
+        """
+        初始化存储
+
+        Args:
+            root: 存储目录，默认为 Config.OUTPUT_DIR 下的配置目录
+        """
+        self.root = root or os.path.join(Config.OUTPUT_DIR, Config.BLOB_STORE_CONFIG["dirname"])
+        self.index_path = os.path.join(self.root, "index.db")
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+        # 多个分片进程同时写入时等待锁释放
+        self._conn = sqlite3.connect(self.index_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS blobs (sha256 TEXT PRIMARY KEY, size INTEGER NOT NULL)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, sha256 TEXT NOT NULL)")
+        self._conn.commit()
+
+        self.dedup_count = 0  # 写入时发现重复内容的次数
+        self.url_hit_count = 0  # 按URL命中、免下载的次数
+
+    @classmethod
+    def shared(cls) -> "BlobStore":
+        """
+        获取进程内共享的存储实例
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def blob_path(self, sha256: str) -> str:
+        """
+        获取内容对应的存储路径
+        """
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def _has_blob(self, sha256: str, size: int) -> bool:
+        """
+        检查内容是否已存储（调用方需持有锁）
+        """
+        row = self._conn.execute("SELECT size FROM blobs WHERE sha256 = ?", (sha256,)).fetchone()
+        if not row or row[0] != size:
+            return False
+        try:
+            return os.path.getsize(self.blob_path(sha256)) == size
+        except OSError:
+            return False
+
+    def lookup_url(self, url: str) -> Optional[str]:
+        """
+        根据URL查找已存储的内容
+
+        Args:
+            url: 文件URL
+
+        Returns:
+            Optional[str]: 内容的sha256，未存储时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT urls.sha256, blobs.size FROM urls JOIN blobs ON blobs.sha256 = urls.sha256 WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row and self._has_blob(*row):
+                self.url_hit_count += 1
+                return row[0]
+            return None
+
+    def store(self, temp_path: str, sha256: str, size: int, url: str = None) -> str:
+        """
+        把下载好的临时文件存入存储，已有相同大小和哈希的内容时直接丢弃临时文件
+
+        Args:
+            temp_path: 临时文件路径
+            sha256: 内容哈希
+            size: 内容大小
+            url: 文件URL，记录后相同URL可免下载
+
+        Returns:
+            str: 存储路径
+        """
+        blob_path = self.blob_path(sha256)
+        with self._lock, self._conn:
+            if self._has_blob(sha256, size):
+                os.remove(temp_path)
+                self.dedup_count += 1
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(temp_path, blob_path)
+                self._conn.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?)", (sha256, size))
+            if url:
+                self._conn.execute("INSERT OR REPLACE INTO urls VALUES (?, ?)", (url, sha256))
+        return blob_path
+
+    def link(self, sha256: str, filepath: str) -> None:
+        """
+        在资产文件夹中创建指向存储内容的文件（优先硬链接，不支持时复制）
+
+        Args:
+            sha256: 内容哈希
+            filepath: 目标路径
+        """
+        blob_path = self.blob_path(sha256)
+        temp_link = f"{filepath}.link"
+        if os.path.exists(temp_link):
+            os.remove(temp_link)
+        try:
+            os.link(blob_path, temp_link)
+        except OSError:
+            shutil.copyfile(blob_path, temp_link)
+        os.replace(temp_link, filepath)
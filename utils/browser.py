@@ -6,17 +6,107 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from config import Config
 
+# 页面加载统计: 导航耗时和本页所有资源的传输字节数（Resource Timing API）
+PAGE_LOAD_STATS_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = nav ? (nav.transferSize || 0) : 0;
+for (var i = 0; i < resources.length; i++) {
+    bytes += resources[i].transferSize || 0;
+}
+return {
+    load_ms: nav ? Math.round((nav.loadEventEnd || nav.domContentLoadedEventEnd) - nav.startTime) : null,
+    transfer_bytes: bytes,
+    resource_count: resources.length
+};
+"""
+
 class BrowserManager:
     """浏览器管理器"""
     
     @staticmethod
-    def create_normal_driver() -> webdriver.Chrome:
+    def is_lean_profile(spider_config: Dict[str, Any] = None) -> bool:
+        """
+        检查爬虫配置是否启用了精简浏览器模式
+        
+        Args:
+            spider_config: 爬虫配置
+            
+        Returns:
+            bool: 是否启用精简模式
+        """
+        return bool(spider_config) and spider_config.get("browser_profile") == "lean"
+    
+    @staticmethod
+    def get_blocked_urls(spider_config: Dict[str, Any] = None) -> List[str]:
+        """
+        获取精简模式下要屏蔽的URL模式
+        
+        Args:
+            spider_config: 爬虫配置
+            
+        Returns:
+            List[str]: URL模式列表，未启用精简模式时为空
+        """
+        if not BrowserManager.is_lean_profile(spider_config):
+            return []
+        patterns = []
+        for resource_type in spider_config.get("blocked_resource_types", []):
+            patterns.extend(Config.BLOCKED_RESOURCE_PATTERNS.get(resource_type, []))
+        patterns.extend(spider_config.get("blocked_url_patterns", []))
+        return patterns
+    
+    @staticmethod
+    def apply_lean_options(options: Options, spider_config: Dict[str, Any] = None) -> None:
+        """
+        精简模式下DOM就绪即返回，不等待图片等子资源加载完成
+        
+        Args:
+            options: 浏览器选项
+            spider_config: 爬虫配置
+        """
+        if BrowserManager.is_lean_profile(spider_config):
+            options.page_load_strategy = "eager"
+    
+    @staticmethod
+    def apply_resource_blocking(driver: webdriver.Chrome, spider_config: Dict[str, Any] = None) -> None:
+        """
+        精简模式下通过CDP屏蔽配置的资源类型和URL模式
+        
+        Args:
+            driver: 浏览器驱动
+            spider_config: 爬虫配置
+        """
+        patterns = BrowserManager.get_blocked_urls(spider_config)
+        if not patterns:
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    
+    @staticmethod
+    def get_page_load_stats(driver: webdriver.Chrome) -> Dict[str, Any]:
+        """
+        获取当前页面的加载耗时和传输字节数
+        
+        Args:
+            driver: 浏览器驱动
+            
+        Returns:
+            Dict[str, Any]: {"load_ms": 加载耗时, "transfer_bytes": 传输字节数, "resource_count": 资源数}
+        """
+        return driver.execute_script(PAGE_LOAD_STATS_SCRIPT) or {}
+    
+    @staticmethod
+    def create_normal_driver(spider_config: Dict[str, Any] = None) -> webdriver.Chrome:
         """
         创建普通Chrome浏览器驱动
         
+        Args:
+            spider_config: 爬虫配置，用于选择浏览器模式（normal/lean）
+            
         Returns:
             webdriver.Chrome: Chrome浏览器驱动
         """
@@ -39,9 +129,13 @@ class BrowserManager:
         if config["headless"]:
             options.add_argument("--headless")
         
+        # 精简模式
+        BrowserManager.apply_lean_options(options, spider_config)
+        
         # 创建驱动
         service = Service(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=options)
+        BrowserManager.apply_resource_blocking(driver, spider_config)
         
         # 设置超时时间
         driver.implicitly_wait(config["implicit_wait"])
@@ -88,13 +182,15 @@ class BrowserManager:
             return None
     
     @staticmethod
-    def create_user_data_driver(user_data_dir: str = None, profile_name: str = None) -> webdriver.Chrome:
+    def create_user_data_driver(user_data_dir: str = None, profile_name: str = None,
+                                spider_config: Dict[str, Any] = None) -> webdriver.Chrome:
         """
         创建带用户数据目录的Chrome浏览器驱动（用于记住登录信息）
         
         Args:
             user_data_dir: 用户数据目录路径
             profile_name: 配置文件名称
+            spider_config: 爬虫配置，用于选择浏览器模式（normal/lean）
             
         Returns:
             webdriver.Chrome: Chrome浏览器驱动
@@ -137,9 +233,13 @@ class BrowserManager:
         if config["headless"]:
             options.add_argument("--headless")
         
+        # 精简模式
+        BrowserManager.apply_lean_options(options, spider_config)
+        
         # 创建驱动
         service = Service(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=options)
+        BrowserManager.apply_resource_blocking(driver, spider_config)
         
         # 设置超时时间
         driver.implicitly_wait(config["implicit_wait"])
@@ -3,9 +3,14 @@
 数据存储工具模块
 """
 import pandas as pd
+import hashlib
 import os
+import re
 import requests
 from typing import Dict, List, Any, Optional
+from utils.blob_store import BlobStore
+from utils.download_manifest import DownloadManifest
+from utils.segment_store import SegmentStore
 from config import Config
 
 class DataStorage:
@@ -30,9 +35,9 @@ class DataStorage:
         # 创建DataFrame
         df = pd.DataFrame(data)
         
-        # 保存到Excel
+        # 保存到Excel（文件已存在时只替换同名工作表，保留其他工作表）
         try:
-            with pd.ExcelWriter(filepath, mode='a', engine='openpyxl') as writer:
+            with pd.ExcelWriter(filepath, mode='a', engine='openpyxl', if_sheet_exists='replace') as writer:
                 df.to_excel(writer, sheet_name=sheet_name, index=False)
             print(f"数据已保存到: {filepath}")
         except FileNotFoundError:
@@ -63,31 +68,139 @@ class DataStorage:
         print(f"数据已保存到: {filepath}")
     
     @staticmethod
-    def download_file(url: str, filepath: str) -> bool:
+    def download_file(url: str, filepath: str, session: Optional[requests.Session] = None,
+                      use_manifest: bool = False, blob_store: Optional[BlobStore] = None) -> bool:
         """
-        下载文件
+        下载文件（流式写入临时文件，完成后原子重命名）
+        
+        启用下载清单时，清单中已完成且大小一致的文件直接跳过；
+        上次未完成的临时文件通过HTTP Range请求续传。
+        使用去重存储时，已存储过的URL直接链接免下载，新下载的内容按大小和哈希去重后再链接到目标路径。
         
         Args:
             url: 文件URL
             filepath: 保存路径
+            session: 复用连接的会话，为None时使用单次请求
+            use_manifest: 是否使用下载清单
+            blob_store: 内容寻址的去重存储
             
         Returns:
             bool: 下载是否成功
         """
+        config = Config.DOWNLOAD_CONFIG
+        temp_path = f"{filepath}.part"
+        directory, filename = os.path.split(filepath)
+        manifest = DownloadManifest.for_directory(directory) if use_manifest else None
+        
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
             # 确保目录存在
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            os.makedirs(directory, exist_ok=True)
+            
+            if manifest and manifest.is_complete(filename, url):
+                return True
+            
+            # 相同URL的内容已存储过，直接链接
+            if blob_store:
+                sha256 = blob_store.lookup_url(url)
+                if sha256:
+                    blob_store.link(sha256, filepath)
+                    if manifest:
+                        manifest.update(filename, url=url, status="complete",
+                                        size=os.path.getsize(filepath), sha256=sha256)
+                    return True
             
-            with open(filepath, "wb") as f:
-                f.write(response.content)
+            # 断点续传：临时文件存在且清单记录的URL一致
+            headers = {}
+            resume_from = 0
+            entry = manifest.get(filename) if manifest else None
+            if entry and entry.get("url") == url and os.path.exists(temp_path):
+                resume_from = os.path.getsize(temp_path)
+                if resume_from:
+                    headers["Range"] = f"bytes={resume_from}-"
+                    validator = entry.get("etag") or entry.get("last_modified")
+                    if validator:
+                        headers["If-Range"] = validator
             
+            http = session or requests
+            hasher = hashlib.sha256()
+            response = http.get(url, headers=headers, timeout=config["timeout"], stream=True)
+            if resume_from and response.status_code == 416:
+                # 续传范围超出文件末尾：临时文件已是完整内容时直接完成，否则丢弃临时文件重新下载
+                response.close()
+                if resume_from in (DataStorage._range_total(response), entry.get("size")):
+                    response = None
+                else:
+                    os.remove(temp_path)
+                    resume_from = 0
+                    response = http.get(url, timeout=config["timeout"], stream=True)
+            
+            if response is None:
+                DataStorage._hash_file(temp_path, hasher)
+            else:
+                with response:
+                    response.raise_for_status()
+                    
+                    if resume_from and response.status_code == 206:
+                        # 服务器接受续传，先把已下载部分计入校验和
+                        DataStorage._hash_file(temp_path, hasher)
+                        mode = "ab"
+                    else:
+                        mode = "wb"
+                    
+                    if manifest:
+                        manifest.update(
+                            filename, url=url, status="partial",
+                            etag=response.headers.get("ETag") or (entry or {}).get("etag"),
+                            last_modified=response.headers.get("Last-Modified") or (entry or {}).get("last_modified")
+                        )
+                    
+                    with open(temp_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=config["chunk_size"]):
+                            if chunk:
+                                f.write(chunk)
+                                hasher.update(chunk)
+            
+            sha256 = hasher.hexdigest()
+            if blob_store:
+                # 写入前按大小和哈希去重
+                blob_store.store(temp_path, sha256, os.path.getsize(temp_path), url)
+                blob_store.link(sha256, filepath)
+            else:
+                os.replace(temp_path, filepath)
+            if manifest:
+                manifest.update(filename, status="complete", size=os.path.getsize(filepath),
+                                sha256=sha256)
             return True
         except Exception as e:
             print(f"下载文件失败 {url}: {e}")
+            # 使用清单时保留临时文件，下次续传
+            if not manifest:
+                try:
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                except OSError:
+                    pass
             return False
+        finally:
+            if manifest:
+                manifest.release()
+    
+    @staticmethod
+    def _hash_file(path: str, hasher: Any) -> None:
+        """
+        把已有文件的内容计入校验和
+        """
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(Config.DOWNLOAD_CONFIG["chunk_size"]), b""):
+                hasher.update(chunk)
+    
+    @staticmethod
+    def _range_total(response: requests.Response) -> Optional[int]:
+        """
+        从416响应的 Content-Range（如 "bytes */12345"）中读取文件总大小
+        """
+        match = re.fullmatch(r"bytes \*/(\d+)", response.headers.get("Content-Range", "").strip())
+        return int(match.group(1)) if match else None
     
     @staticmethod
     def create_folder(folder_path: str) -> str:
@@ -105,34 +218,42 @@ class DataStorage:
         return full_path
     
     @staticmethod
-    def append_to_excel(data: List[Dict[str, Any]], filename: str, sheet_name: str = "Sheet1") -> None:
+    def append_records(data: List[Dict[str, Any]], dataset: str, segment_store: Optional[SegmentStore] = None) -> None:
         """
-        追加数据到Excel文件
+        追加数据到分段存储（只写入新的分段文件，不读取已有数据）
         
         Args:
             data: 要追加的数据列表
-            filename: 文件名
-            sheet_name: 工作表名称
+            dataset: 数据集名称
+            segment_store: 分段存储，默认使用配置的存储目录
         """
         if not data:
             print("没有数据需要追加")
             return
         
-        filepath = os.path.join(Config.OUTPUT_DIR, filename)
-        
-        # 创建DataFrame
-        df = pd.DataFrame(data)
+        path = (segment_store or SegmentStore()).append(dataset, data)
+        print(f"数据已追加到: {path}")
+    
+    @staticmethod
+    def export_records(dataset: str, filename: str, sheet_name: str = "Sheet1",
+                       segment_store: Optional[SegmentStore] = None) -> Optional[str]:
+        """
+        把分段存储中的数据集导出为最终文件（按扩展名选择 xlsx/csv/parquet）
         
-        try:
-            # 尝试读取现有文件
-            existing_df = pd.read_excel(filepath, sheet_name=sheet_name)
-            # 合并数据
-            combined_df = pd.concat([existing_df, df], ignore_index=True)
-            # 保存
-            with pd.ExcelWriter(filepath, mode='w', engine='openpyxl') as writer:
-                combined_df.to_excel(writer, sheet_name=sheet_name, index=False)
-        except FileNotFoundError:
-            # 如果文件不存在，直接创建
-            df.to_excel(filepath, sheet_name=sheet_name, index=False)
+        Args:
+            dataset: 数据集名称
+            filename: 文件名
+            sheet_name: 工作表名称（仅xlsx）
+            segment_store: 分段存储，默认使用配置的存储目录
+            
+        Returns:
+            Optional[str]: 导出文件路径，数据集为空时返回None
+        """
+        store = segment_store or SegmentStore()
+        if not store.segments(dataset):
+            print("没有数据需要导出")
+            return None
         
-        print(f"数据已追加到: {filepath}") 
\ No newline at end of file
+        filepath = store.export(dataset, os.path.join(Config.OUTPUT_DIR, filename), sheet_name)
+        print(f"数据已导出到: {filepath}")
+        return filepath
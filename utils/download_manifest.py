@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+下载清单工具模块
+在每个下载目录中记录文件的URL、大小、ETag/Last-Modified和校验和，用于跳过已下载文件和断点续传
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+from config import Config
+
+
+class DownloadManifest:
+    """下载清单（每个目录一个，线程安全）"""
+
+    # 正在使用的清单实例及其引用计数，目录中的下载全部结束后移除
+    _instances: Dict[str, "DownloadManifest"] = {}
+    _ref_counts: Dict[str, int] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, directory: str):
+        """
+        初始化下载清单
+
+        Args:
+            directory: 下载目录
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, Config.DOWNLOAD_CONFIG["manifest_filename"])
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    @classmethod
+    def for_directory(cls, directory: str) -> "DownloadManifest":
+        """
+        获取目录对应的下载清单（同一目录同时进行的下载共用一个实例），用完后需调用 release
+
+        Args:
+            directory: 下载目录
+
+        Returns:
+            DownloadManifest: 下载清单
+        """
+        directory = os.path.abspath(directory)
+        with cls._instances_lock:
+            manifest = cls._instances.get(directory)
+            if manifest is None:
+                manifest = cls(directory)
+                cls._instances[directory] = manifest
+            cls._ref_counts[directory] = cls._ref_counts.get(directory, 0) + 1
+            return manifest
+
+    def release(self) -> None:
+        """
+        释放清单实例，目录中没有进行中的下载时从缓存中移除（每次更新都已写盘，无需额外保存）
+        """
+        with self._instances_lock:
+            count = self._ref_counts.get(self.directory, 0) - 1
+            if count > 0:
+                self._ref_counts[self.directory] = count
+            else:
+                self._ref_counts.pop(self.directory, None)
+                self._instances.pop(self.directory, None)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        读取清单文件
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        """
+        原子写入清单文件（调用方需持有锁）
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        获取文件的清单记录
+
+        Args:
+            filename: 文件名
+
+        Returns:
+            Optional[Dict[str, Any]]: 清单记录
+        """
+        with self._lock:
+            entry = self._entries.get(filename)
+            return dict(entry) if entry else None
+
+    def update(self, filename: str, **fields: Any) -> None:
+        """
+        更新文件的清单记录并写盘
+
+        Args:
+            filename: 文件名
+            **fields: 要更新的字段
+        """
+        with self._lock:
+            entry = self._entries.setdefault(filename, {})
+            entry.update(fields)
+            self._save()
+
+    def is_complete(self, filename: str, url: str) -> bool:
+        """
+        检查文件是否已完整下载（只做本地检查，不发请求）
+
+        Args:
+            filename: 文件名
+            url: 文件URL
+
+        Returns:
+            bool: 清单中记录为已完成、URL一致且本地文件大小一致时返回True
+        """
+        entry = self.get(filename)
+        if not entry or entry.get("status") != "complete" or entry.get("url") != url:
+            return False
+        try:
+            return os.path.getsize(os.path.join(self.directory, filename)) == entry.get("size")
+        except OSError:
+            return False
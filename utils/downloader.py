@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+附件下载工具模块
+使用有界线程池在后台下载附件和图片，爬取流程只负责提交任务
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, Set
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from utils.blob_store import BlobStore
+from utils.data_storage import DataStorage
+from config import Config
+
+# 下载完成回调: callback(url, filepath, success)
+DownloadCallback = Callable[[str, str, bool], None]
+
+
+class AttachmentDownloader:
+    """附件下载器"""
+
+    def __init__(self, max_workers: int = None, per_host_limit: int = None,
+                 on_complete: Optional[DownloadCallback] = None):
+        """
+        初始化附件下载器
+
+        Args:
+            max_workers: 下载线程数
+            per_host_limit: 同一主机的最大并发下载数
+            on_complete: 默认的下载完成回调，在下载线程中调用
+        """
+        config = Config.DOWNLOAD_CONFIG
+        self.max_workers = max_workers or config["max_workers"]
+        self.per_host_limit = per_host_limit or config["per_host_limit"]
+        self.on_complete = on_complete
+        self.blob_store = BlobStore.shared() if Config.BLOB_STORE_CONFIG["enabled"] else None
+
+        # 所有下载共用一个带连接池的会话
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="downloader")
+        self._lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._pending: Set[Future] = set()
+
+        self.completed_count = 0
+        self.failed_count = 0
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """
+        获取URL所在主机的并发限制信号量
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _download(self, url: str, filepath: str) -> bool:
+        """
+        在下载线程中执行下载
+        """
+        with self._host_semaphore(url):
+            return DataStorage.download_file(url, filepath, session=self.session,
+                                             use_manifest=Config.DOWNLOAD_CONFIG["use_manifest"],
+                                             blob_store=self.blob_store)
+
+    def submit(self, url: str, filepath: str, callback: Optional[DownloadCallback] = None) -> Future:
+        """
+        提交下载任务，立即返回
+
+        Args:
+            url: 文件URL
+            filepath: 保存路径
+            callback: 下载完成回调，默认使用 on_complete
+
+        Returns:
+            Future: 结果为下载是否成功
+        """
+        callback = callback or self.on_complete
+        future = self.executor.submit(self._download, url, filepath)
+        with self._lock:
+            self._pending.add(future)
+
+        def _done(done_future: Future) -> None:
+            success = not done_future.cancelled() and done_future.exception() is None and done_future.result()
+            with self._lock:
+                self._pending.discard(done_future)
+                if success:
+                    self.completed_count += 1
+                else:
+                    self.failed_count += 1
+            if callback:
+                callback(url, filepath, bool(success))
+
+        future.add_done_callback(_done)
+        return future
+
+    def pending_count(self) -> int:
+        """
+        获取尚未完成的下载数
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def wait(self, timeout: float = None) -> None:
+        """
+        等待当前已提交的下载全部完成
+
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def shutdown(self, wait_for_pending: bool = True) -> None:
+        """
+        关闭下载器
+
+        Args:
+            wait_for_pending: 是否等待未完成的下载
+        """
+        self.executor.shutdown(wait=wait_for_pending, cancel_futures=not wait_for_pending)
+        self.session.close()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+元素查找工具模块
+可选元素零等待探测，必需的页面锚点使用显式等待，并统计等待缺失元素耗费的时间
+"""
+import time
+from typing import Dict, List, Optional, Tuple
+from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from config import Config
+
+# 一次脚本调用探测多个字段: fields = {字段名: [XPath, 属性名或null]}
+# 属性名为null时返回元素的innerText，元素不存在时返回null
+PROBE_SCRIPT = """
+var root = arguments[0] || document;
+var fields = arguments[1];
+var result = {};
+for (var key in fields) {
+    var node = document.evaluate(fields[key][0], root, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    if (node === null) {
+        result[key] = null;
+    } else if (fields[key][1] === null) {
+        result[key] = (node.innerText || node.textContent || '').trim();
+    } else {
+        var value = node[fields[key][1]];
+        if (value === undefined || value === null) {
+            value = node.getAttribute(fields[key][1]);
+        }
+        result[key] = value === null ? null : String(value);
+    }
+}
+return result;
+"""
+
+
+class ElementLookup:
+    """元素查找器"""
+
+    def __init__(self, driver: webdriver.Chrome, required_timeout: int = None):
+        """
+        初始化元素查找器，并关闭驱动的隐式等待
+
+        Args:
+            driver: 浏览器驱动
+            required_timeout: 必需元素的显式等待时间（秒）
+        """
+        self.driver = driver
+        self.required_timeout = required_timeout or Config.BROWSER_CONFIG["required_wait"]
+        # 隐式等待会让每一次找不到元素的查找都阻塞到超时，这里统一关闭
+        self.driver.implicitly_wait(0)
+
+        self.lookup_count = 0  # 查找次数
+        self.missing_count = 0  # 未找到的次数
+        self.missing_wait_seconds = 0.0  # 等待缺失元素耗费的时间
+
+    def _record(self, started: float, total: int, missing: int) -> None:
+        """
+        记录一次查找的统计信息
+        """
+        self.lookup_count += total
+        if missing:
+            self.missing_count += missing
+            self.missing_wait_seconds += (time.perf_counter() - started) * missing / total
+
+    def find_optional(self, parent, by: str, value: str) -> Optional[WebElement]:
+        """
+        零等待查找可选元素
+
+        Args:
+            parent: 父元素，为None时从整个页面查找
+            by: 定位方式
+            value: 定位表达式
+
+        Returns:
+            Optional[WebElement]: 找到的元素，不存在时返回None
+        """
+        started = time.perf_counter()
+        elements = (parent or self.driver).find_elements(by, value)
+        self._record(started, 1, 0 if elements else 1)
+        return elements[0] if elements else None
+
+    def find_all(self, parent, by: str, value: str) -> List[WebElement]:
+        """
+        零等待查找所有匹配元素
+
+        Args:
+            parent: 父元素，为None时从整个页面查找
+            by: 定位方式
+            value: 定位表达式
+
+        Returns:
+            List[WebElement]: 匹配的元素列表
+        """
+        started = time.perf_counter()
+        elements = (parent or self.driver).find_elements(by, value)
+        self._record(started, 1, 0 if elements else 1)
+        return elements
+
+    def probe(self, parent, fields: Dict[str, Tuple[str, Optional[str]]]) -> Dict[str, Optional[str]]:
+        """
+        一次调用探测多个可选字段
+
+        Args:
+            parent: 父元素，为None时从整个页面查找
+            fields: {字段名: (相对XPath, 属性名或None)}，属性名为None时取元素文本
+
+        Returns:
+            Dict[str, Optional[str]]: 字段值，不存在的字段为None
+        """
+        if not fields:
+            return {}
+        started = time.perf_counter()
+        script_fields = {key: [xpath, attr] for key, (xpath, attr) in fields.items()}
+        result = self.driver.execute_script(PROBE_SCRIPT, parent, script_fields) or {}
+        values = {key: result.get(key) for key in fields}
+        missing = sum(1 for value in values.values() if value is None)
+        self._record(started, len(fields), missing)
+        return values
+
+    def wait_required(self, by: str, value: str, timeout: int = None) -> WebElement:
+        """
+        显式等待必需的页面锚点
+
+        Args:
+            by: 定位方式
+            value: 定位表达式
+            timeout: 等待时间（秒），默认使用配置值
+
+        Returns:
+            WebElement: 找到的元素
+
+        Raises:
+            TimeoutException: 超时仍未找到元素
+        """
+        return WebDriverWait(self.driver, timeout or self.required_timeout).until(
+            EC.presence_of_element_located((by, value))
+        )
+
+    def require(self, parent, by: str, value: str) -> WebElement:
+        """
+        零等待查找必需元素，不存在时抛出异常
+
+        Raises:
+            NoSuchElementException: 元素不存在
+        """
+        element = self.find_optional(parent, by, value)
+        if element is None:
+            raise NoSuchElementException(f"未找到元素: {by}={value}")
+        return element
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取查找统计信息
+
+        Returns:
+            Dict[str, float]: 统计信息
+        """
+        return {
+            "lookup_count": self.lookup_count,
+            "missing_count": self.missing_count,
+            "missing_wait_seconds": round(self.missing_wait_seconds, 3),
+        }
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+流式Excel导出模块
+逐条读取数据项并以openpyxl只写模式写入xlsx，不构建DataFrame，内存占用与数据量无关；
+可按某一列（如省份、所在区域）分工作表，有列定义时金额、数量写为数值单元格，时间写为日期单元格
+"""
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from utils.record_schema import flatten_record, normalize_record
+
+EXCEL_MAX_ROWS = 1_048_576  # 每个工作表的最大行数（含表头）
+SHEET_TITLE_LENGTH = 31
+INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+DEFAULT_SHEET = "Sheet1"
+UNKNOWN_SHEET = "未分类"  # 分表列为空的数据项所在工作表
+
+
+def cell_value(value: Any) -> Any:
+    """
+    转换为可写入单元格的值（去掉Excel不允许的控制字符，嵌套结构转为文本）
+    """
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    if isinstance(value, (dict, list)):
+        return ILLEGAL_CHARACTERS_RE.sub("", str(value))
+    return value
+
+
+class ExcelStreamWriter:
+    """流式Excel写入（只写模式，工作表按需创建，超过行数上限时续写到新工作表）"""
+
+    def __init__(self, filepath: str, columns: List[str], sheet_by: Optional[str] = None,
+                 sheet_name: str = DEFAULT_SHEET):
+        """
+        初始化写入
+
+        Args:
+            filepath: 文件路径
+            columns: 列名（表头）
+            sheet_by: 分工作表的列名，为None时写入同一个工作表
+            sheet_name: 不分工作表时的工作表名称
+        """
+        self.filepath = filepath
+        self.columns = columns
+        self.sheet_by = sheet_by
+        self.sheet_name = sheet_name
+        self.workbook = Workbook(write_only=True)
+        self.sheets: Dict[str, List[Any]] = {}  # 分表键 -> [工作表, 已写行数, 序号]
+        self.titles = set()
+        self.row_count = 0
+
+    def _new_sheet(self, key: str, part: int):
+        """
+        创建工作表并写入表头，标题按Excel规则截断并去重
+        """
+        base = INVALID_SHEET_CHARS.sub("_", key).strip("'") or UNKNOWN_SHEET
+        suffix = f"_{part}" if part > 1 else ""
+        title = base[:SHEET_TITLE_LENGTH - len(suffix)] + suffix
+        index = 1
+        while title.lower() in self.titles:
+            index += 1
+            extra = f"~{index}"
+            title = base[:SHEET_TITLE_LENGTH - len(suffix) - len(extra)] + suffix + extra
+        self.titles.add(title.lower())
+        sheet = self.workbook.create_sheet(title)
+        sheet.append(self.columns)
+        return sheet
+
+    def write(self, row: Dict[str, Any]) -> None:
+        """
+        写入一行（键为列名的平铺数据项）
+        """
+        if self.sheet_by:
+            key = row.get(self.sheet_by)
+            key = UNKNOWN_SHEET if key is None or key == "" else str(key)
+        else:
+            key = self.sheet_name
+        entry = self.sheets.get(key)
+        if entry is None:
+            entry = self.sheets[key] = [self._new_sheet(key, 1), 1, 1]
+        elif entry[1] >= EXCEL_MAX_ROWS:
+            entry[2] += 1
+            entry[0] = self._new_sheet(key, entry[2])
+            entry[1] = 1
+        entry[0].append([cell_value(row.get(column)) for column in self.columns])
+        entry[1] += 1
+        self.row_count += 1
+
+    def close(self) -> int:
+        """
+        保存文件（先写入临时文件再重命名）
+
+        Returns:
+            int: 写入的数据行数
+        """
+        if not self.sheets:
+            self._new_sheet(self.sheet_name, 1)
+        temp_path = f"{self.filepath}.tmp"
+        self.workbook.save(temp_path)
+        os.replace(temp_path, self.filepath)
+        return self.row_count
+
+
+def export_records_to_excel(records: Callable[[], Iterable[Dict[str, Any]]], filepath: str,
+                            schema: Optional[Dict[str, str]] = None, sheet_by: Optional[str] = None,
+                            sheet_name: str = DEFAULT_SHEET) -> int:
+    """
+    把数据项流式导出为xlsx文件
+
+    Args:
+        records: 返回数据项迭代器的函数（没有列定义时会调用两次：先收集列名，再写入）
+        filepath: 文件路径
+        schema: 列定义（见 utils.record_schema.RECORD_SCHEMAS），按列类型写入数值和日期单元格
+        sheet_by: 分工作表的列名，如 "省份"、"所在区域"
+        sheet_name: 不分工作表时的工作表名称
+
+    Returns:
+        int: 写入的数据行数
+    """
+    if schema is not None:
+        columns = list(schema)
+        rows = (normalize_record(record, schema) for record in records())
+    else:
+        columns: List[str] = []
+        seen = set()
+        for record in records():
+            for column in flatten_record(record):
+                if column not in seen:
+                    seen.add(column)
+                    columns.append(column)
+        rows = (flatten_record(record) for record in records())
+    if sheet_by not in columns:
+        sheet_by = None
+
+    writer = ExcelStreamWriter(filepath, columns, sheet_by, sheet_name)
+    for row in rows:
+        writer.write(row)
+    return writer.close()
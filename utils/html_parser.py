@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+HTML离线解析工具模块
+一次性获取页面HTML后使用lxml解析，避免逐个元素调用WebDriver
+"""
+import re
+from typing import Any, Dict, List, Optional
+from lxml import html as lxml_html
+from utils.bidding_info import parse_bidding_info
+
+# 京东法拍详情页各区块相对于 pageContainer 的XPath
+JD_FINAL_PRICE_XPATH = "./div[2]/div[1]/div[2]/div[3]/div[3]/div[1]/div/div[2]"
+JD_BIDDING_RESULT_XPATH = "./div[2]/div[1]/div[2]/div[3]/div[1]/div[1]/div"
+JD_INFO_XPATH = "./div[2]/div[1]/div[2]/div[3]/div[1]/div[2]/div"
+JD_BIDDING_INFO_XPATH = "./div[2]/div[1]/div[2]/div[4]/div[2]/div/div[1]/div/ul"
+
+# 详情页拍卖信息中的字段，允许数值和文字之间存在空白（离线解析时文本节点可能被拆分）
+JD_END_TIME_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+JD_WATCHED_PATTERN = re.compile(r'(\d+)\s*人围观')
+JD_SIGNIN_PATTERN = re.compile(r'(\d+)\s*人报名')
+JD_ATTENTION_PATTERN = re.compile(r'(\d+)\s*人关注')
+
+
+def class_xpath(class_name: str) -> str:
+    """
+    生成与 By.CLASS_NAME 语义一致的XPath条件
+
+    Args:
+        class_name: 类名
+
+    Returns:
+        str: XPath谓词
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+def find_by_class(element, class_name: str):
+    """
+    查找第一个包含指定类名的后代元素
+
+    Args:
+        element: lxml元素
+        class_name: 类名
+
+    Returns:
+        lxml元素，未找到返回None
+    """
+    if element is None:
+        return None
+    found = element.xpath(f".//*[{class_xpath(class_name)}]")
+    return found[0] if found else None
+
+
+def element_text(element, separator: Optional[str] = None) -> str:
+    """
+    获取元素的可见文本，模拟WebDriver中 .text 的结果
+
+    Args:
+        element: lxml元素
+        separator: 文本片段之间的分隔符；为None时按行内文本拼接并合并空白
+
+    Returns:
+        str: 文本内容
+    """
+    if element is None:
+        return ""
+    if separator is None:
+        return " ".join(element.text_content().split())
+    parts = [text.strip() for text in element.itertext() if text.strip()]
+    return separator.join(parts)
+
+
+def parse_fragment(html: str):
+    """
+    解析HTML片段
+
+    Args:
+        html: HTML字符串（outerHTML或page_source）
+
+    Returns:
+        lxml根元素
+    """
+    return lxml_html.fromstring(html)
+
+
+def parse_lianjia_list(html: str) -> List[Optional[Dict[str, str]]]:
+    """
+    解析链家成交列表（listContent）的HTML
+
+    Args:
+        html: listContent 的 outerHTML 或整个页面源码
+
+    Returns:
+        List[Optional[Dict[str, str]]]: 每个房源的原始字段，无法解析的房源为None
+    """
+    root = parse_fragment(html)
+    if "listContent" in (root.get("class") or "").split():
+        list_content = root
+    else:
+        list_content = find_by_class(root, "listContent")
+        if list_content is None:
+            return []
+
+    rows = []
+    for estate in list_content.iter("li"):
+        estate_info = estate.xpath(".//*[contains(@class, 'info')]")
+        if not estate_info:
+            rows.append(None)
+            continue
+        estate_info = estate_info[0]
+
+        address = find_by_class(estate_info, "address")
+        flood = find_by_class(estate_info, "flood")
+        if address is None or flood is None:
+            # 成交时间和价格信息都依赖这两个容器，缺失时与在线提取一样丢弃该房源
+            rows.append(None)
+            continue
+
+        title = find_by_class(estate_info, "title")
+        links = title.xpath("descendant-or-self::a/@href") if title is not None else []
+        rows.append({
+            "title": element_text(title) if title is not None else None,
+            "link": links[0] if links else None,
+            "houseInfo": _optional_text(address, "houseInfo"),
+            "positionInfo": _optional_text(flood, "positionInfo"),
+            "dealDate": _optional_text(address, "dealDate"),
+            "unitPrice": _optional_text(flood, "unitPrice"),
+            "totalPrice": _optional_text(address, "totalPrice"),
+        })
+    return rows
+
+
+def _optional_text(parent, class_name: str) -> Optional[str]:
+    """
+    获取可选字段的文本，字段不存在时返回None
+    """
+    element = find_by_class(parent, class_name)
+    return element_text(element) if element is not None else None
+
+
+def _first_xpath(element, xpath: str):
+    """
+    获取XPath匹配的第一个元素，未找到返回None
+    """
+    found = element.xpath(xpath)
+    return found[0] if found else None
+
+
+def _search_group(pattern, text: str, group: int = 1) -> str:
+    """
+    正则匹配并返回分组内容，未匹配返回空字符串
+    """
+    match = pattern.search(text)
+    return match.group(group) if match else ''
+
+
+def _int_text(value: Any) -> str:
+    """
+    竞价信息中解析出的整数转换为文本，未解析出数值时返回空字符串
+    """
+    return str(value) if isinstance(value, int) else ''
+
+
+def parse_jd_detail(container, name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    一次性解析京东法拍详情页 pageContainer 的所有字段
+
+    Args:
+        container: pageContainer 的 outerHTML 或已解析的lxml元素
+        name: 资产名称，为None时从 pm-name 元素中读取
+
+    Returns:
+        Dict[str, Any]: 详情信息，键与 JDAuctionSpider.extract_detail_info 的输出一致
+
+    Raises:
+        ValueError: 缺少必需的区块
+    """
+    root = parse_fragment(container) if isinstance(container, str) else container
+
+    if name is None:
+        name_element = find_by_class(root, "pm-name")
+        if name_element is None:
+            raise ValueError("未找到资产名称")
+        name = element_text(name_element)
+
+    # 获取成交价格
+    final_price = element_text(_first_xpath(root, JD_FINAL_PRICE_XPATH))
+
+    # 获取流拍信息
+    bidding_result = _first_xpath(root, JD_BIDDING_RESULT_XPATH)
+    if bidding_result is None:
+        raise ValueError("未找到竞拍结果")
+    if '流拍' in element_text(bidding_result):
+        if_unsold = '是'
+        unsold_reason = '本标的物已流拍'
+    else:
+        if_unsold = '否'
+        unsold_reason = ''
+
+    # 获取其他信息
+    info_element = _first_xpath(root, JD_INFO_XPATH)
+    if info_element is None:
+        raise ValueError("未找到拍卖信息")
+    info_text = element_text(info_element, separator="\n")
+
+    # 竞价信息
+    bidding_element = _first_xpath(root, JD_BIDDING_INFO_XPATH)
+    if bidding_element is None:
+        raise ValueError("未找到竞价信息")
+    bidding_info = parse_bidding_info(element_text(bidding_element, separator="\n"))
+
+    detail = {
+        '资产名称': name,
+        '结束时间': _search_group(JD_END_TIME_PATTERN, info_text, 0),
+        '是否流拍': if_unsold,
+        '流拍原因': unsold_reason,
+        '围观人数': _search_group(JD_WATCHED_PATTERN, info_text),
+        '报名人数': _search_group(JD_SIGNIN_PATTERN, info_text),
+        '关注提醒人数': _search_group(JD_ATTENTION_PATTERN, info_text),
+        "成交价格": final_price,
+        '起拍价格': '',
+        '变卖价格': '',
+        '加价幅度': _int_text(bidding_info.get('加价幅度')),
+        '保证金': '',
+        '竞价周期': '',
+        '变卖周期': '',
+        '延时周期': _int_text(bidding_info.get('延时周期')),
+    }
+
+    # 判断是否为变卖
+    if '变卖' in name:
+        detail['变卖价格'] = _int_text(bidding_info.get('变卖价'))
+        detail['变卖周期'] = _int_text(bidding_info.get('变卖周期'))
+    else:
+        detail['起拍价格'] = _int_text(bidding_info.get('起拍价'))
+        detail['保证金'] = _int_text(bidding_info.get('保证金'))
+        detail['竞价周期'] = _int_text(bidding_info.get('竞价周期'))
+
+    return detail
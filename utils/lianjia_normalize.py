@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+链家成交数据规范化模块
+把一批成交记录中的原始文本（标题、houseInfo、positionInfo、单价、总价）用pandas向量化字符串操作
+拆分为带类型的列：室、厅、面积、朝向、装修、楼层位置、总楼层、建成年份、建筑类型、单价、总价、成交时间
+"""
+from typing import Any, Dict, Iterable
+import pandas as pd
+from utils.record_schema import RECORD_SCHEMAS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # 可选依赖，未安装时使用 pandas 的逐元素正则
+    pa = None
+    pc = None
+
+# 输入列（与 RECORD_SCHEMAS["lianjia"] 的平铺列名一致）
+TITLE_COLUMN = "房源名称"
+HOUSE_INFO_COLUMN = "建筑特征_装修及朝向"
+POSITION_INFO_COLUMN = "建筑特征_楼层及建筑类型"
+UNIT_PRICE_COLUMN = "价格信息_单价"
+TOTAL_PRICE_COLUMN = "价格信息_总价"
+DEAL_DATE_COLUMN = "成交时间"
+
+# 正则分组名即提取结果的列名（使用pyarrow时由RE2执行，分组名需为ASCII）
+LAYOUT_PATTERN = r"(?P<rooms>\d+)室(?P<halls>\d+)厅"
+AREA_PATTERN = r"(?P<area>\d+(?:\.\d+)?)\s*(?:平米|㎡|平方米)"
+ORIENTATION_PATTERN = r"(?:^|\|)\s*(?P<orientation>[东南西北][东南西北 ]*?)\s*(?:\||$)"
+DECORATION_PATTERN = r"(?P<decoration>精装|简装|毛坯|豪装|其他)"
+POSITION_PATTERN = (
+    r"^(?:.*?(?P<level>[低中高顶底]楼层|地下室))?"
+    r"(?:.*?(?:共(?P<floors>\d+)层|(?:^|\s)(?P<low_floors>\d+)层))?"
+    r"(?:.*?(?P<year>\d{4})年)?"
+    r"(?:.*?(?P<building>板塔结合|板楼|塔楼|平房))?"
+)
+AMOUNT_PATTERN = r"(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>万|亿)?"
+UNIT_MULTIPLIERS = {"万": 10_000, "亿": 100_000_000}
+
+# 输出列及类型
+NORMALIZED_COLUMNS = {
+    "室": "Int64",
+    "厅": "Int64",
+    "面积": "float64",  # 平方米
+    "朝向": "category",
+    "装修": "category",
+    "楼层位置": "category",
+    "总楼层": "Int64",
+    "建成年份": "Int64",
+    "建筑类型": "category",
+    "单价": "Int64",  # 元/平
+    "总价": "Int64",  # 元
+    "成交时间": "datetime64[ns]",
+}
+
+
+def _text(df: pd.DataFrame, column: str) -> pd.Series:
+    """
+    获取文本列（缺失的列和空值为空字符串）
+    """
+    if column not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[column].fillna("").astype(str)
+
+
+def _extract(text: pd.Series, pattern: str) -> pd.DataFrame:
+    """
+    按正则的命名分组提取文本，未匹配的分组为空
+
+    安装了 pyarrow 时在Arrow层用RE2整列匹配（不逐个调用Python正则），否则使用 Series.str.extract
+    """
+    if pc is None:
+        return text.str.extract(pattern).astype(pd.StringDtype())
+    matches = pc.extract_regex(pa.array(text, type=pa.string()), pattern)
+    columns = {}
+    for field, values in zip(matches.type, matches.flatten()):
+        # 未参与匹配的分组为空字符串，统一为空值
+        values = pc.if_else(pc.equal(values, ""), pa.scalar(None, pa.string()), values)
+        columns[field.name] = values.to_pandas(types_mapper={pa.string(): pd.StringDtype()}.get)
+    return pd.DataFrame(columns, index=text.index)
+
+
+def _to_int(values: pd.Series) -> pd.Series:
+    """
+    数字文本转换为可空整数
+    """
+    return pd.to_numeric(values, errors="coerce").round().astype("Int64")
+
+
+def _amount(text: pd.Series) -> pd.Series:
+    """
+    解析金额文本（支持"万"、"亿"单位）为可空整数
+    """
+    parts = _extract(text.str.replace(",", "", regex=False), AMOUNT_PATTERN)
+    number = pd.to_numeric(parts["number"], errors="coerce").astype("float64")
+    multiplier = parts["unit"].map(UNIT_MULTIPLIERS).astype("float64").fillna(1.0)
+    return _to_int(number * multiplier)
+
+
+def normalize_lianjia_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    规范化平铺后的链家成交数据
+
+    Args:
+        df: 包含 房源名称、建筑特征_装修及朝向、建筑特征_楼层及建筑类型、价格信息_单价、价格信息_总价、成交时间 列的数据，
+            缺失的列视为空
+
+    Returns:
+        pd.DataFrame: 原数据附加规范化后的列（见 NORMALIZED_COLUMNS，同名列被覆盖），无法解析的值为空
+    """
+    title = _text(df, TITLE_COLUMN)
+    house_info = _text(df, HOUSE_INFO_COLUMN)
+    position_info = _text(df, POSITION_INFO_COLUMN)
+    # 成交记录的户型和面积在标题中（"小区 3室2厅 89.5平米"），挂牌记录在houseInfo中
+    layout_text = title + " | " + house_info
+
+    result = df.copy()
+    layout = _extract(layout_text, LAYOUT_PATTERN)
+    result["室"] = _to_int(layout["rooms"])
+    result["厅"] = _to_int(layout["halls"])
+    result["面积"] = pd.to_numeric(_extract(layout_text, AREA_PATTERN)["area"], errors="coerce")
+    result["朝向"] = _extract(house_info, ORIENTATION_PATTERN)["orientation"].str.replace(r"\s+", " ", regex=True)
+    result["装修"] = _extract(house_info, DECORATION_PATTERN)["decoration"]
+    # 楼层位置、总楼层、建成年份、建筑类型一次匹配取出（"中楼层(共18层) 2005年建 板楼"，低层住宅为 "5层 2001年建 板楼"）
+    position = _extract(position_info, POSITION_PATTERN)
+    result["楼层位置"] = position["level"]
+    result["总楼层"] = _to_int(position["floors"].fillna(position["low_floors"]))
+    result["建成年份"] = _to_int(position["year"])
+    result["建筑类型"] = position["building"]
+    result["单价"] = _amount(_text(df, UNIT_PRICE_COLUMN))
+    result["总价"] = _amount(_text(df, TOTAL_PRICE_COLUMN))
+    result["成交时间"] = pd.to_datetime(
+        _text(df, DEAL_DATE_COLUMN).str.slice(0, 10).str.replace(".", "-", regex=False),
+        format="%Y-%m-%d", errors="coerce"
+    )
+    return result.astype({column: dtype for column, dtype in NORMALIZED_COLUMNS.items()})
+
+
+def normalize_lianjia_records(records: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    规范化一批链家成交记录（爬虫输出的数据项，建筑特征和价格信息为嵌套字典）
+
+    Args:
+        records: 数据项
+
+    Returns:
+        pd.DataFrame: 按列定义平铺后的数据附加规范化后的列
+    """
+    records = list(records)
+    columns = {}
+    # 按列定义逐列取值（"父字段_子字段" 取嵌套字典中的值），比逐条平铺后再构建DataFrame快
+    for column in RECORD_SCHEMAS["lianjia"]:
+        parent, _, child = column.partition("_")
+        if child:
+            columns[column] = [(record.get(parent) or {}).get(child) for record in records]
+        else:
+            columns[column] = [record.get(column) for record in records]
+    return normalize_lianjia_frame(pd.DataFrame(columns))
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Parquet落盘工具模块
+数据项按声明的列类型转换后写入Parquet：每批数据为一个行组，每个文件最多 row_groups_per_file 个行组，
+读取或导出前会先关闭当前文件，已关闭的文件都是完整可读的
+"""
+import glob
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+import pandas as pd
+from utils.record_schema import RECORD_SCHEMAS, normalize_record
+from utils.record_sink import RecordSink
+from config import Config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # 可选依赖，仅 Parquet 落盘需要
+    pa = None
+    pq = None
+
+
+def arrow_schema(schema: Dict[str, str]) -> "pa.Schema":
+    """
+    把列定义转换为Arrow表结构
+
+    Args:
+        schema: {列名: 列类型}
+
+    Returns:
+        pa.Schema: Arrow表结构
+    """
+    types = {
+        "money": pa.int64(),
+        "int": pa.int64(),
+        "timestamp": pa.timestamp("s"),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "string": pa.string(),
+    }
+    return pa.schema([(column, types[column_type]) for column, column_type in schema.items()])
+
+
+class ParquetSink(RecordSink):
+    """Parquet落盘目标（按声明的列类型写入）"""
+
+    def __init__(self, dataset: str, schema_name: str, root: str = None):
+        """
+        初始化Parquet落盘目标
+
+        Args:
+            dataset: 数据集名称
+            schema_name: 列定义名称，见 utils.record_schema.RECORD_SCHEMAS
+            root: 存储目录，默认使用配置值
+
+        Raises:
+            ImportError: 未安装 pyarrow
+        """
+        if pa is None:
+            raise ImportError("Parquet落盘需要安装 pyarrow: pip install pyarrow")
+        config = Config.PARQUET_CONFIG
+        self.dataset = dataset
+        self.schema_name = schema_name
+        self.schema = RECORD_SCHEMAS[schema_name]
+        self.arrow_schema = arrow_schema(self.schema)
+        self.directory = os.path.join(root or config["root"], dataset)
+        self.row_groups_per_file = config["row_groups_per_file"]
+        self.compression = config["compression"]
+        self._lock = threading.Lock()
+        self._writer: Optional["pq.ParquetWriter"] = None
+        self._temp_path = ""
+        self._row_groups = 0
+        self._part = 0
+        self._count = 0
+
+    def _roll(self) -> None:
+        """
+        关闭当前文件（调用方需持有锁），临时文件重命名后即为完整的Parquet文件
+        """
+        if self._writer is None:
+            return
+        self._writer.close()
+        os.replace(self._temp_path, self._temp_path[:-len(".tmp")])
+        self._writer = None
+        self._row_groups = 0
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        rows = [normalize_record(record, self.schema) for record in records]
+        table = pa.Table.from_pylist(rows, schema=self.arrow_schema)
+        with self._lock:
+            if self._writer is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._temp_path = os.path.join(self.directory, f"part-{self._part:05d}.parquet.tmp")
+                self._part += 1
+                self._writer = pq.ParquetWriter(self._temp_path, self.arrow_schema, compression=self.compression)
+            # 每批数据写为一个行组
+            self._writer.write_table(table, row_group_size=max(1, len(rows)))
+            self._row_groups += 1
+            self._count += len(rows)
+            if self._row_groups >= self.row_groups_per_file:
+                self._roll()
+
+    def parts(self) -> List[str]:
+        """
+        获取已完成的Parquet文件
+        """
+        return sorted(glob.glob(os.path.join(self.directory, "part-*.parquet")))
+
+    def read_table(self) -> "pa.Table":
+        """
+        读取已写入的全部数据
+        """
+        with self._lock:
+            self._roll()
+        parts = self.parts()
+        if not parts:
+            return self.arrow_schema.empty_table()
+        return pa.concat_tables([pq.read_table(path, schema=self.arrow_schema) for path in parts])
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            self._roll()
+        for path in self.parts():
+            for batch in pq.ParquetFile(path).iter_batches():
+                yield from batch.to_pylist()
+
+    def count(self) -> int:
+        return self._count
+
+    def export(self, filename: str) -> Optional[str]:
+        """
+        导出为单个Parquet文件，并按原文件名流式导出带类型的Excel文件（兼容分片合并和存档续传）
+        """
+        with self._lock:
+            self._roll()
+        parts = self.parts()
+        if not parts:
+            return None
+        filepath = os.path.join(Config.OUTPUT_DIR, filename)
+        # 逐个行组合并为单个文件，不一次性读入全部数据
+        with pq.ParquetWriter(os.path.splitext(filepath)[0] + ".parquet", self.arrow_schema,
+                              compression=self.compression) as writer:
+            for path in parts:
+                parquet_file = pq.ParquetFile(path)
+                for index in range(parquet_file.num_row_groups):
+                    writer.write_table(parquet_file.read_row_group(index).cast(self.arrow_schema))
+        return self.export_excel(filename)
+
+    def close(self) -> None:
+        with self._lock:
+            self._roll()
+
+
+def read_parquet_dataset(path: str) -> pd.DataFrame:
+    """
+    读取Parquet文件或Parquet数据集目录
+
+    Args:
+        path: Parquet文件或目录
+
+    Returns:
+        pd.DataFrame: 数据（分类列为 category 类型，金额为 int64，时间为 datetime64）
+    """
+    if pq is None:
+        raise ImportError("读取Parquet需要安装 pyarrow: pip install pyarrow")
+    if os.path.isdir(path):
+        parts = sorted(glob.glob(os.path.join(path, "part-*.parquet")))
+        if not parts:
+            return pd.DataFrame()
+        # 在Arrow层合并，分类列合并后仍为 category 类型
+        return pa.concat_tables([pq.read_table(part) for part in parts]).to_pandas()
+    return pq.read_table(path).to_pandas()
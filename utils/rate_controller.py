@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+请求节奏控制模块
+按主机控制请求速率：两次请求之间已经花在抓取和提取上的时间会从下一次延时中扣除，
+响应变慢或出错时自动放慢，恢复正常后逐步回到目标速率，并统计主动延时与实际工作的耗时
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlparse
+from config import Config
+
+
+class HostState:
+    """单个主机的节奏状态"""
+
+    def __init__(self, host: str, settings: Dict[str, Any]):
+        """
+        初始化主机状态
+
+        Args:
+            host: 主机名
+            settings: 该主机的节奏配置
+        """
+        self.host = host
+        self.settings = settings
+        self.interval = 1.0 / settings["requests_per_second"] if settings["requests_per_second"] > 0 else 0.0
+        self.multiplier = 1.0  # 退避倍数
+        self.last_slot: Optional[float] = None  # 上一次请求的开始时间
+        self.request_count = 0
+        self.backoff_count = 0
+
+
+class RateController:
+    """请求节奏控制器（线程安全，多个浏览器会话共用时速率为合计值）"""
+
+    def __init__(self, logger=None):
+        """
+        初始化节奏控制器
+
+        Args:
+            logger: 日志记录器，用于输出退避信息
+        """
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, HostState] = {}
+        self._local = threading.local()
+
+        self.delay_seconds = 0.0  # 主动延时耗时
+        self.work_seconds = 0.0  # 请求及提取耗时（不含其中的主动延时）
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """
+        获取URL的主机名
+        """
+        return urlparse(url).hostname or ""
+
+    def _state(self, host: str) -> HostState:
+        """
+        获取主机状态（调用方需持有锁）
+        """
+        state = self._hosts.get(host)
+        if state is None:
+            config = Config.RATE_CONTROL_CONFIG
+            settings = dict(config["default"])
+            settings.update(config["hosts"].get(host, {}))
+            state = HostState(host, settings)
+            self._hosts[host] = state
+        return state
+
+    def wait(self, host: str) -> float:
+        """
+        等待到该主机的下一个请求时间点
+
+        Args:
+            host: 主机名
+
+        Returns:
+            float: 本次主动延时的秒数
+        """
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            slot = now
+            if state.last_slot is not None:
+                jitter = state.settings["jitter"]
+                interval = state.interval * state.multiplier * random.uniform(1 - jitter, 1 + jitter)
+                slot = max(now, state.last_slot + interval)
+            state.request_count += 1
+            pause_every = state.settings["pause_every"]
+            if pause_every and state.request_count % pause_every == 0:
+                slot += random.uniform(*state.settings["pause_range"])
+            state.last_slot = slot
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+            with self._lock:
+                self.delay_seconds += delay
+            self._local.nested_delay = getattr(self._local, "nested_delay", 0.0) + delay
+        return max(delay, 0.0)
+
+    def record(self, host: str, elapsed: float, success: bool = True) -> None:
+        """
+        记录一次请求的结果，响应变慢或出错时放慢，正常时逐步恢复
+
+        Args:
+            host: 主机名
+            elapsed: 请求及提取耗时（秒）
+            success: 是否成功
+        """
+        with self._lock:
+            state = self._state(host)
+            settings = state.settings
+            if not success or elapsed > settings["slow_seconds"]:
+                state.multiplier = min(settings["max_backoff"], state.multiplier * settings["backoff_factor"])
+                state.backoff_count += 1
+                reason = "出错" if not success else f"响应缓慢({elapsed:.1f}秒)"
+                if self.logger:
+                    self.logger.warning(f"{host} {reason}，请求间隔放慢为目标值的 {state.multiplier:.1f} 倍")
+            elif state.multiplier > 1.0:
+                state.multiplier = max(1.0, state.multiplier * settings["recovery_factor"])
+
+    def record_error(self, host: str) -> None:
+        """
+        记录一次出错（例如页面缺少必需元素）
+        """
+        self.record(host, 0.0, success=False)
+
+    @contextmanager
+    def request(self, host: str, pace: bool = True) -> Iterator[None]:
+        """
+        按节奏发起一次请求：先等待时间点，再统计代码块的耗时，代码块抛出异常时按出错处理
+
+        Args:
+            host: 主机名
+            pace: 是否先等待时间点，已单独调用过 wait 时传入False（例如先打开、后提取的流水线）
+        """
+        if pace:
+            self.wait(host)
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self._local.nested_delay = 0.0
+        self._local.depth = depth + 1
+        delay_before = self._local.nested_delay
+        started = time.monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self._local.depth = depth
+            # 嵌套请求中的主动延时不算作本次请求的耗时
+            elapsed = time.monotonic() - started - (self._local.nested_delay - delay_before)
+            if depth == 0:
+                with self._lock:
+                    self.work_seconds += elapsed
+            self.record(host, elapsed, success)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取节奏统计信息
+
+        Returns:
+            Dict[str, Any]: 统计信息
+        """
+        with self._lock:
+            return {
+                "request_count": sum(state.request_count for state in self._hosts.values()),
+                "backoff_count": sum(state.backoff_count for state in self._hosts.values()),
+                "delay_seconds": round(self.delay_seconds, 1),
+                "work_seconds": round(self.work_seconds, 1),
+            }
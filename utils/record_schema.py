@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+数据项列定义模块
+为每个爬虫声明输出列及其类型，并把数据项中的文本转换为对应类型：
+金额为整数（元，支持"万"、"亿"），时间为时间戳，区域、状态等为分类，嵌套字典展开为 "父字段_子字段" 列
+"""
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, Optional
+import pandas as pd
+
+# 列类型: money 金额（int64，元）、int 整数（int64）、timestamp 时间戳、category 分类、string 文本
+RECORD_SCHEMAS: Dict[str, Dict[str, str]] = {
+    "jd_auction": {
+        "资产名称": "string",
+        "拍卖ID": "string",
+        "省份": "category",
+        "城市": "category",
+        "竞价状态": "category",
+        "结束时间": "timestamp",
+        "是否流拍": "category",
+        "流拍原因": "string",
+        "图片": "string",
+        "当前价": "money",
+        "评估价": "money",
+        "围观人数": "int",
+        "报名人数": "int",
+        "关注提醒人数": "int",
+        "成交价": "money",
+        "起拍价": "money",
+        "变卖价格": "money",
+        "加价幅度": "money",
+        "保证金": "money",
+        "竞价周期": "int",  # 天
+        "变卖周期": "int",  # 天
+        "延时周期": "int",  # 分钟
+    },
+    "lianjia": {
+        "房源名称": "string",
+        "房源链接": "string",
+        "区域": "category",
+        "所在区域": "category",  # 子区域
+        "建筑特征_装修及朝向": "string",
+        "建筑特征_楼层及建筑类型": "string",
+        "成交时间": "timestamp",
+        "价格信息_单价": "money",  # 元/平
+        "价格信息_总价": "money",
+    },
+}
+
+NUMBER_PATTERN = re.compile(r"(-?\d[\d,]*(?:\.\d+)?)\s*(亿|万)?")
+NUMBER_UNITS = {"亿": 100_000_000, "万": 10_000, None: 1}
+CHINESE_DATE_PATTERN = re.compile(r"(\d{4})年(\d{1,2})月(\d{1,2})日")
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d")
+
+
+def parse_amount(value: Any) -> Optional[int]:
+    """
+    解析金额或数量文本为整数
+
+    Args:
+        value: 原始值，如 "￥1,234,567"、"560万"、"1.2亿"、"56789元/平"、"1234人"
+
+    Returns:
+        Optional[int]: 整数（金额单位为元），无法解析时返回None
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if isinstance(value, float) and math.isnan(value) else int(round(value))
+    match = NUMBER_PATTERN.search(str(value))
+    if not match:
+        return None
+    number = float(match.group(1).replace(",", ""))
+    return int(round(number * NUMBER_UNITS[match.group(2)]))
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """
+    解析时间文本，支持 "2024-01-15 12:30:00"、"2024.01.15"、"2024年01月15日 12:30:00"
+
+    Returns:
+        Optional[datetime]: 时间，无法解析时返回None
+    """
+    if value is None or value == "":
+        return None
+    if type(value) is datetime:
+        return value
+    if isinstance(value, str):
+        value = CHINESE_DATE_PATTERN.sub(r"\1-\2-\3", value.strip())
+        # 常见格式直接解析，比 pd.to_datetime 逐个推断格式快两个数量级
+        for time_format in TIMESTAMP_FORMATS:
+            try:
+                return datetime.strptime(value, time_format)
+            except ValueError:
+                pass
+    timestamp = pd.to_datetime(value, errors="coerce")
+    return None if pd.isna(timestamp) else timestamp.to_pydatetime()
+
+
+def flatten_record(record: Dict[str, Any], separator: str = "_") -> Dict[str, Any]:
+    """
+    把嵌套字典展开为 "父字段_子字段" 形式的平铺字段
+
+    Args:
+        record: 数据项
+        separator: 父子字段之间的分隔符
+
+    Returns:
+        Dict[str, Any]: 平铺后的数据项
+    """
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            for child_key, child_value in flatten_record(value, separator).items():
+                flat[f"{key}{separator}{child_key}"] = child_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def convert_value(value: Any, column_type: str) -> Any:
+    """
+    按列类型转换单个值，空值和无法解析的值返回None
+    """
+    if column_type in ("money", "int"):
+        return parse_amount(value)
+    if column_type == "timestamp":
+        return parse_timestamp(value)
+    if value is None or (isinstance(value, float) and math.isnan(value)) or value == "":
+        return None
+    return str(value)
+
+
+def normalize_record(record: Dict[str, Any], schema: Dict[str, str]) -> Dict[str, Any]:
+    """
+    按列定义平铺并转换数据项（列定义之外的字段会被丢弃）
+
+    Args:
+        record: 数据项
+        schema: {列名: 列类型}
+
+    Returns:
+        Dict[str, Any]: 与列定义一一对应的数据项
+    """
+    flat = flatten_record(record)
+    return {column: convert_value(flat.get(column), column_type) for column, column_type in schema.items()}
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+数据落盘工具模块
+爬虫的数据项按批写入落盘目标，内存中只保留尚未写入的部分
+"""
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import pandas as pd
+from utils.excel_stream import export_records_to_excel
+from utils.record_schema import RECORD_SCHEMAS
+from utils.segment_store import SegmentStore
+from config import Config
+
+
+def export_excel(records: Callable[[], Iterable[Dict[str, Any]]], filename: str, schema_name: Optional[str]) -> str:
+    """
+    按列定义把数据项流式导出为Excel文件（平铺、按列类型写入单元格、按配置分工作表），
+    总数据文件、链家区域文件和分片合并文件都通过这里导出，格式一致
+
+    Args:
+        records: 返回数据项迭代器的函数
+        filename: 文件名（位于 Config.OUTPUT_DIR 下）
+        schema_name: 列定义名称（见 RECORD_SCHEMAS）
+
+    Returns:
+        str: 导出文件路径
+    """
+    filepath = os.path.join(Config.OUTPUT_DIR, filename)
+    export_records_to_excel(records, filepath, RECORD_SCHEMAS.get(schema_name),
+                            Config.EXCEL_EXPORT_CONFIG["sheet_by"].get(schema_name))
+    return filepath
+
+
+class RecordSink(ABC):
+    """数据落盘目标基类"""
+
+    schema_name: Optional[str] = None  # 列定义名称（见 RECORD_SCHEMAS），导出Excel时按列类型写入单元格
+
+    @abstractmethod
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        """
+        写入一批数据项
+        """
+        pass
+
+    @abstractmethod
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """
+        按写入顺序逐条读取已写入的数据项
+        """
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """
+        获取已写入的数据项数
+        """
+        pass
+
+    @abstractmethod
+    def export(self, filename: str) -> Optional[str]:
+        """
+        把已写入的数据导出为最终文件
+
+        Args:
+            filename: 文件名（位于 Config.OUTPUT_DIR 下）
+
+        Returns:
+            Optional[str]: 导出文件路径，没有数据时返回None
+        """
+        pass
+
+    def export_excel(self, filename: str) -> Optional[str]:
+        """
+        把已写入的数据流式导出为Excel文件（按配置分工作表，不会一次性载入内存）
+
+        Args:
+            filename: 文件名（位于 Config.OUTPUT_DIR 下）
+
+        Returns:
+            Optional[str]: 导出文件路径，没有数据时返回None
+        """
+        if not self.count():
+            return None
+        return export_excel(self.iter_records, filename, self.schema_name)
+
+    def contains(self, listing_id: str) -> bool:
+        """
+        检查房源是否已写入（支持按ID查询的落盘目标覆盖此方法）
+        """
+        return False
+
+    def write_asset_table(self, listing_id: str, table_name: str, df: pd.DataFrame) -> None:
+        """
+        写入房源的附表（支持附表的落盘目标覆盖此方法，默认不写入）
+
+        Args:
+            listing_id: 房源ID
+            table_name: 附表名称
+            df: 附表数据
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        关闭落盘目标（运行结束时调用）
+        """
+        pass
+
+
+class MemorySink(RecordSink):
+    """内存落盘目标（数据保留在内存中，适合数据量很小的运行）"""
+
+    def __init__(self, schema_name: Optional[str] = None):
+        self.records: List[Dict[str, Any]] = []
+        self.schema_name = schema_name
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self.records.extend(records)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self.records))
+
+    def count(self) -> int:
+        return len(self.records)
+
+    def export(self, filename: str) -> Optional[str]:
+        return self.export_excel(filename)
+
+
+class SegmentSink(RecordSink):
+    """分段存储落盘目标（每批数据写成一个JSONL分段文件）"""
+
+    def __init__(self, dataset: str, segment_store: Optional[SegmentStore] = None, schema_name: Optional[str] = None):
+        """
+        初始化分段存储落盘目标
+
+        Args:
+            dataset: 数据集名称
+            segment_store: 分段存储，默认使用配置的存储目录
+            schema_name: 列定义名称，导出Excel时使用
+        """
+        self.dataset = dataset
+        self.store = segment_store or SegmentStore()
+        self.schema_name = schema_name
+        self._count = 0
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self.store.append(self.dataset, records)
+        self._count += len(records)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        return self.store.iter_records(self.dataset)
+
+    def count(self) -> int:
+        return self._count
+
+    def export(self, filename: str) -> Optional[str]:
+        return self.export_excel(filename)
+
+
+def create_sink(spider_name: str, schema_name: Optional[str] = None) -> RecordSink:
+    """
+    按配置创建爬虫的落盘目标
+
+    Args:
+        spider_name: 爬虫名称，数据集名称为 "爬虫名称_运行时间"
+        schema_name: 列定义名称（见 RECORD_SCHEMAS），Parquet和SQLite落盘需要，导出Excel时按列类型写入单元格
+
+    Returns:
+        RecordSink: 落盘目标
+
+    Raises:
+        ValueError: 未知的落盘目标类型
+    """
+    sink_type = Config.RECORD_BUFFER_CONFIG["sink"]
+    dataset = f"{spider_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if sink_type == "segment":
+        return SegmentSink(dataset, schema_name=schema_name)
+    if sink_type == "parquet":
+        if schema_name not in RECORD_SCHEMAS:
+            raise ValueError(f"Parquet落盘需要列定义: {spider_name}")
+        # 延迟导入，未使用Parquet落盘时不需要安装 pyarrow
+        from utils.parquet_sink import ParquetSink
+        return ParquetSink(dataset, schema_name)
+    if sink_type == "sqlite":
+        if schema_name not in RECORD_SCHEMAS:
+            raise ValueError(f"SQLite落盘需要列定义: {spider_name}")
+        from utils.sqlite_store import SQLiteSink
+        return SQLiteSink(dataset, schema_name)
+    if sink_type == "memory":
+        return MemorySink(schema_name)
+    raise ValueError(f"未知的落盘目标类型: {sink_type}")
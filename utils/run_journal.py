@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+运行日志（预写日志）工具模块
+按发生顺序追加记录每个完成的数据项、每个完成的页面以及数据落盘进度，
+断点续传时只需重放这个小文件即可定位到下一页、下一条，不需要读取Excel
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+class RunJournal:
+    """运行日志（线程安全，JSONL格式，只追加）"""
+
+    def __init__(self, path: str, fsync: bool = False):
+        """
+        初始化运行日志
+
+        Args:
+            path: 日志文件路径
+            fsync: 每条记录写入后是否落盘
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file = None
+
+    def start(self, resume: bool = False, **header: Any) -> None:
+        """
+        开始记录：续传时在原日志后继续追加，否则新建日志
+
+        Args:
+            resume: 是否续传
+            **header: 写入运行开始记录的参数（如省份、城市、起始页）
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+        self._append({"type": "start", "resume": resume, **header})
+
+    def _append(self, event: Dict[str, Any]) -> None:
+        """
+        追加一条记录
+        """
+        event["time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        line = json.dumps(event, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def item_done(self, page: int, item_id: str) -> None:
+        """
+        记录完成的数据项
+        """
+        self._append({"type": "item", "page": page, "id": item_id})
+
+    def page_done(self, page: int) -> None:
+        """
+        记录完成的页面
+        """
+        self._append({"type": "page", "page": page})
+
+    def persisted(self, count: int) -> None:
+        """
+        记录又有多少条数据项已落盘（按数据项的完成顺序）
+        """
+        self._append({"type": "persisted", "count": count})
+
+    def finish(self) -> None:
+        """
+        记录运行正常结束
+        """
+        self._append({"type": "end"})
+
+    def close(self) -> None:
+        """
+        关闭日志文件
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def replay(self) -> Optional[Dict[str, Any]]:
+        """
+        重放日志，计算续传位置
+
+        完成但尚未落盘的数据项视为未完成：从第一条未落盘数据项所在页继续；
+        全部已落盘时从最后一个完成页的下一页（或最后一条数据项所在页）继续
+
+        Returns:
+            Optional[Dict[str, Any]]: {"page": 续传页码, "done_ids": 该页已完成的数据项ID,
+            "finished": 上次运行是否正常结束, "item_count": 已落盘的数据项数}，没有日志时返回None
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+
+        items: List[Tuple[int, str]] = []
+        persisted = 0
+        last_page_done = 0
+        start_page = 1
+        finished = False
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # 进程被杀时最后一行可能不完整
+                continue
+            event_type = event.get("type")
+            if event_type == "start":
+                if event.get("resume"):
+                    # 续传时上次未落盘的数据项会重新爬取，丢弃它们以保持落盘进度与数据项的对应
+                    persisted = min(persisted, len(items))
+                    if persisted < len(items):
+                        last_page_done = min(last_page_done, items[persisted][0] - 1)
+                    items = items[:persisted]
+                else:
+                    start_page = event.get("start_page") or 1
+                finished = False
+            elif event_type == "item":
+                items.append((event["page"], event["id"]))
+            elif event_type == "page":
+                last_page_done = max(last_page_done, event["page"])
+            elif event_type == "persisted":
+                persisted += event["count"]
+            elif event_type == "end":
+                finished = True
+
+        persisted = min(persisted, len(items))
+        durable = items[:persisted]
+        if persisted < len(items):
+            page = items[persisted][0]
+        elif durable:
+            page = max(last_page_done + 1, durable[-1][0])
+        else:
+            page = max(last_page_done + 1, start_page)
+
+        done_ids: Set[str] = {item_id for item_page, item_id in durable if item_page == page}
+        return {"page": page, "done_ids": done_ids, "finished": finished, "item_count": persisted}
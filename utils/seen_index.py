@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+已爬取房源索引模块
+按稳定的房源ID记录已输出的房源（SQLite），再次运行相同条件时只需扫描列表页即可跳过已知房源
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from config import Config
+
+
+class SeenIndex:
+    """已爬取房源索引（线程安全，多个分片进程可共用同一个数据库文件）"""
+
+    _instances: Dict[str, "SeenIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        """
+        初始化索引
+
+        Args:
+            path: 数据库文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 多个分片进程同时写入时等待锁释放
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "source TEXT NOT NULL, listing_id TEXT NOT NULL, first_seen TEXT NOT NULL, "
+            "PRIMARY KEY (source, listing_id))"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def shared(cls, path: str = None) -> "SeenIndex":
+        """
+        获取进程内共享的索引实例（同一路径共用一个连接）
+
+        Args:
+            path: 数据库文件路径，默认使用配置值
+        """
+        path = os.path.abspath(path or Config.SEEN_INDEX_CONFIG["path"])
+        with cls._instances_lock:
+            index = cls._instances.get(path)
+            if index is None:
+                index = cls(path)
+                cls._instances[path] = index
+            return index
+
+    def contains(self, source: str, listing_id: str) -> bool:
+        """
+        检查房源是否已爬取
+
+        Args:
+            source: 数据来源，如 "jd_auction"、"lianjia"
+            listing_id: 房源ID
+
+        Returns:
+            bool: 已爬取时返回True
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM seen WHERE source = ? AND listing_id = ?", (source, listing_id)
+            ).fetchone()
+        return row is not None
+
+    def add_many(self, source: str, listing_ids: Iterable[str]) -> int:
+        """
+        批量记录已爬取的房源
+
+        Args:
+            source: 数据来源
+            listing_ids: 房源ID
+
+        Returns:
+            int: 新增的记录数
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [(source, listing_id, now) for listing_id in listing_ids if listing_id]
+        if not rows:
+            return 0
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO seen VALUES (?, ?, ?)", rows)
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def count(self, source: Optional[str] = None) -> int:
+        """
+        获取已记录的房源数
+
+        Args:
+            source: 数据来源，为None时统计所有来源
+        """
+        with self._lock:
+            if source is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()
+            else:
+                row = self._conn.execute("SELECT COUNT(*) FROM seen WHERE source = ?", (source,)).fetchone()
+        return row[0]
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+分段存储工具模块
+每次追加把一批记录写成一个不可变的JSONL分段文件（写入后fsync再原子重命名），追加耗时与已有数据量无关；
+需要最终文件时再通过合并/导出步骤生成 xlsx/csv/parquet
+"""
+import glob
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Set
+import pandas as pd
+from utils.excel_stream import export_records_to_excel
+from config import Config
+
+SEGMENT_SUFFIX = ".jsonl"
+# 合并标记文件：与合并分段同名加此后缀，记录合并分段替换的原分段
+COMPACT_MARKER_SUFFIX = ".replaces"
+
+
+def _encode(value: Any) -> Any:
+    """
+    JSON无法直接表示的值：日期时间保存为带标记的ISO字符串，读取时还原
+    """
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (datetime, date)):
+        return {"__datetime__": value.isoformat()}
+    if hasattr(value, "item"):
+        # numpy 数值
+        return value.item()
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    """
+    还原带标记的日期时间
+    """
+    if len(obj) == 1 and "__datetime__" in obj:
+        return pd.Timestamp(obj["__datetime__"])
+    return obj
+
+
+class SegmentStore:
+    """分段存储（线程安全，每个数据集一个目录）"""
+
+    def __init__(self, root: str = None):
+        """
+        初始化分段存储
+
+        Args:
+            root: 存储目录，默认使用配置值
+        """
+        self.root = root or Config.SEGMENT_STORE_CONFIG["root"]
+        self.fsync = Config.SEGMENT_STORE_CONFIG["fsync"]
+        self._lock = threading.Lock()
+        self._sequence = 0
+
+    def dataset_dir(self, dataset: str) -> str:
+        """
+        获取数据集目录
+        """
+        return os.path.join(self.root, dataset)
+
+    def segments(self, dataset: str) -> List[str]:
+        """
+        获取数据集的分段文件（按写入顺序），已被合并分段替换的原分段不会返回
+
+        Args:
+            dataset: 数据集名称
+
+        Returns:
+            List[str]: 分段文件路径
+        """
+        directory = self.dataset_dir(dataset)
+        superseded = self._finish_compactions(directory)
+        return sorted(
+            path for path in glob.glob(os.path.join(directory, f"*{SEGMENT_SUFFIX}"))
+            if os.path.basename(path) not in superseded
+        )
+
+    def _finish_compactions(self, directory: str, discard_unfinished: bool = False) -> Set[str]:
+        """
+        清理合并中断留下的文件：合并分段已就位时删除它替换的原分段和标记文件；
+        合并分段尚未就位时原分段仍然有效，标记文件属于进行中或已中断的合并
+
+        Args:
+            directory: 数据集目录
+            discard_unfinished: 是否删除合并分段尚未就位的标记文件和临时文件（仅在开始新的合并前使用）
+
+        Returns:
+            Set[str]: 已被替换的原分段文件名
+        """
+        superseded: Set[str] = set()
+        for marker_path in glob.glob(os.path.join(directory, f"*{COMPACT_MARKER_SUFFIX}")):
+            merged_path = marker_path[:-len(COMPACT_MARKER_SUFFIX)]
+            try:
+                if not os.path.exists(merged_path):
+                    if discard_unfinished:
+                        for path in (f"{merged_path}.tmp", marker_path):
+                            if os.path.exists(path):
+                                os.remove(path)
+                    continue
+                with open(marker_path, "r", encoding="utf-8") as f:
+                    names = json.loads(f.readline())["replaces"]
+            except FileNotFoundError:
+                # 其他线程或进程已清理
+                continue
+            superseded.update(names)
+            try:
+                for name in names:
+                    path = os.path.join(directory, name)
+                    if os.path.exists(path):
+                        os.remove(path)
+                os.remove(marker_path)
+            except OSError:
+                # 删除失败时保留标记，读取时仍会跳过这些原分段
+                pass
+        return superseded
+
+    def _next_name(self) -> str:
+        """
+        生成分段文件名：时间戳 + 进程号 + 序号，按文件名排序即为写入顺序
+        """
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        return f"{time.time_ns():020d}-{os.getpid()}-{sequence:06d}{SEGMENT_SUFFIX}"
+
+    def _write_segment(self, directory: str, name: str, records: List[Dict[str, Any]]) -> str:
+        """
+        写入分段文件：先写临时文件并fsync，再原子重命名
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, name)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, default=_encode))
+                f.write("\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        if self.fsync and hasattr(os, "O_DIRECTORY"):
+            # 同步目录项，保证重命名落盘
+            dir_fd = os.open(directory, os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        return path
+
+    def append(self, dataset: str, records: List[Dict[str, Any]]) -> str:
+        """
+        追加一批记录
+
+        Args:
+            dataset: 数据集名称
+            records: 记录列表
+
+        Returns:
+            str: 分段文件路径，没有记录时返回空字符串
+        """
+        if not records:
+            return ""
+        return self._write_segment(self.dataset_dir(dataset), self._next_name(), records)
+
+    def iter_records(self, dataset: str) -> Iterator[Dict[str, Any]]:
+        """
+        按写入顺序逐条读取记录
+
+        Args:
+            dataset: 数据集名称
+
+        Returns:
+            Iterator[Dict[str, Any]]: 记录迭代器
+        """
+        for path in self.segments(dataset):
+            yield from self._read_segment(path)
+
+    @staticmethod
+    def _read_segment(path: str) -> Iterator[Dict[str, Any]]:
+        """
+        逐条读取一个分段文件的记录
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line, object_hook=_decode)
+
+    def count(self, dataset: str) -> int:
+        """
+        获取数据集的记录数
+        """
+        total = 0
+        for path in self.segments(dataset):
+            with open(path, "r", encoding="utf-8") as f:
+                total += sum(1 for line in f if line.strip())
+        return total
+
+    def compact(self, dataset: str) -> int:
+        """
+        把数据集的所有分段合并为一个分段，减少文件数
+
+        合并结果以最后一个被合并分段的文件名为前缀，排在之后新写入的分段之前；
+        合并分段就位前先写入标记文件记录它替换的原分段，删除原分段前中断时，读取时会跳过并清理这些原分段
+
+        Args:
+            dataset: 数据集名称
+
+        Returns:
+            int: 被合并的分段数
+        """
+        directory = self.dataset_dir(dataset)
+        self._finish_compactions(directory, discard_unfinished=True)
+        paths = self.segments(dataset)
+        if len(paths) < 2:
+            return 0
+        # 只合并此刻的分段，合并期间新写入的分段保持不动
+        records = [record for path in paths for record in self._read_segment(path)]
+        name = os.path.basename(paths[-1])[:-len(SEGMENT_SUFFIX)] + f"-c{SEGMENT_SUFFIX}"
+        # 标记文件先于合并分段落盘；合并分段先写临时文件再原子重命名
+        self._write_segment(directory, name + COMPACT_MARKER_SUFFIX,
+                            [{"replaces": [os.path.basename(path) for path in paths]}])
+        self._write_segment(directory, name, records)
+        self._finish_compactions(directory)
+        return len(paths)
+
+    def to_dataframe(self, dataset: str) -> pd.DataFrame:
+        """
+        读取数据集为DataFrame
+        """
+        return pd.DataFrame(list(self.iter_records(dataset)))
+
+    def export(self, dataset: str, filepath: str, sheet_name: str = "Sheet1") -> str:
+        """
+        导出数据集，按扩展名选择格式（.xlsx、.csv、.parquet）
+
+        Args:
+            dataset: 数据集名称
+            filepath: 导出文件路径
+            sheet_name: 工作表名称（仅xlsx）
+
+        Returns:
+            str: 导出文件路径
+
+        Raises:
+            ValueError: 不支持的文件格式
+        """
+        extension = os.path.splitext(filepath)[1].lower()
+        if extension == ".xlsx":
+            # 流式写入，不构建DataFrame
+            export_records_to_excel(lambda: self.iter_records(dataset), filepath, sheet_name=sheet_name)
+            return filepath
+        df = self.to_dataframe(dataset)
+        if extension == ".csv":
+            df.to_csv(filepath, index=False, encoding="utf-8-sig")
+        elif extension == ".parquet":
+            # 嵌套字典列转为JSON文本，避免不同记录结构不一致
+            for column in df.columns:
+                if df[column].map(lambda value: isinstance(value, (dict, list))).any():
+                    df[column] = df[column].map(
+                        lambda value: json.dumps(value, ensure_ascii=False) if isinstance(value, (dict, list)) else value
+                    )
+            df.to_parquet(filepath, index=False)
+        else:
+            raise ValueError(f"不支持的导出格式: {extension}")
+        return filepath
+
+    def clear(self, dataset: str) -> None:
+        """
+        删除数据集的所有分段
+        """
+        for path in self.segments(dataset):
+            os.remove(path)
+        for path in glob.glob(os.path.join(self.dataset_dir(dataset), f"*{COMPACT_MARKER_SUFFIX}")):
+            os.remove(path)
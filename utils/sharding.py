@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+分片工具模块
+把工作计划（链家子区域、京东省份/城市）拆分到多个进程，并在所有分片结束后合并输出文件
+"""
+import glob
+import os
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from utils.record_sink import export_excel
+from config import Config
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    解析分片参数
+
+    Args:
+        shard: 分片参数，格式为 "i/N"，i 从1开始
+
+    Returns:
+        Tuple[int, int]: (分片序号, 分片总数)
+
+    Raises:
+        ValueError: 格式错误或序号超出范围
+    """
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"分片参数格式错误: {shard}，正确格式示例: '1/4'")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"分片序号超出范围: {shard}，序号应在 1 到 {count} 之间")
+    return index, count
+
+
+def shard_label(index: int, count: int) -> str:
+    """
+    获取分片标签，用于区分各分片的日志和输出文件名
+    """
+    return f"shard{index}of{count}"
+
+
+def select_shard(plan: List, index: int, count: int) -> List:
+    """
+    按轮转方式选出分片负责的工作单元，使各分片的工作量大致相同
+
+    Args:
+        plan: 完整的工作计划
+        index: 分片序号（从1开始）
+        count: 分片总数
+
+    Returns:
+        List: 分片负责的工作单元
+    """
+    return plan[index - 1::count]
+
+
+def build_lianjia_plan(districts: List[str] = None) -> List[Tuple[str, str]]:
+    """
+    构建链家工作计划
+
+    Args:
+        districts: 要爬取的区域列表，如果为None则包含所有区域
+
+    Returns:
+        List[Tuple[str, str]]: [(区域, 子区域)]
+    """
+    districts = districts or list(Config.SHENZHEN_DISTRICTS.keys())
+    return [
+        (district, sub_district)
+        for district in districts
+        for sub_district in Config.SHENZHEN_DISTRICTS.get(district, [])
+    ]
+
+
+def build_jd_plan(province: str = None, city: str = None) -> List[Tuple[str, Optional[str]]]:
+    """
+    构建京东法拍工作计划
+
+    Args:
+        province: 只包含该省份，如果为None则包含所有省份
+        city: 只包含该城市
+
+    Returns:
+        List[Tuple[str, Optional[str]]]: [(省份, 城市)]，仅支持省份级别的省份城市为None
+    """
+    plan = []
+    for plan_province, cities in Config.JD_AUCTION_CONFIG["province_city_mapping"].items():
+        if province and plan_province != province:
+            continue
+        for plan_city in cities or [None]:
+            if city and plan_city != city:
+                continue
+            plan.append((plan_province, plan_city))
+    return plan
+
+
+def group_lianjia_units(units: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """
+    把链家工作单元按区域分组（保持计划顺序）
+
+    Returns:
+        Dict[str, List[str]]: {区域: [子区域]}
+    """
+    grouped: Dict[str, List[str]] = {}
+    for district, sub_district in units:
+        grouped.setdefault(district, []).append(sub_district)
+    return grouped
+
+
+def jd_unit_label(province: str, city: Optional[str]) -> str:
+    """
+    获取京东工作单元的标签，用于区分各单元的日志和输出文件名
+    """
+    return f"{province}_{city}" if city else province
+
+
+def _read_frames(paths: List[str]) -> List[pd.DataFrame]:
+    """
+    读取存在的Excel文件（导出文件可能按省份/区域分为多个工作表，全部读取）
+    """
+    frames = []
+    for path in paths:
+        if os.path.exists(path):
+            frames.extend(pd.read_excel(path, sheet_name=None).values())
+    return frames
+
+
+def _write_frame(df: pd.DataFrame, filename: str, schema_name: str) -> str:
+    """
+    覆盖写入合并结果（与单进程运行的导出文件格式相同：按列定义写入单元格、按配置分工作表）
+    """
+    return export_excel(lambda: df.to_dict("records"), filename, schema_name)
+
+
+def merge_lianjia_shards(count: int, districts: List[str] = None) -> List[str]:
+    """
+    合并链家各分片的区域文件，生成与单进程运行相同的区域文件和总数据文件
+
+    Args:
+        count: 分片总数
+        districts: 要合并的区域列表，如果为None则包含所有区域
+
+    Returns:
+        List[str]: 生成的文件路径
+    """
+    districts = districts or list(Config.SHENZHEN_DISTRICTS.keys())
+    pattern = os.path.join(Config.OUTPUT_DIR, "链家二手房_shard*of{count}_{district}.xlsx")
+    written = []
+    district_frames = []
+
+    for district in districts:
+        frames = _read_frames(sorted(glob.glob(pattern.format(count=count, district=district))))
+        if not frames:
+            continue
+        df = pd.concat(frames, ignore_index=True)
+        df["区域"] = district
+        # 分片按轮转方式领取子区域，这里恢复子区域在配置中的顺序（稳定排序保持页内顺序）
+        order = {name: i for i, name in enumerate(Config.SHENZHEN_DISTRICTS.get(district, []))}
+        df = df.sort_values("所在区域", key=lambda col: col.map(order), kind="stable", ignore_index=True)
+        written.append(_write_frame(df, f"链家二手房_{district}.xlsx", "lianjia"))
+        district_frames.append(df)
+
+    if district_frames:
+        written.append(_write_frame(pd.concat(district_frames, ignore_index=True), "链家二手房_数据.xlsx", "lianjia"))
+    return written
+
+
+def merge_jd_units(plan: List[Tuple[str, Optional[str]]]) -> List[str]:
+    """
+    按工作计划顺序合并京东各省份/城市的数据文件，生成与单进程运行相同的总数据文件
+
+    Args:
+        plan: 完整的工作计划
+
+    Returns:
+        List[str]: 生成的文件路径
+    """
+    paths = [
+        os.path.join(Config.OUTPUT_DIR, f"京东法拍房_{jd_unit_label(province, city)}_数据.xlsx")
+        for province, city in plan
+    ]
+    frames = _read_frames(paths)
+    if not frames:
+        return []
+    return [_write_frame(pd.concat(frames, ignore_index=True), "京东法拍房_数据.xlsx", "jd_auction")]
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite存储模块
+把京东法拍数据项、出价记录、调查表等附表以及链家成交数据写入本地SQLite数据库（WAL模式）：
+数据项按稳定ID批量更新写入（一批一个事务），结束时间、区域、成交时间等常用查询列建有索引，
+重复检查、续传定位和临时查询都走索引，不需要扫描Excel文件
+"""
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+import pandas as pd
+from utils.record_schema import RECORD_SCHEMAS, normalize_record, parse_amount, parse_timestamp
+from utils.record_sink import RecordSink
+from config import Config
+
+# 每个列定义对应的数据表: table 表名、key 稳定ID列、fallback_key 没有ID时用于拼接ID的列、indexes 索引列
+RECORD_TABLES: Dict[str, Dict[str, Any]] = {
+    "jd_auction": {
+        "table": "jd_auctions",
+        "key": "拍卖ID",
+        "fallback_key": ["资产名称", "结束时间"],
+        "indexes": [["结束时间"], ["省份", "城市", "结束时间"]],
+    },
+    "lianjia": {
+        "table": "lianjia_deals",
+        "key": "房源链接",
+        "fallback_key": ["房源名称", "成交时间", "价格信息_总价"],
+        "indexes": [["所在区域", "成交时间"], ["成交时间"]],
+    },
+}
+
+# 列类型对应的SQLite类型（时间存为 "YYYY-MM-DD HH:MM:SS" 文本，可按字符串排序和比较）
+COLUMN_TYPES = {"money": "INTEGER", "int": "INTEGER", "timestamp": "TEXT", "category": "TEXT", "string": "TEXT"}
+
+BID_TABLE = "出价记录"  # 写入 jd_bids 表的附表名称，其余附表写入 jd_asset_tables 表
+
+
+def quote(name: str) -> str:
+    """
+    给列名或表名加引号
+    """
+    return '"' + name.replace('"', '""') + '"'
+
+
+def to_sql_value(value: Any) -> Any:
+    """
+    把Python值转换为SQLite可存储的值
+    """
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+class SQLiteStore:
+    """SQLite存储（线程安全，多个分片进程可共用同一个数据库文件）"""
+
+    _instances: Dict[str, "SQLiteStore"] = {}
+    _instances_lock = threading.Lock()
+    READ_BATCH = 1000  # 逐条读取时每次查询的行数
+
+    def __init__(self, path: str):
+        """
+        初始化数据库，创建附表和出价记录表
+
+        Args:
+            path: 数据库文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._ready_tables = set()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 多个分片进程同时写入时等待锁释放
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS jd_bids ("
+            "拍卖ID TEXT NOT NULL, 序号 INTEGER NOT NULL, 状态 TEXT, 价格 INTEGER, 竞拍人 TEXT, 时间 TEXT, "
+            "PRIMARY KEY (拍卖ID, 序号));"
+            "CREATE INDEX IF NOT EXISTS idx_jd_bids_时间 ON jd_bids (时间);"
+            "CREATE TABLE IF NOT EXISTS jd_asset_tables ("
+            "拍卖ID TEXT NOT NULL, 表名 TEXT NOT NULL, 行号 INTEGER NOT NULL, 数据 TEXT NOT NULL, "
+            "PRIMARY KEY (拍卖ID, 表名, 行号));"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def shared(cls, path: str = None) -> "SQLiteStore":
+        """
+        获取进程内共享的存储实例（同一路径共用一个连接）
+
+        Args:
+            path: 数据库文件路径，默认使用配置值
+        """
+        path = os.path.abspath(path or Config.SQLITE_CONFIG["path"])
+        with cls._instances_lock:
+            store = cls._instances.get(path)
+            if store is None:
+                store = cls(path)
+                cls._instances[path] = store
+            return store
+
+    def ensure_table(self, schema_name: str) -> str:
+        """
+        按列定义创建数据表和索引（已存在时跳过）
+
+        Args:
+            schema_name: 列定义名称（见 RECORD_TABLES）
+
+        Returns:
+            str: 表名
+        """
+        spec = RECORD_TABLES[schema_name]
+        table = spec["table"]
+        if table in self._ready_tables:
+            return table
+        columns = ", ".join(
+            f"{quote(column)} {COLUMN_TYPES[column_type]}" for column, column_type in RECORD_SCHEMAS[schema_name].items()
+        )
+        statements = [
+            f"CREATE TABLE IF NOT EXISTS {table} (record_id TEXT PRIMARY KEY, {columns}, "
+            f"run_id TEXT NOT NULL, run_seq INTEGER NOT NULL, updated_at TEXT NOT NULL)",
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_run ON {table} (run_id, run_seq)",
+        ]
+        for index_columns in spec["indexes"]:
+            name = f"idx_{table}_" + "_".join(index_columns)
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {quote(name)} ON {table} ({', '.join(quote(c) for c in index_columns)})"
+            )
+        with self._lock:
+            self._conn.execute(statements[0])
+            # 之前版本创建的表缺少新增的列时补上（已有记录的新列为空）
+            existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in RECORD_SCHEMAS[schema_name].items():
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {quote(column)} {COLUMN_TYPES[column_type]}")
+            for statement in statements[1:]:
+                self._conn.execute(statement)
+            self._conn.commit()
+            self._ready_tables.add(table)
+        return table
+
+    @staticmethod
+    def record_id(row: Dict[str, Any], schema_name: str) -> str:
+        """
+        获取数据项的稳定ID，没有ID列的值时用备用列拼接
+
+        Args:
+            row: 按列定义转换后的数据项
+            schema_name: 列定义名称
+        """
+        spec = RECORD_TABLES[schema_name]
+        if row.get(spec["key"]):
+            return str(row[spec["key"]])
+        return "|".join(str(to_sql_value(row.get(column)) or "") for column in spec["fallback_key"])
+
+    def upsert(self, schema_name: str, records: List[Dict[str, Any]], run_id: str) -> int:
+        """
+        在一个事务中批量写入数据项，ID已存在的记录更新为新值
+
+        新记录的序号接在本次运行已有记录之后；同一次运行中重复写入的记录（如同时属于两个区域的子区域中的房源）
+        保留原来的序号，因此本次运行的序号从0开始连续，与记录数一致
+
+        Args:
+            schema_name: 列定义名称
+            records: 数据项（按列定义转换并平铺）
+            run_id: 运行ID（数据集名称）
+
+        Returns:
+            int: 写入的数据项数（含更新的记录）
+        """
+        if not records:
+            return 0
+        table = self.ensure_table(schema_name)
+        schema = RECORD_SCHEMAS[schema_name]
+        columns = ["record_id", *schema, "run_id", "run_seq", "updated_at"]
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        for record in records:
+            row = normalize_record(record, schema)
+            rows.append([self.record_id(row, schema_name), *(to_sql_value(row[c]) for c in schema), run_id, run_id, now])
+        updates = ", ".join(f"{quote(c)} = excluded.{quote(c)}" for c in schema)
+        # 序号按 (run_id, run_seq) 索引取本次运行的最大序号加一；更新时等号右侧取的都是原记录的值
+        sql = (
+            f"INSERT INTO {table} ({', '.join(quote(c) for c in columns)}) "
+            f"VALUES ({', '.join('?' * (len(columns) - 2))}, "
+            f"(SELECT COALESCE(MAX(run_seq) + 1, 0) FROM {table} WHERE run_id = ?), ?) "
+            f"ON CONFLICT(record_id) DO UPDATE SET {updates}, "
+            f"run_seq = CASE WHEN run_id = excluded.run_id THEN run_seq ELSE excluded.run_seq END, "
+            f"run_id = excluded.run_id, updated_at = excluded.updated_at"
+        )
+        with self._lock, self._conn:
+            self._conn.executemany(sql, rows)
+        return len(rows)
+
+    def contains(self, schema_name: str, record_id: str) -> bool:
+        """
+        检查数据项是否已写入（主键查询）
+        """
+        table = self.ensure_table(schema_name)
+        with self._lock:
+            row = self._conn.execute(f"SELECT 1 FROM {table} WHERE record_id = ?", (record_id,)).fetchone()
+        return row is not None
+
+    def count_run(self, schema_name: str, run_id: str) -> int:
+        """
+        获取某次运行写入的记录数（同一ID重复写入只计一次，后续运行更新过的记录除外）
+        """
+        table = self.ensure_table(schema_name)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {table} WHERE run_id = ?", (run_id,)).fetchone()[0]
+
+    def iter_run(self, schema_name: str, run_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        按写入顺序逐条读取某次运行写入的数据项（后续运行更新过的记录除外）
+
+        Args:
+            schema_name: 列定义名称
+            run_id: 运行ID
+        """
+        table = self.ensure_table(schema_name)
+        columns = list(RECORD_SCHEMAS[schema_name])
+        sql = (f"SELECT run_seq, {', '.join(quote(c) for c in columns)} FROM {table} "
+               f"WHERE run_id = ? AND run_seq > ? ORDER BY run_seq LIMIT ?")
+        last_seq = -1
+        while True:
+            # 按序号分批读取，不会一次性载入内存，读取期间也不长时间占用连接
+            with self._lock:
+                rows = self._conn.execute(sql, (run_id, last_seq, self.READ_BATCH)).fetchall()
+            for row in rows:
+                yield dict(zip(columns, row[1:]))
+            if len(rows) < self.READ_BATCH:
+                return
+            last_seq = rows[-1][0]
+
+    def latest_record(self, schema_name: str, run_prefix: str, **filters: Any) -> Optional[Dict[str, Any]]:
+        """
+        获取之前的运行最后写入的数据项（用于续传定位）
+
+        Args:
+            schema_name: 列定义名称
+            run_prefix: 运行ID前缀（爬虫名称），运行ID按时间排序
+            **filters: 列值过滤条件，如 省份="广东"
+
+        Returns:
+            Optional[Dict[str, Any]]: 数据项，没有记录时返回None
+        """
+        table = self.ensure_table(schema_name)
+        columns = list(RECORD_SCHEMAS[schema_name])
+        conditions = ["run_id LIKE ? ESCAPE '\\'"]
+        params: List[Any] = [run_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "\\_%"]
+        for column, value in filters.items():
+            conditions.append(f"{quote(column)} IS ?")
+            params.append(value)
+        sql = (f"SELECT {', '.join(quote(c) for c in columns)} FROM {table} "
+               f"WHERE {' AND '.join(conditions)} ORDER BY run_id DESC, run_seq DESC LIMIT 1")
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return dict(zip(columns, row)) if row else None
+
+    def write_asset_table(self, auction_id: str, table_name: str, df: pd.DataFrame) -> int:
+        """
+        在一个事务中替换某个拍卖项的附表（出价记录写入 jd_bids 表，其余写入 jd_asset_tables 表）
+
+        Args:
+            auction_id: 拍卖ID
+            table_name: 附表名称，如 "出价记录"、"拍卖标的物调查情况表（房产）"
+            df: 附表数据
+
+        Returns:
+            int: 写入的行数
+        """
+        records = json.loads(df.to_json(orient="records", force_ascii=False))
+        with self._lock, self._conn:
+            if table_name == BID_TABLE:
+                rows = [
+                    (auction_id, seq, record.get("状态"), parse_amount(record.get("价格")), record.get("竞拍人"),
+                     to_sql_value(parse_timestamp(record.get("时间"))))
+                    for seq, record in enumerate(records)
+                ]
+                self._conn.execute("DELETE FROM jd_bids WHERE 拍卖ID = ?", (auction_id,))
+                self._conn.executemany("INSERT INTO jd_bids VALUES (?, ?, ?, ?, ?, ?)", rows)
+            else:
+                rows = [(auction_id, table_name, seq, json.dumps(record, ensure_ascii=False))
+                        for seq, record in enumerate(records)]
+                self._conn.execute("DELETE FROM jd_asset_tables WHERE 拍卖ID = ? AND 表名 = ?", (auction_id, table_name))
+                self._conn.executemany("INSERT INTO jd_asset_tables VALUES (?, ?, ?, ?)", rows)
+        return len(records)
+
+    def query(self, sql: str, params: Any = ()) -> pd.DataFrame:
+        """
+        执行查询并返回DataFrame（用于临时查询）
+
+        Args:
+            sql: 查询语句
+            params: 查询参数
+
+        Returns:
+            pd.DataFrame: 查询结果
+        """
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+
+class SQLiteSink(RecordSink):
+    """SQLite落盘目标（按稳定ID更新写入，跨运行保留）"""
+
+    def __init__(self, dataset: str, schema_name: str, store: Optional[SQLiteStore] = None):
+        """
+        初始化SQLite落盘目标
+
+        Args:
+            dataset: 数据集名称，作为运行ID
+            schema_name: 列定义名称（见 RECORD_TABLES）
+            store: SQLite存储，默认使用配置的数据库文件
+        """
+        self.dataset = dataset
+        self.schema_name = schema_name
+        self.store = store or SQLiteStore.shared()
+        self.store.ensure_table(schema_name)
+
+    def write(self, records: List[Dict[str, Any]]) -> None:
+        self.store.upsert(self.schema_name, records, self.dataset)
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        return self.store.iter_run(self.schema_name, self.dataset)
+
+    def count(self) -> int:
+        return self.store.count_run(self.schema_name, self.dataset)
+
+    def export(self, filename: str) -> Optional[str]:
+        return self.export_excel(filename)
+
+    def contains(self, listing_id: str) -> bool:
+        return self.store.contains(self.schema_name, listing_id)
+
+    def write_asset_table(self, listing_id: str, table_name: str, df: pd.DataFrame) -> None:
+        self.store.write_asset_table(listing_id, table_name, df)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+日期水位工具模块
+记录每个子区域上次爬取到的最新成交日期，增量爬取时翻到比它更旧的数据即可停止；
+水位保存在SQLite中，多个分片进程同时更新不同子区域时不会互相覆盖
+"""
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+
+class WatermarkStore:
+    """日期水位存储（线程安全，多个分片进程可共用同一个数据库文件）"""
+
+    def __init__(self, path: str):
+        """
+        初始化水位存储
+
+        Args:
+            path: 水位数据库文件路径
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 多个分片进程同时写入时等待锁释放
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS watermarks (key TEXT PRIMARY KEY, date TEXT NOT NULL)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        获取水位
+
+        Args:
+            key: 水位键，如 "区域/子区域"
+
+        Returns:
+            Optional[str]: 最新成交日期（YYYY-MM-DD），没有记录时返回None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT date FROM watermarks WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def update(self, key: str, date: str) -> None:
+        """
+        更新水位（只会前移，不会后退），在一条语句中比较并写入，不受其他进程的并发更新影响
+
+        Args:
+            key: 水位键
+            date: 成交日期（YYYY-MM-DD）
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO watermarks VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET date = excluded.date WHERE excluded.date > watermarks.date",
+                (key, date)
+            )
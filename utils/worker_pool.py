@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+浏览器工作池模块
+启动多个浏览器会话（每个使用独立的用户数据目录），从共享队列中领取工作单元
+"""
+import os
+import queue
+import threading
+from typing import Any, Callable, Dict, List
+from selenium import webdriver
+from utils.browser import BrowserManager
+from utils.element_lookup import ElementLookup
+
+
+class BrowserWorker:
+    """工作池中的一个浏览器会话"""
+
+    def __init__(self, worker_id: int, driver: webdriver.Chrome):
+        """
+        初始化工作者
+
+        Args:
+            worker_id: 工作者编号
+            driver: 浏览器驱动
+        """
+        self.worker_id = worker_id
+        self.driver = driver
+        self.lookup = ElementLookup(driver)
+
+
+class BrowserWorkerPool:
+    """浏览器工作池"""
+
+    def __init__(self, worker_count: int, profile_root: str, logger, spider_config: Dict[str, Any] = None):
+        """
+        初始化工作池
+
+        Args:
+            worker_count: 浏览器会话数
+            profile_root: 用户数据目录的根目录，每个会话使用其中的 worker_<编号> 子目录
+            logger: 日志记录器
+            spider_config: 爬虫配置，用于选择浏览器模式（normal/lean）
+        """
+        self.worker_count = worker_count
+        self.profile_root = profile_root
+        self.logger = logger
+        self.spider_config = spider_config
+        self.workers: List[BrowserWorker] = []
+        self.units: "queue.Queue[Any]" = queue.Queue()
+
+    def start(self) -> None:
+        """
+        启动所有浏览器会话
+        """
+        for worker_id in range(self.worker_count):
+            profile_dir = os.path.join(self.profile_root, f"worker_{worker_id}")
+            driver = BrowserManager.create_user_data_driver(
+                user_data_dir=profile_dir, profile_name="", spider_config=self.spider_config
+            )
+            self.workers.append(BrowserWorker(worker_id, driver))
+            self.logger.info(f"工作浏览器 {worker_id} 已启动，用户数据目录: {profile_dir}")
+
+    def submit(self, unit: Any) -> None:
+        """
+        添加工作单元（工作单元处理过程中也可以继续添加）
+
+        Args:
+            unit: 工作单元
+        """
+        self.units.put(unit)
+
+    def run(self, handler: Callable[[BrowserWorker, Any], None]) -> None:
+        """
+        处理队列中的所有工作单元，直到队列清空且没有正在处理的单元
+
+        Args:
+            handler: 工作单元处理函数 handler(worker, unit)
+        """
+        stop_event = threading.Event()
+
+        def _worker_loop(worker: BrowserWorker) -> None:
+            while not stop_event.is_set():
+                try:
+                    unit = self.units.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                try:
+                    handler(worker, unit)
+                except Exception as e:
+                    self.logger.error(f"工作浏览器 {worker.worker_id} 处理 {unit} 时出错: {e}")
+                finally:
+                    self.units.task_done()
+
+        threads = [
+            threading.Thread(target=_worker_loop, args=(worker,), name=f"browser-worker-{worker.worker_id}", daemon=True)
+            for worker in self.workers
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            self.units.join()
+        finally:
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
+    def close(self) -> None:
+        """
+        关闭所有浏览器会话
+        """
+        for worker in self.workers:
+            stats = worker.lookup.get_stats()
+            self.logger.info(
+                f"工作浏览器 {worker.worker_id}: 元素查找 {stats['lookup_count']} 次，"
+                f"等待缺失元素耗时 {stats['missing_wait_seconds']} 秒"
+            )
+            BrowserManager.close_driver(worker.driver)
+        self.workers = []
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+后台写入工具模块
+所有写盘操作由后台线程执行，爬取流程只负责提交写入任务；
+队列写满时提交会阻塞（反压），同一个键的任务由同一个线程按提交顺序执行
+"""
+import queue
+import threading
+import zlib
+from typing import Any, Callable, List, Optional
+import pandas as pd
+from config import Config
+
+_STOP = object()  # 线程退出标记
+
+
+class WriterService:
+    """后台写入服务"""
+
+    def __init__(self, workers: int = None, queue_size: int = None, logger=None):
+        """
+        初始化后台写入服务
+
+        Args:
+            workers: 写入线程数
+            queue_size: 每个写入线程的队列长度
+            logger: 日志记录器，用于输出写入失败信息
+        """
+        config = Config.WRITER_CONFIG
+        self.workers = max(1, workers or config["workers"])
+        self.queue_size = queue_size or config["queue_size"]
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._queues: List[queue.Queue] = [queue.Queue(maxsize=self.queue_size) for _ in range(self.workers)]
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+
+        self.written_count = 0
+        self.failed_count = 0
+
+        for index, task_queue in enumerate(self._queues):
+            thread = threading.Thread(target=self._worker, args=(task_queue,), name=f"writer-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self, task_queue: queue.Queue) -> None:
+        """
+        写入线程：依次执行队列中的任务
+        """
+        while True:
+            task = task_queue.get()
+            try:
+                if task is _STOP:
+                    return
+                description, func, args, kwargs = task
+                try:
+                    func(*args, **kwargs)
+                    with self._lock:
+                        self.written_count += 1
+                except Exception as e:
+                    with self._lock:
+                        self.failed_count += 1
+                    if self.logger:
+                        self.logger.error(f"后台写入失败 {description}: {e}")
+            finally:
+                task_queue.task_done()
+
+    def submit(self, key: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """
+        提交写入任务，队列已满时阻塞等待
+
+        Args:
+            key: 任务键（通常为文件路径），相同键的任务按提交顺序执行
+            func: 写入函数
+            *args: 写入函数的位置参数
+            **kwargs: 写入函数的关键字参数
+
+        Raises:
+            RuntimeError: 服务已关闭
+        """
+        if self._closed:
+            raise RuntimeError("后台写入服务已关闭")
+        task_queue = self._queues[zlib.crc32(key.encode("utf-8")) % self.workers]
+        if task_queue.full() and self.logger:
+            self.logger.debug(f"写入队列已满，等待后台写入: {key}")
+        task_queue.put((key, func, args, kwargs))
+
+    def write_excel(self, df: pd.DataFrame, filepath: str) -> None:
+        """
+        提交DataFrame的Excel写入任务
+
+        Args:
+            df: 要写入的数据（提交后不应再修改）
+            filepath: 文件路径
+        """
+        self.submit(filepath, df.to_excel, filepath, index=False)
+
+    def pending_count(self) -> int:
+        """
+        获取尚未执行的写入任务数（近似值）
+        """
+        return sum(task_queue.qsize() for task_queue in self._queues)
+
+    def drain(self) -> None:
+        """
+        等待已提交的写入任务全部完成
+        """
+        for task_queue in self._queues:
+            task_queue.join()
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        写完所有已提交的任务后关闭写入线程
+
+        Args:
+            timeout: 每个线程的最长等待时间（秒）
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for task_queue in self._queues:
+            task_queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)